@@ -0,0 +1,24 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import get_cached_user, cache_user
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token's user from the cache,
+    falling back to the database (and refilling the cache) on a miss.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+
+        # Revocation checks need the current password hash; always hit the DB
+        if user_id is not None and not api_settings.CHECK_REVOKE_TOKEN:
+            user = get_cached_user(user_id)
+            if user is not None and (user.is_active or not api_settings.CHECK_USER_IS_ACTIVE):
+                return user
+
+        user = super().get_user(validated_token)
+        cache_user(user)
+        return user
@@ -0,0 +1,31 @@
+"""
+Cache keys for per-user data resolved on every request.
+
+Entries are dropped by the User post_save/post_delete signals (see
+accounts/signals.py), so profile edits and role changes are visible on the
+next request; USER_CACHE_TTL only bounds how long an entry can outlive a
+write that bypasses signals (e.g. queryset.update()).
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def user_cache_key(user_id):
+    return f"accounts:user:{user_id}"
+
+
+def me_cache_key(user_id):
+    return f"accounts:me:{user_id}"
+
+
+def get_cached_user(user_id):
+    return cache.get(user_cache_key(user_id))
+
+
+def cache_user(user):
+    cache.set(user_cache_key(user.pk), user, settings.USER_CACHE_TTL)
+
+
+def invalidate_user(user_id):
+    cache.delete_many([user_cache_key(user_id), me_cache_key(user_id)])
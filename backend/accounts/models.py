@@ -27,5 +27,15 @@ class User(AbstractUser):
         blank=True
     )
 
+    # Last-Modified of attendance history with ?expand=user (see dayflow.conditional)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Employee directory ordering / keyset pagination
+            models.Index(fields=["first_name", "last_name", "id"], name="user_name_idx"),
+            models.Index(fields=["role", "first_name", "last_name", "id"], name="user_role_name_idx"),
+        ]
+
     def __str__(self):
         return f"{self.username} ({self.role})"
@@ -1,3 +1,38 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from .models import User
+
+
+class CachedAuthenticationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("alice", "alice@example.com", "pw", first_name="Alice")
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}")
+
+    def test_repeat_me_requests_skip_the_database(self):
+        self.client.get("/api/auth/me/")
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get("/api/auth/me/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(context.captured_queries), 0)
+
+    def test_profile_update_invalidates_cache(self):
+        self.client.get("/api/auth/me/")
+        self.client.patch("/api/auth/me/", {"first_name": "Alicia"}, format="json")
+        self.assertEqual(self.client.get("/api/auth/me/").data["first_name"], "Alicia")
+
+    def test_role_change_invalidates_cache(self):
+        self.client.get("/api/auth/me/")
+        self.user.role = "HR"
+        self.user.save()
+        self.assertEqual(self.client.get("/api/auth/me/").data["role"], "HR")
+
+    def test_deactivated_user_is_rejected(self):
+        self.client.get("/api/auth/me/")
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get("/api/auth/me/").status_code, 401)
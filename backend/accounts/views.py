@@ -3,7 +3,10 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .serializers import RegisterSerializer, UserSerializer, ProfileUpdateSerializer
 from .models import User
+from .cache import me_cache_key
 from rest_framework import generics, permissions, status
+from django.conf import settings
+from django.core.cache import cache
 
 class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
@@ -13,10 +16,16 @@ class RegisterView(generics.CreateAPIView):
 
 class MeView(APIView):
     permission_classes = [IsAuthenticated]
+    read_replica = True
 
     def get(self, request):
-        serializer = UserSerializer(request.user)
-        return Response(serializer.data)
+        # Dropped together with the cached user whenever the User is saved
+        key = me_cache_key(request.user.pk)
+        data = cache.get(key)
+        if data is None:
+            data = UserSerializer(request.user).data
+            cache.set(key, data, settings.USER_CACHE_TTL)
+        return Response(data)
     
     def patch(self, request):
         serializer = ProfileUpdateSerializer(
@@ -0,0 +1,34 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from attendance.models import AttendanceDailySummary
+
+
+class Command(BaseCommand):
+    help = "Backfill or repair the daily attendance roll-up from Attendance rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", help="First date to rebuild (YYYY-MM-DD)")
+        parser.add_argument("--end", help="Last date to rebuild (YYYY-MM-DD)")
+
+    def handle(self, *args, **options):
+        start, end = options["start"], options["end"]
+
+        if not start and not end:
+            written = AttendanceDailySummary.rebuild()
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} summary rows"))
+            return
+
+        start_date = parse_date(start or end)
+        end_date = parse_date(end or start)
+        if start_date is None or end_date is None or start_date > end_date:
+            raise CommandError("Provide valid --start/--end dates with start <= end")
+
+        days = (end_date - start_date).days + 1
+        dates = [start_date + timedelta(days=offset) for offset in range(days)]
+        written = AttendanceDailySummary.rebuild(dates=dates)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {written} summary rows for {start_date} to {end_date}"
+        ))
@@ -0,0 +1,31 @@
+# Generated by Django 4.2.11 on 2026-10-18 17:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0004_attendance_date_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceDailySummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('department', models.CharField(blank=True, max_length=100)),
+                ('headcount', models.PositiveIntegerField(default=0)),
+                ('present', models.PositiveIntegerField(default=0)),
+                ('half_day', models.PositiveIntegerField(default=0)),
+                ('late_arrivals', models.PositiveIntegerField(default=0)),
+                ('checked_out', models.PositiveIntegerField(default=0)),
+                ('total_worked_minutes', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'unique_together': {('date', 'department')},
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.11 on 2026-10-18 17:57
+
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_worked_hours(apps, schema_editor):
+    # Self-contained copy of Attendance.apply_worked_hours() for old rows
+    Attendance = apps.get_model('attendance', 'Attendance')
+    SalaryStructure = apps.get_model('payroll', 'SalaryStructure')
+
+    default = Decimal(getattr(settings, 'ATTENDANCE_DEFAULT_HOURS_PER_DAY', '8'))
+    hours = dict(SalaryStructure.objects.values_list('employee_id', 'working_hours_per_day'))
+
+    batch = []
+    rows = Attendance.objects.filter(check_in__isnull=False, check_out__isnull=False)
+    for row in rows.iterator(chunk_size=2000):
+        required = int(hours.get(row.user_id, default) * 60)
+        start = row.check_in.hour * 60 + row.check_in.minute
+        end = row.check_out.hour * 60 + row.check_out.minute
+        row.worked_minutes = max(end - start, 0)
+        row.overtime_minutes = max(row.worked_minutes - required, 0)
+        if row.worked_minutes >= required:
+            row.status = 'PRESENT'
+        elif row.worked_minutes * 2 >= required:
+            row.status = 'HALF_DAY'
+        else:
+            row.status = 'ABSENT'
+        batch.append(row)
+        if len(batch) >= 2000:
+            Attendance.objects.bulk_update(batch, ['worked_minutes', 'overtime_minutes', 'status'])
+            batch = []
+    Attendance.objects.bulk_update(batch, ['worked_minutes', 'overtime_minutes', 'status'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('attendance', '0005_attendancedailysummary'),
+        ('payroll', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='attendance',
+            name='attendance_date_user_idx',
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='overtime_minutes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='attendance',
+            name='worked_minutes',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['date', 'user', 'status', 'worked_minutes', 'overtime_minutes'], name='attendance_timesheet_idx'),
+        ),
+        migrations.RunPython(backfill_worked_hours, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,18 @@
-from django.db import models
+from collections import defaultdict
+from datetime import time
+
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import F
+from django.utils import timezone
 from accounts.models import User
 
 class Attendance(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="attendance")
-    date = models.DateField(auto_now_add=True)
+    # Not auto_now_add: bulk punch ingestion records past dates explicitly
+    date = models.DateField(default=timezone.localdate)
     check_in = models.TimeField(null=True, blank=True)
     check_out = models.TimeField(null=True, blank=True)
 
@@ -14,8 +23,222 @@ class Attendance(models.Model):
     )
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="PRESENT")
 
+    # Derived on check-out by apply_worked_hours()
+    worked_minutes = models.PositiveIntegerField(default=0)
+    overtime_minutes = models.PositiveIntegerField(default=0)
+
+    # Last-Modified of the history endpoint (see dayflow.conditional)
+    updated_at = models.DateTimeField(auto_now=True)
+
     class Meta:
         unique_together = ("user", "date")
+        indexes = [
+            # Company-wide day/range scans; also covers the monthly
+            # timesheet aggregation without touching the table
+            models.Index(
+                fields=["date", "user", "status", "worked_minutes", "overtime_minutes"],
+                name="attendance_timesheet_idx",
+            ),
+            # Keyset pagination order for the history endpoint
+            models.Index(fields=["-date", "id"], name="attendance_date_id_idx"),
+        ]
+
+    def apply_worked_hours(self, required_minutes):
+        """
+        Derive worked/overtime minutes and status from check-in/check-out.
+
+        A full day is the employee's working_hours_per_day; at least half
+        of that is a half day, anything less counts as absent.
+        """
+        self.worked_minutes = worked_minutes(self.check_in, self.check_out)
+        if self.check_out is None:
+            self.overtime_minutes = 0
+            return
+
+        self.overtime_minutes = max(self.worked_minutes - required_minutes, 0)
+        if self.worked_minutes >= required_minutes:
+            self.status = "PRESENT"
+        elif self.worked_minutes * 2 >= required_minutes:
+            self.status = "HALF_DAY"
+        else:
+            self.status = "ABSENT"
 
     def __str__(self):
         return f"{self.user.username} - {self.date}"
+
+
+def worked_minutes(check_in, check_out):
+    """Minutes between two same-day times, or 0 if either is missing"""
+    if check_in is None or check_out is None:
+        return 0
+    start = check_in.hour * 60 + check_in.minute
+    end = check_out.hour * 60 + check_out.minute
+    return max(end - start, 0)
+
+
+def required_minutes(user_ids):
+    """Full-day minutes per user from SalaryStructure.working_hours_per_day"""
+    from payroll.models import SalaryStructure
+
+    default = Decimal(settings.ATTENDANCE_DEFAULT_HOURS_PER_DAY)
+    hours = dict(
+        SalaryStructure.objects.filter(employee_id__in=user_ids)
+        .values_list("employee_id", "working_hours_per_day")
+    )
+    return {
+        user_id: int(hours.get(user_id, default) * 60)
+        for user_id in user_ids
+    }
+
+
+STATUS_COUNTERS = {
+    "PRESENT": "present",
+    "HALF_DAY": "half_day",
+    "ABSENT": None,
+}
+
+
+def is_late(check_in):
+    return check_in is not None and check_in > time.fromisoformat(settings.ATTENDANCE_LATE_AFTER)
+
+
+def department_of(user_id):
+    return (
+        User.objects.filter(pk=user_id)
+        .values_list("profile__department", flat=True)
+        .first()
+    ) or ""
+
+
+class AttendanceDailySummary(models.Model):
+    """
+    Per-day, per-department attendance roll-up for the admin dashboard.
+
+    Maintained incrementally by the check-in/check-out views, refreshed
+    for the affected days by bulk punch ingestion, and rebuilt from
+    Attendance with `manage.py rebuild_attendance_summary`.
+    """
+    date = models.DateField()
+    department = models.CharField(max_length=100, blank=True)
+
+    headcount = models.PositiveIntegerField(default=0)
+    present = models.PositiveIntegerField(default=0)
+    half_day = models.PositiveIntegerField(default=0)
+    late_arrivals = models.PositiveIntegerField(default=0)
+    checked_out = models.PositiveIntegerField(default=0)
+    total_worked_minutes = models.PositiveIntegerField(default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("date", "department")
+
+    @property
+    def absent(self):
+        return max(self.headcount - self.present - self.half_day, 0)
+
+    @property
+    def average_hours(self):
+        if not self.checked_out:
+            return 0
+        return round(self.total_worked_minutes / self.checked_out / 60, 2)
+
+    @staticmethod
+    def department_headcounts(department=None):
+        """{department: active employees}, of every department or just one"""
+        from employees.models import EmployeeProfile
+
+        profiles = EmployeeProfile.objects.filter(user__is_active=True)
+        if department is not None:
+            profiles = profiles.filter(department=department)
+        return dict(
+            profiles
+            .values_list("department")
+            .annotate(count=models.Count("id"))
+            .values_list("department", "count")
+        )
+
+    @classmethod
+    def _row_for(cls, day, department):
+        row, _ = cls.objects.get_or_create(
+            date=day,
+            department=department,
+            # Callable, so only the day's first punch in the department counts heads
+            defaults={"headcount": lambda: cls.department_headcounts(department).get(department, 0)},
+        )
+        return row
+
+    @classmethod
+    def record_check_in(cls, attendance):
+        department = department_of(attendance.user_id)
+        changes = {"late_arrivals": F("late_arrivals") + int(is_late(attendance.check_in))}
+        counter = STATUS_COUNTERS[attendance.status]
+        if counter:
+            changes[counter] = F(counter) + 1
+        with transaction.atomic():
+            row = cls._row_for(attendance.date, department)
+            cls.objects.filter(pk=row.pk).update(**changes)
+
+    @classmethod
+    def record_check_out(cls, attendance, previous_status="PRESENT"):
+        """Count the check-out and move the row between status counters"""
+        department = department_of(attendance.user_id)
+        changes = {
+            "checked_out": F("checked_out") + 1,
+            "total_worked_minutes": F("total_worked_minutes") + attendance.worked_minutes,
+        }
+        old, new = STATUS_COUNTERS[previous_status], STATUS_COUNTERS[attendance.status]
+        if old != new:
+            if old:
+                changes[old] = F(old) - 1
+            if new:
+                changes[new] = F(new) + 1
+        with transaction.atomic():
+            row = cls._row_for(attendance.date, department)
+            cls.objects.filter(pk=row.pk).update(**changes)
+
+    @classmethod
+    def rebuild(cls, dates=None):
+        """
+        Recompute the roll-up from Attendance, for the given dates or for
+        the whole history. Returns the number of summary rows written.
+        """
+        queryset = Attendance.objects.all()
+        if dates is not None:
+            dates = set(dates)
+            queryset = queryset.filter(date__in=dates)
+
+        buckets = defaultdict(lambda: {
+            "present": 0, "half_day": 0, "late_arrivals": 0,
+            "checked_out": 0, "total_worked_minutes": 0,
+        })
+        rows = queryset.values_list(
+            "date", "user__profile__department", "status", "check_in", "check_out", "worked_minutes"
+        )
+        for day, department, status, check_in, check_out, minutes in rows.iterator(chunk_size=5000):
+            bucket = buckets[(day, department or "")]
+            counter = STATUS_COUNTERS[status]
+            if counter:
+                bucket[counter] += 1
+            bucket["late_arrivals"] += int(is_late(check_in))
+            if check_out is not None:
+                bucket["checked_out"] += 1
+                bucket["total_worked_minutes"] += minutes
+
+        headcounts = cls.department_headcounts()
+        summaries = [
+            cls(date=day, department=department, headcount=headcounts.get(department, 0), **values)
+            for (day, department), values in buckets.items()
+        ]
+
+        with transaction.atomic():
+            stale = cls.objects.all()
+            if dates is not None:
+                stale = stale.filter(date__in=dates)
+            stale.delete()
+            cls.objects.bulk_create(summaries, batch_size=1000)
+
+        return len(summaries)
+
+    def __str__(self):
+        return f"{self.date} {self.department or '-'}: {self.present} present"
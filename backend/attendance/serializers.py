@@ -1,9 +1,59 @@
 from rest_framework import serializers
-from .models import Attendance
+from .models import Attendance, AttendanceDailySummary
+from accounts.serializers import UserSerializer
+from dayflow.serializers import SparseFieldsMixin
 
-class AttendanceSerializer(serializers.ModelSerializer):
+class AttendanceSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Attendance
         fields = "__all__"
-        read_only_fields = ["user", "date", "status"]
+        read_only_fields = ["user", "date", "status", "worked_minutes", "overtime_minutes"]
+        expandable_fields = {
+            "user": (UserSerializer, {"read_only": True}),
+        }
 
+
+class PunchSerializer(serializers.Serializer):
+    """A single terminal punch; employee_id is the badge/employee code"""
+    DIRECTION_CHOICES = (
+        ("IN", "Check In"),
+        ("OUT", "Check Out"),
+    )
+
+    employee_id = serializers.CharField(max_length=20)
+    timestamp = serializers.DateTimeField()
+    direction = serializers.ChoiceField(choices=DIRECTION_CHOICES)
+
+
+class AttendanceDailySummarySerializer(serializers.ModelSerializer):
+    absent = serializers.IntegerField(read_only=True)
+    average_hours = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = AttendanceDailySummary
+        fields = [
+            "date", "department", "headcount", "present", "half_day", "absent",
+            "late_arrivals", "checked_out", "total_worked_minutes", "average_hours",
+        ]
+
+
+class TimesheetRowSerializer(serializers.Serializer):
+    """One employee's aggregated month, built from a values() row"""
+    user_id = serializers.IntegerField()
+    username = serializers.CharField(source="user__username")
+    first_name = serializers.CharField(source="user__first_name")
+    last_name = serializers.CharField(source="user__last_name")
+    employee_id = serializers.CharField(source="user__employee_id", allow_null=True)
+    days_present = serializers.IntegerField()
+    half_days = serializers.IntegerField()
+    absent_days = serializers.IntegerField()
+    worked_minutes = serializers.IntegerField(source="total_worked_minutes")
+    overtime_minutes = serializers.IntegerField(source="total_overtime_minutes")
+    worked_hours = serializers.SerializerMethodField()
+    overtime_hours = serializers.SerializerMethodField()
+
+    def get_worked_hours(self, row):
+        return round((row["total_worked_minutes"] or 0) / 60, 2)
+
+    def get_overtime_hours(self, row):
+        return round((row["total_overtime_minutes"] or 0) / 60, 2)
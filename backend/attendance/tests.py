@@ -1,3 +1,420 @@
-from django.test import TestCase
+import csv
+import io
+from datetime import date, datetime, time, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from employees.models import EmployeeProfile
+from payroll.models import SalaryStructure
+from .models import Attendance, AttendanceDailySummary, required_minutes
+
+
+class AttendanceExportTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="ADMIN")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+        for i, department in enumerate(["Engineering", "Sales"]):
+            user = User.objects.create_user(f"emp{i}", f"emp{i}@example.com", "pw", employee_id=f"E{i}")
+            EmployeeProfile.objects.update_or_create(user=user, defaults={"department": department})
+            for day in (1, 2, 3):
+                Attendance.objects.create(user=user, date=date(2025, 5, day), status="PRESENT")
+
+    def export(self, query=""):
+        response = self.client.get(f"/api/attendance/export/{query}")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        body = b"".join(response.streaming_content).decode()
+        return list(csv.reader(io.StringIO(body)))
+
+    def test_export_streams_filtered_rows(self):
+        rows = self.export("?start=2025-05-02&end=2025-05-03&department=Sales")
+        self.assertEqual(rows[0][:3], ["date", "employee_id", "first_name"])
+        self.assertEqual([(row[0], row[1]) for row in rows[1:]], [("2025-05-02", "E1"), ("2025-05-03", "E1")])
+
+    def test_export_without_filters_has_every_row(self):
+        self.assertEqual(len(self.export()) - 1, 6)
+
+    def test_bad_date_is_rejected_before_streaming(self):
+        response = self.client.get("/api/attendance/export/?start=May")
+        self.assertEqual(response.status_code, 400)
+
+    def test_employees_cannot_export(self):
+        self.client.force_authenticate(User.objects.get(username="emp0"))
+        self.assertEqual(self.client.get("/api/attendance/export/").status_code, 403)
+
+
+def at(day, hour, minute=0):
+    """A patched localtime() for the punch views"""
+    return mock.patch(
+        "attendance.views.localtime",
+        return_value=timezone.make_aware(datetime(2025, 5, day, hour, minute)),
+    )
+
+
+class AttendanceSummaryTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="ADMIN")
+        self.people = {}
+        for name, department in [
+            ("eng0", "Engineering"), ("eng1", "Engineering"), ("eng2", "Engineering"),
+            ("sales0", "Sales"), ("sales1", "Sales"),
+        ]:
+            user = User.objects.create_user(name, f"{name}@example.com", "pw")
+            EmployeeProfile.objects.update_or_create(user=user, defaults={"department": department})
+            self.people[name] = user
+        self.client = APIClient()
+
+    def punch(self, name, direction, day, hour, minute=0):
+        self.client.force_authenticate(self.people[name])
+        with at(day, hour, minute):
+            return self.client.post(f"/api/attendance/check-{direction}/")
+
+    def summary(self, query="?start=2025-05-05&end=2025-05-05"):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(f"/api/attendance/summary/{query}")
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def headcount_queries(self, name, direction, hour):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertIn(self.punch(name, direction, 5, hour).status_code, (200, 201))
+        return sum("GROUP BY" in query["sql"] for query in queries)
+
+    def test_headcount_is_counted_once_per_department_and_day(self):
+        self.assertEqual(self.headcount_queries("eng0", "in", 9), 1)
+        self.assertEqual(self.headcount_queries("eng1", "in", 9), 0)
+        self.assertEqual(self.headcount_queries("eng0", "out", 18), 0)
+
+    def test_every_department_is_reported(self):
+        self.punch("eng0", "in", 5, 9)
+        self.punch("eng0", "out", 5, 18)
+        self.punch("eng1", "in", 5, 10)  # late, still at work
+
+        data = self.summary()
+        days = {row["department"]: row for row in data["days"]}
+        self.assertEqual(
+            {name: (row["headcount"], row["present"], row["absent"]) for name, row in days.items()},
+            {"Engineering": (3, 2, 1), "Sales": (2, 0, 2)},
+        )
+        self.assertEqual(days["Engineering"]["late_arrivals"], 1)
+        self.assertEqual(days["Engineering"]["average_hours"], 9.0)
+        self.assertEqual(
+            (data["totals"]["headcount"], data["totals"]["present"], data["totals"]["absent"]),
+            (5, 2, 3),
+        )
+
+        # A day without any punch still lists everyone as absent
+        data = self.summary("?start=2025-05-05&end=2025-05-06&department=Sales")
+        self.assertEqual([(row["date"], row["absent"]) for row in data["days"]], [
+            ("2025-05-05", 2), ("2025-05-06", 2),
+        ])
+
+    def test_default_day_is_the_company_day(self):
+        self.punch("eng0", "in", 5, 9)
+        with mock.patch("attendance.views.company_today", return_value=date(2025, 5, 5)):
+            data = self.summary(query="?department=Engineering")
+        self.assertEqual([(row["date"], row["present"]) for row in data["days"]], [("2025-05-05", 1)])
+
+    def test_half_day_and_absent_math(self):
+        self.punch("sales0", "in", 5, 9)
+        self.punch("sales0", "out", 5, 13)  # 4 of 8 hours: half day
+        self.punch("sales1", "in", 5, 9)
+        self.punch("sales1", "out", 5, 10)  # 1 hour: absent
+
+        row = AttendanceDailySummary.objects.get(date=date(2025, 5, 5), department="Sales")
+        self.assertEqual((row.headcount, row.present, row.half_day, row.absent), (2, 0, 1, 1))
+        self.assertEqual((row.checked_out, row.total_worked_minutes, row.average_hours), (2, 300, 2.5))
+
+    def test_rebuild_matches_the_incremental_roll_up(self):
+        self.punch("eng0", "in", 5, 9, 45)
+        self.punch("eng0", "out", 5, 18)
+        self.punch("sales0", "in", 5, 9)
+        self.punch("sales0", "out", 5, 12)
+
+        fields = ("date", "department", "headcount", "present", "half_day",
+                  "late_arrivals", "checked_out", "total_worked_minutes")
+        incremental = list(AttendanceDailySummary.objects.order_by("department").values_list(*fields))
+        self.assertEqual(AttendanceDailySummary.rebuild(dates=[date(2025, 5, 5)]), 2)
+        self.assertEqual(
+            list(AttendanceDailySummary.objects.order_by("department").values_list(*fields)), incremental,
+        )
+
+    def test_bad_dates_are_rejected(self):
+        self.client.force_authenticate(self.admin)
+        for query in ("?start=2026-99-99", "?end=2026-02-30", "?start=2025-05-06&end=2025-05-05",
+                      "?start=2024-01-01&end=2025-12-31"):
+            self.assertEqual(self.client.get(f"/api/attendance/summary/{query}").status_code, 400, query)
+
+
+def stamp(day, hour, minute=0):
+    return timezone.make_aware(datetime(2025, 5, day, hour, minute)).isoformat()
+
+
+class BulkPunchTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="ADMIN")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.add_employees(2)
+
+    def add_employees(self, count):
+        start = User.objects.filter(role="EMPLOYEE").count()
+        for i in range(start, start + count):
+            user = User.objects.create_user(f"emp{i}", f"emp{i}@example.com", "pw", employee_id=f"E{i}")
+            EmployeeProfile.objects.update_or_create(user=user, defaults={"department": "Engineering"})
+
+    def post(self, punches):
+        response = self.client.post("/api/attendance/punches/", {"punches": punches}, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def day_of(self, code, day=5):
+        return Attendance.objects.get(user__employee_id=code, date=date(2025, 5, day))
+
+    def test_mixed_valid_and_invalid_punches(self):
+        data = self.post([
+            {"employee_id": "E0", "timestamp": stamp(5, 9), "direction": "IN"},
+            {"employee_id": "E0", "timestamp": stamp(5, 18), "direction": "OUT"},
+            {"employee_id": "E0", "timestamp": stamp(5, 12), "direction": "SIDEWAYS"},
+            {"employee_id": "E1", "direction": "IN"},
+            {"employee_id": "NOPE", "timestamp": stamp(5, 9), "direction": "IN"},
+            {"employee_id": "E1", "timestamp": stamp(5, 18), "direction": "OUT"},
+        ])
+        self.assertEqual((data["accepted"], data["rejected"]), (2, 4))
+        self.assertEqual(
+            [result["status"] for result in data["results"]],
+            ["ok", "ok", "error", "error", "error", "error"],
+        )
+        self.assertIn("direction", data["results"][2]["errors"])
+        self.assertIn("timestamp", data["results"][3]["errors"])
+        self.assertEqual(data["results"][4]["detail"], "Unknown employee.")
+        self.assertEqual(data["results"][5]["detail"], "No check-in recorded for this day.")
+
+        attendance = self.day_of("E0")
+        self.assertEqual((str(attendance.check_in), str(attendance.check_out)), ("09:00:00", "18:00:00"))
+        self.assertEqual((attendance.status, attendance.worked_minutes), ("PRESENT", 540))
+        self.assertFalse(Attendance.objects.filter(user__employee_id="E1").exists())
+
+    def test_earliest_in_and_latest_out_win(self):
+        self.post([
+            {"employee_id": "E0", "timestamp": stamp(5, 9, 30), "direction": "IN"},
+            {"employee_id": "E0", "timestamp": stamp(5, 17), "direction": "OUT"},
+        ])
+        data = self.post([
+            {"employee_id": "E0", "timestamp": stamp(5, 9, 10), "direction": "IN"},
+            {"employee_id": "E0", "timestamp": stamp(5, 9, 45), "direction": "IN"},
+            {"employee_id": "E0", "timestamp": stamp(5, 16), "direction": "OUT"},
+            {"employee_id": "E0", "timestamp": stamp(5, 18, 30), "direction": "OUT"},
+            {"employee_id": "E0", "timestamp": stamp(5, 8), "direction": "OUT"},
+        ])
+        self.assertEqual(data["accepted"], 4)
+        self.assertEqual(data["results"][4]["detail"], "Check-out is before check-in.")
+        attendance = self.day_of("E0")
+        self.assertEqual((str(attendance.check_in), str(attendance.check_out)), ("09:10:00", "18:30:00"))
+        self.assertEqual(Attendance.objects.count(), 1)
+
+    def test_daily_summary_is_rebuilt(self):
+        self.post([
+            {"employee_id": "E0", "timestamp": stamp(5, 9), "direction": "IN"},
+            {"employee_id": "E0", "timestamp": stamp(5, 18), "direction": "OUT"},
+            {"employee_id": "E1", "timestamp": stamp(5, 10), "direction": "IN"},
+            {"employee_id": "E1", "timestamp": stamp(6, 9), "direction": "IN"},
+        ])
+        rows = {
+            row.date.day: row for row in AttendanceDailySummary.objects.filter(department="Engineering")
+        }
+        self.assertEqual(sorted(rows), [5, 6])
+        self.assertEqual(
+            (rows[5].headcount, rows[5].present, rows[5].late_arrivals, rows[5].checked_out),
+            (2, 2, 1, 1),
+        )
+        self.assertEqual((rows[6].present, rows[6].checked_out), (1, 0))
+
+    def test_query_count_does_not_grow_with_punches(self):
+        def ingest(day):
+            punches = [
+                {"employee_id": user.employee_id, "timestamp": stamp(day, hour), "direction": direction}
+                for user in User.objects.filter(role="EMPLOYEE")
+                for hour, direction in ((9, "IN"), (18, "OUT"))
+            ]
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.post(punches)["rejected"], 0)
+            return len(queries)
+
+        before = ingest(5)
+        self.add_employees(10)
+        self.assertEqual(ingest(6), before)
+
+    def test_empty_and_oversized_batches_are_rejected(self):
+        url = "/api/attendance/punches/"
+        self.assertEqual(self.client.post(url, {"punches": []}, format="json").status_code, 400)
+        punch = {"employee_id": "E0", "timestamp": stamp(5, 9), "direction": "IN"}
+        with mock.patch("attendance.views.MAX_PUNCHES_PER_REQUEST", 2):
+            self.assertEqual(self.client.post(url, [punch] * 3, format="json").status_code, 400)
+
+
+class AttendanceHistoryTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="ADMIN")
+        self.employee = User.objects.create_user("emp", "emp@example.com", "pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def history(self, query=""):
+        with mock.patch("attendance.views.company_today", return_value=date(2025, 5, 14)):
+            response = self.client.get(f"/api/attendance/history/{query}")
+        self.assertEqual(response.status_code, 200, response.data)
+        return response
+
+    def test_range_windows_end_today(self):
+        # Wednesday 14 May 2025; the row on the 15th is after the window
+        for day in ("2024-12-31", "2025-01-01", "2025-03-31", "2025-04-01", "2025-04-30",
+                    "2025-05-01", "2025-05-11", "2025-05-12", "2025-05-14", "2025-05-15"):
+            Attendance.objects.create(user=self.employee, date=day, status="PRESENT")
+        self.client.force_authenticate(self.employee)
+
+        expected = {
+            "day": ["2025-05-14"],
+            "week": ["2025-05-14", "2025-05-12"],
+            "month": ["2025-05-14", "2025-05-12", "2025-05-11", "2025-05-01"],
+            "quarter": ["2025-05-14", "2025-05-12", "2025-05-11", "2025-05-01", "2025-04-30", "2025-04-01"],
+            "ytd": ["2025-05-14", "2025-05-12", "2025-05-11", "2025-05-01", "2025-04-30", "2025-04-01",
+                    "2025-03-31", "2025-01-01"],
+        }
+        for window, days in expected.items():
+            data = self.history(f"?range={window}").data
+            self.assertEqual([row["date"] for row in data["results"]], days, window)
+            self.assertIsNone(data["next"], window)
+
+        data = self.history("?range=month&start=2025-05-11&end=2025-05-12").data
+        self.assertEqual([row["date"] for row in data["results"]], ["2025-05-12", "2025-05-11"])
+
+    def test_unknown_range_is_rejected(self):
+        response = self.client.get("/api/attendance/history/?range=fortnight")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("range", response.data)
+
+    def test_unchanged_history_is_not_modified(self):
+        Attendance.objects.create(user=self.employee, date="2025-05-14", status="PRESENT")
+        etag = self.history("?range=week")["ETag"]
+        self.assertTrue(etag)
+
+        with mock.patch("attendance.views.company_today", return_value=date(2025, 5, 14)):
+            response = self.client.get("/api/attendance/history/?range=week", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertFalse(response.content)
+
+        Attendance.objects.create(user=self.employee, date="2025-05-13", status="PRESENT")
+        response = self.history("?range=week")
+        self.assertNotEqual(response["ETag"], etag)
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_last_modified_and_if_modified_since(self):
+        stamp = datetime(2025, 5, 14, 9, 30, tzinfo=dt_timezone.utc)
+        row = Attendance.objects.create(user=self.employee, date="2025-05-14", status="PRESENT")
+        Attendance.objects.filter(pk=row.pk).update(updated_at=stamp)
+        User.objects.filter(pk=self.employee.pk).update(updated_at=stamp)
+
+        response = self.history("?range=week")
+        self.assertEqual(response["Last-Modified"], "Wed, 14 May 2025 09:30:00 GMT")
+
+        def since(query, header):
+            with mock.patch("attendance.views.company_today", return_value=date(2025, 5, 14)):
+                return self.client.get(f"/api/attendance/history/{query}", HTTP_IF_MODIFIED_SINCE=header)
+
+        self.assertEqual(since("?range=week", "Wed, 14 May 2025 09:30:00 GMT").status_code, 304)
+        self.assertEqual(since("?range=week", "Wed, 14 May 2025 09:29:59 GMT").status_code, 200)
+
+        # With ?expand=user the user's row dates the page too
+        User.objects.filter(pk=self.employee.pk).update(updated_at=stamp.replace(hour=10, minute=0))
+        self.assertEqual(since("?range=week", "Wed, 14 May 2025 09:30:00 GMT").status_code, 304)
+        response = since("?range=week&expand=user", "Wed, 14 May 2025 09:30:00 GMT")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Last-Modified"], "Wed, 14 May 2025 10:00:00 GMT")
+
+    def test_malformed_params_are_rejected(self):
+        for query in ("?start=2026-02-30", "?end=tomorrow", "?start=2025-05-10&end=2025-05-01",
+                      "?employee_id=abc"):
+            response = self.client.get(f"/api/attendance/history/{query}")
+            self.assertEqual(response.status_code, 400, query)
+
+
+class WorkedHoursTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("emp", "emp@example.com", "pw")
+
+    def day(self, check_in, check_out, required=480):
+        attendance = Attendance(user=self.user, check_in=check_in, check_out=check_out)
+        attendance.apply_worked_hours(required)
+        return attendance.status, attendance.worked_minutes, attendance.overtime_minutes
+
+    def test_status_and_overtime_from_the_required_minutes(self):
+        self.assertEqual(self.day(time(9), time(18, 30)), ("PRESENT", 570, 90))
+        self.assertEqual(self.day(time(9), time(17)), ("PRESENT", 480, 0))
+        self.assertEqual(self.day(time(9), time(13)), ("HALF_DAY", 240, 0))
+        self.assertEqual(self.day(time(9), time(10)), ("ABSENT", 60, 0))
+        self.assertEqual(self.day(time(9), None), ("PRESENT", 0, 0))
+        self.assertEqual(self.day(time(9), time(16), required=360), ("PRESENT", 420, 60))
+
+    def test_required_minutes_follow_the_salary_structure(self):
+        other = User.objects.create_user("other", "other@example.com", "pw")
+        SalaryStructure.objects.create(employee=other, working_hours_per_day=Decimal("7.5"))
+        self.assertEqual(required_minutes([self.user.pk, other.pk]), {self.user.pk: 480, other.pk: 450})
+
+
+class TimesheetTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="ADMIN")
+        self.eng = User.objects.create_user("eng", "eng@example.com", "pw", employee_id="E1")
+        self.sales = User.objects.create_user("sales", "sales@example.com", "pw", employee_id="S1")
+        EmployeeProfile.objects.update_or_create(user=self.eng, defaults={"department": "Engineering"})
+        EmployeeProfile.objects.update_or_create(user=self.sales, defaults={"department": "Sales"})
+        for user, day, status, worked, overtime in [
+            (self.eng, date(2025, 5, 5), "PRESENT", 540, 60),
+            (self.eng, date(2025, 5, 6), "PRESENT", 600, 120),
+            (self.eng, date(2025, 5, 7), "HALF_DAY", 240, 0),
+            (self.eng, date(2025, 6, 2), "PRESENT", 480, 0),
+            (self.sales, date(2025, 5, 5), "ABSENT", 30, 0),
+        ]:
+            Attendance.objects.create(user=user, date=day, status=status,
+                                      worked_minutes=worked, overtime_minutes=overtime)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def rows(self, query="?month=2025-05"):
+        response = self.client.get(f"/api/attendance/timesheet/{query}")
+        self.assertEqual(response.status_code, 200, response.data)
+        return {row["username"]: row for row in response.data["results"]}
+
+    def test_month_is_aggregated_per_employee(self):
+        rows = self.rows()
+        self.assertEqual(sorted(rows), ["eng", "sales"])
+        eng = rows["eng"]
+        self.assertEqual(
+            (eng["days_present"], eng["half_days"], eng["absent_days"]), (2, 1, 0),
+        )
+        self.assertEqual((eng["worked_minutes"], eng["overtime_minutes"]), (1380, 180))
+        self.assertEqual((eng["worked_hours"], eng["overtime_hours"]), (23.0, 3.0))
+        self.assertEqual(rows["sales"]["absent_days"], 1)
+
+    def test_filters_and_scope(self):
+        self.assertEqual(sorted(self.rows("?month=2025-05&department=Sales")), ["sales"])
+        self.assertEqual(sorted(self.rows(f"?month=2025-05&employee_id={self.eng.pk}")), ["eng"])
+        self.assertEqual(self.rows("?month=2025-06")["eng"]["worked_minutes"], 480)
+
+        self.client.force_authenticate(self.sales)
+        self.assertEqual(sorted(self.rows(f"?month=2025-05&employee_id={self.eng.pk}")), ["sales"])
+
+    def test_malformed_params_are_rejected(self):
+        for query in ("?employee_id=abc", "?month=2025-13", "?month=May"):
+            response = self.client.get(f"/api/attendance/timesheet/{query}")
+            self.assertEqual(response.status_code, 400, query)
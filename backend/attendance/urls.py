@@ -1,9 +1,21 @@
 from django.urls import path
-from .views import CheckInView, CheckOutView, AttendanceHistoryView
+from .views import (
+    CheckInView,
+    CheckOutView,
+    BulkPunchView,
+    AttendanceSummaryView,
+    TimesheetView,
+    AttendanceHistoryView,
+    AttendanceExportView,
+)
 
 
 urlpatterns = [
     path("check-in/", CheckInView.as_view()),
     path("check-out/", CheckOutView.as_view()),
+    path("punches/", BulkPunchView.as_view()),
+    path("summary/", AttendanceSummaryView.as_view()),
+    path("timesheet/", TimesheetView.as_view()),
     path("history/", AttendanceHistoryView.as_view()),
+    path("export/", AttendanceExportView.as_view()),
 ]
@@ -1,15 +1,60 @@
+import calendar
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
 
 from rest_framework.views import APIView
 from rest_framework.generics import ListAPIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils.timezone import localtime
+
+from accounts.models import User
+from accounts.permissions import IsAdmin
+from dayflow.conditional import ConditionalListMixin
+from dayflow.export import EXPORT_CHUNK_SIZE, CSVExportView, parse_date_range
+from dayflow.listcache import CachedListMixin, bump
+from dayflow.pagination import AttendancePagination, TimesheetPagination
+from dayflow.params import integer_param
+from dayflow.serializers import requested_expansions
+from employees.models import EmployeeProfile
+
+from .models import Attendance, AttendanceDailySummary, required_minutes
+from .serializers import (
+    AttendanceSerializer,
+    PunchSerializer,
+    AttendanceDailySummarySerializer,
+    TimesheetRowSerializer,
+)
+
+
+MAX_PUNCHES_PER_REQUEST = 5000
+MAX_SUMMARY_DAYS = 366
 
-from django.utils.timezone import now
-from django.utils.dateparse import parse_date
+# Named history windows (?range=) ending today in the company time zone
+RANGE_WINDOWS = ("day", "week", "month", "quarter", "ytd")
 
-from .models import Attendance
-from .serializers import AttendanceSerializer
+
+def company_today():
+    return datetime.now(ZoneInfo(settings.COMPANY_TIME_ZONE)).date()
+
+
+def window_start(name, today):
+    if name == "day":
+        return today
+    if name == "week":
+        return today - timedelta(days=today.weekday())
+    if name == "month":
+        return today.replace(day=1)
+    if name == "quarter":
+        return today.replace(month=3 * ((today.month - 1) // 3) + 1, day=1)
+    return today.replace(month=1, day=1)
 
 
 # =========================
@@ -20,7 +65,8 @@ class CheckInView(APIView):
 
     def post(self, request):
         user = request.user
-        today = now().date()
+        current = localtime()
+        today = current.date()
 
         # Prevent multiple check-ins in one day
         if Attendance.objects.filter(user=user, date=today).exists():
@@ -32,8 +78,9 @@ class CheckInView(APIView):
         attendance = Attendance.objects.create(
             user=user,
             date=today,
-            check_in=now(),
+            check_in=current.time(),
         )
+        AttendanceDailySummary.record_check_in(attendance)
 
         return Response(
             AttendanceSerializer(attendance).data,
@@ -49,7 +96,8 @@ class CheckOutView(APIView):
 
     def post(self, request):
         user = request.user
-        today = now().date()
+        current = localtime()
+        today = current.date()
 
         attendance = Attendance.objects.filter(
             user=user,
@@ -68,8 +116,11 @@ class CheckOutView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        attendance.check_out = now()
+        previous_status = attendance.status
+        attendance.check_out = current.time()
+        attendance.apply_worked_hours(required_minutes([user.pk])[user.pk])
         attendance.save()
+        AttendanceDailySummary.record_check_out(attendance, previous_status)
 
         return Response(
             AttendanceSerializer(attendance).data,
@@ -77,12 +128,301 @@ class CheckOutView(APIView):
         )
 
 
+# =========================
+# BULK PUNCH INGESTION
+# =========================
+class BulkPunchView(APIView):
+    """
+    Batch check-in/check-out for biometric and badge terminals (Admin/HR).
+
+    Body: {"punches": [{"employee_id", "timestamp", "direction"}, ...]}
+    where direction is "IN" or "OUT" and employee_id is User.employee_id.
+
+    Users are resolved in one query, the affected attendance rows are read
+    in one query and written back with a single upsert on (user, date).
+    The earliest IN and the latest OUT of a day win. Each punch gets its
+    own result entry so terminals can retry only the rejected ones.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def post(self, request):
+        # Accept either {"punches": [...]} or a bare list
+        punches = request.data
+        if hasattr(punches, "get"):
+            punches = punches.get("punches")
+
+        if not isinstance(punches, list) or not punches:
+            return Response(
+                {"detail": "Expected a non-empty 'punches' list."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if len(punches) > MAX_PUNCHES_PER_REQUEST:
+            return Response(
+                {"detail": f"At most {MAX_PUNCHES_PER_REQUEST} punches per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = [None] * len(punches)
+        valid = []
+
+        for index, item in enumerate(punches):
+            serializer = PunchSerializer(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                results[index] = {"index": index, "status": "error", "errors": serializer.errors}
+
+        # Resolve every employee code in one query
+        codes = {data["employee_id"] for _, data in valid}
+        user_ids = dict(
+            User.objects.filter(employee_id__in=codes).values_list("employee_id", "id")
+        )
+
+        # Group punches per (user, date) in timestamp order
+        days = {}
+        for index, data in sorted(valid, key=lambda v: v[1]["timestamp"]):
+            user_id = user_ids.get(data["employee_id"])
+            if user_id is None:
+                results[index] = {
+                    "index": index,
+                    "employee_id": data["employee_id"],
+                    "status": "error",
+                    "detail": "Unknown employee.",
+                }
+                continue
+            moment = localtime(data["timestamp"])
+            days.setdefault((user_id, moment.date()), []).append(
+                (index, data, moment.time())
+            )
+
+        with transaction.atomic():
+            existing = {}
+            if days:
+                user_filter = {user_id for user_id, _ in days}
+                date_filter = {day for _, day in days}
+                for row in Attendance.objects.filter(
+                    user_id__in=user_filter, date__in=date_filter
+                ):
+                    existing[(row.user_id, row.date)] = row
+
+            rows = []
+            for (user_id, day), entries in days.items():
+                row = existing.get((user_id, day)) or Attendance(user_id=user_id, date=day)
+                changed = False
+
+                for index, data, moment in entries:
+                    result = {"index": index, "employee_id": data["employee_id"], "date": day}
+
+                    if data["direction"] == "IN":
+                        if row.check_in is None or moment < row.check_in:
+                            row.check_in = moment
+                            changed = True
+                        result["status"] = "ok"
+                    elif row.check_in is None:
+                        result.update(status="error", detail="No check-in recorded for this day.")
+                    elif moment < row.check_in:
+                        result.update(status="error", detail="Check-out is before check-in.")
+                    else:
+                        if row.check_out is None or moment > row.check_out:
+                            row.check_out = moment
+                            changed = True
+                        result["status"] = "ok"
+
+                    results[index] = result
+
+                if changed:
+                    rows.append(row)
+
+            if rows:
+                required = required_minutes({row.user_id for row in rows})
+                for row in rows:
+                    row.apply_worked_hours(required[row.user_id])
+
+                Attendance.objects.bulk_create(
+                    rows,
+                    update_conflicts=True,
+                    unique_fields=["user", "date"],
+                    update_fields=[
+                        "check_in", "check_out", "status", "worked_minutes", "overtime_minutes",
+                        "updated_at",
+                    ],
+                )
+                bump(Attendance)
+                AttendanceDailySummary.rebuild(dates={row.date for row in rows})
+
+        accepted = sum(1 for result in results if result["status"] == "ok")
+        return Response(
+            {
+                "accepted": accepted,
+                "rejected": len(results) - accepted,
+                "results": results,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+# =========================
+# DASHBOARD SUMMARY
+# =========================
+class AttendanceSummaryView(APIView):
+    """
+    ADMIN / HR:
+      - Headcount, present, half-day, absent, late arrivals and average
+        hours per day and department, read from the daily roll-up table.
+
+    Query params: start, end (default today), department
+
+    Every department with active employees is listed for every day; days
+    without a roll-up row (nobody punched) show everyone absent.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+    read_replica = True
+
+    def get(self, request):
+        today = company_today()
+        start_date, end_date = parse_date_range(request)
+        start_date = start_date or min(today, end_date or today)
+        end_date = end_date or max(today, start_date)
+        if (end_date - start_date).days >= MAX_SUMMARY_DAYS:
+            raise ValidationError({"end": f"At most {MAX_SUMMARY_DAYS} days per request."})
+
+        queryset = AttendanceDailySummary.objects.filter(
+            date__gte=start_date,
+            date__lte=end_date,
+        ).order_by("date", "department")
+
+        department = request.query_params.get("department")
+        if department is not None:
+            queryset = queryset.filter(department=department)
+
+        rows = list(queryset)
+        stored = {(row.date, row.department) for row in rows}
+        headcounts = AttendanceDailySummary.department_headcounts(department)
+        for offset in range((end_date - start_date).days + 1):
+            day = start_date + timedelta(days=offset)
+            rows.extend(
+                AttendanceDailySummary(date=day, department=name, headcount=count)
+                for name, count in headcounts.items()
+                if (day, name) not in stored
+            )
+        rows.sort(key=lambda row: (row.date, row.department))
+
+        # Totals are person-days over the whole range
+        totals = {
+            field: sum(getattr(row, field) for row in rows)
+            for field in (
+                "headcount", "present", "half_day", "absent",
+                "late_arrivals", "checked_out", "total_worked_minutes",
+            )
+        }
+        totals["average_hours"] = (
+            round(totals["total_worked_minutes"] / totals["checked_out"] / 60, 2)
+            if totals["checked_out"] else 0
+        )
+
+        return Response({
+            "start": start_date,
+            "end": end_date,
+            "totals": totals,
+            "days": AttendanceDailySummarySerializer(rows, many=True).data,
+        })
+
+
+# =========================
+# MONTHLY TIMESHEET
+# =========================
+class TimesheetView(CachedListMixin, ListAPIView):
+    """
+    Hours, overtime and day counts per employee for one month, aggregated
+    in SQL from the stored worked/overtime minutes.
+
+    EMPLOYEE → own row only
+    ADMIN / HR → everyone; optional employee_id and department filters
+
+    Query params: month=YYYY-MM (default current month)
+    """
+    serializer_class = TimesheetRowSerializer
+    permission_classes = [IsAuthenticated]
+    read_replica = True
+    pagination_class = TimesheetPagination
+    cache_models = (Attendance, User, EmployeeProfile)
+
+    def cache_vary_on(self):
+        # Without ?month= the page is this month's
+        return self.get_month_range()
+
+    def get_month_range(self):
+        month = self.request.query_params.get("month")
+        if month:
+            try:
+                year, month = (int(part) for part in month.split("-"))
+                first = date(year, month, 1)
+            except ValueError:
+                raise ValidationError({"month": "Expected YYYY-MM."})
+        else:
+            first = localtime().date().replace(day=1)
+        last = first.replace(day=calendar.monthrange(first.year, first.month)[1])
+        return first, last
+
+    def get_queryset(self):
+        user = self.request.user
+        first, last = self.get_month_range()
+        queryset = Attendance.objects.filter(date__gte=first, date__lte=last)
+
+        if user.role == "EMPLOYEE":
+            queryset = queryset.filter(user=user)
+        else:
+            employee_id = integer_param(self.request, "employee_id")
+            department = self.request.query_params.get("department")
+            if employee_id is not None:
+                queryset = queryset.filter(user__id=employee_id)
+            if department:
+                queryset = queryset.filter(user__profile__department=department)
+
+        return queryset.values(
+            "user_id", "user__username", "user__first_name", "user__last_name", "user__employee_id",
+        ).annotate(
+            days_present=Count("id", filter=Q(status="PRESENT")),
+            half_days=Count("id", filter=Q(status="HALF_DAY")),
+            absent_days=Count("id", filter=Q(status="ABSENT")),
+            total_worked_minutes=Sum("worked_minutes"),
+            total_overtime_minutes=Sum("overtime_minutes"),
+        ).order_by("user_id")
+
+
 # =========================
 # ATTENDANCE HISTORY
 # =========================
-class AttendanceHistoryView(ListAPIView):
+class AttendanceHistoryView(ConditionalListMixin, ListAPIView):
+    """
+    EMPLOYEE → own history; ADMIN / HR → everyone (optional employee_id)
+
+    Query params:
+      range=day|week|month|quarter|ytd  window ending today (company time zone)
+      start, end                        explicit bounds, narrowing any range
+
+    Employees get the whole window on one page by default. Responses carry
+    an ETag from the attendance and user table generations and
+    Last-Modified from the newest row in the window, so unchanged repeat
+    requests are answered with 304 and no body.
+    """
     serializer_class = AttendanceSerializer
     permission_classes = [IsAuthenticated]
+    read_replica = True
+    pagination_class = AttendancePagination
+    window_page_size = None
+    cache_models = (Attendance, User)
+
+    def cache_vary_on(self):
+        # ?range= windows end today
+        return (company_today(),)
+
+    def get_last_modified_fields(self):
+        # ?expand=user shows the user's row too
+        if "user" in requested_expansions(self.request):
+            return ("updated_at", "user__updated_at")
+        return ("updated_at",)
 
     def get_queryset(self):
         user = self.request.user
@@ -93,18 +433,66 @@ class AttendanceHistoryView(ListAPIView):
             queryset = queryset.filter(user=user)
 
         # ADMIN / HR → can filter by employee
-        employee_id = self.request.query_params.get("employee_id")
-        if employee_id and user.role in ["ADMIN", "HR"]:
+        employee_id = integer_param(self.request, "employee_id")
+        if employee_id is not None and user.role in ["ADMIN", "HR"]:
             queryset = queryset.filter(user__id=employee_id)
 
+        # Named window
+        window = self.request.query_params.get("range")
+        if window:
+            if window not in RANGE_WINDOWS:
+                raise ValidationError({"range": f"Expected one of: {', '.join(RANGE_WINDOWS)}."})
+            today = company_today()
+            start = window_start(window, today)
+            queryset = queryset.filter(date__gte=start, date__lte=today)
+            if user.role == "EMPLOYEE":
+                self.window_page_size = (today - start).days + 1
+
         # Date filters
-        start_date = self.request.query_params.get("start")
-        end_date = self.request.query_params.get("end")
+        start_date, end_date = parse_date_range(self.request)
 
         if start_date:
-            queryset = queryset.filter(date__gte=parse_date(start_date))
+            queryset = queryset.filter(date__gte=start_date)
 
         if end_date:
-            queryset = queryset.filter(date__lte=parse_date(end_date))
+            queryset = queryset.filter(date__lte=end_date)
+
+        if "user" in requested_expansions(self.request):
+            queryset = queryset.select_related("user")
+
+        return queryset.order_by("-date", "id")
+
+
+# =========================
+# CSV EXPORT
+# =========================
+class AttendanceExportView(CSVExportView):
+    """
+    Attendance rows as CSV (Admin/HR), oldest first.
+
+    Query params: start, end (dates, inclusive), department (exact match)
+    """
+    filename = "attendance.csv"
+    header = (
+        "date", "employee_id", "first_name", "last_name", "department",
+        "check_in", "check_out", "status", "worked_minutes", "overtime_minutes",
+    )
+
+    def get_rows(self, request):
+        start_date, end_date = parse_date_range(request)
+        queryset = Attendance.objects.all()
+
+        if start_date:
+            queryset = queryset.filter(date__gte=start_date)
+        if end_date:
+            queryset = queryset.filter(date__lte=end_date)
+
+        department = request.query_params.get("department")
+        if department:
+            queryset = queryset.filter(user__profile__department=department)
 
-        return queryset.order_by("-date")
+        return queryset.order_by("date", "user_id").values_list(
+            "date", "user__employee_id", "user__first_name", "user__last_name",
+            "user__profile__department", "check_in", "check_out", "status",
+            "worked_minutes", "overtime_minutes",
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
@@ -0,0 +1,15 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class DayflowConfig(AppConfig):
+    name = 'dayflow'
+
+    def ready(self):
+        from .database import configure_sqlite
+        connection_created.connect(configure_sqlite, dispatch_uid="dayflow.configure_sqlite")
+
+        from .metrics import install_serializer_timing
+        install_serializer_timing()
+
+        from . import signals  # noqa: F401
@@ -0,0 +1,117 @@
+"""
+Negotiated compression of API responses.
+
+CompressionMiddleware replaces Django's GZipMiddleware:
+
+  - only bodies of at least COMPRESS_MIN_BYTES are compressed (streamed
+    exports always are), and only text-like content types: JSON, CSV,
+    HTML. Static files are left to WhiteNoise, which serves them
+    precompressed.
+  - the coding is chosen from Accept-Encoding with its q-values: brotli
+    ("br") when the brotli package is installed and the client ranks it
+    at least as high as gzip, else gzip, else none
+  - Vary: Accept-Encoding is always set, and strong ETags are weakened
+    as RFC 9110 requires, so dayflow.conditional's ETags still validate
+    against the compressed representation
+
+gzip keeps Django's BREACH mitigation (random bytes in the header).
+Without brotli (pip install brotli) clients get gzip.
+"""
+
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional
+    brotli = None
+
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+
+
+def encoding_weights(header):
+    """{coding: q} of an Accept-Encoding header"""
+    weights = {}
+    for item in header.split(","):
+        coding, _, params = item.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[coding] = weight
+    return weights
+
+
+def negotiate(header, available):
+    """The acceptable coding of ``available`` the client ranks highest (ties: first), or None"""
+    weights = encoding_weights(header)
+    best, best_weight = None, 0.0
+    for coding in available:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+class CompressionMiddleware(GZipMiddleware):
+    def process_response(self, request, response):
+        if response.has_header("Content-Encoding"):
+            return response
+        if not response.streaming and len(response.content) < settings.COMPRESS_MIN_BYTES:
+            return response
+        if not response.get("Content-Type", "").startswith(COMPRESSIBLE_TYPES):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        available = ["gzip"]
+        if brotli is not None and not (response.streaming and response.is_async):
+            available.insert(0, "br")
+        coding = negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""), available)
+
+        if coding == "gzip":
+            return super().process_response(request, response)
+        if coding == "br":
+            return self.brotli_response(response)
+        return response
+
+    def brotli_response(self, response):
+        quality = settings.BROTLI_QUALITY
+        if response.streaming:
+            response.streaming_content = self.brotli_stream(response.streaming_content, quality)
+            del response.headers["Content-Length"]
+        else:
+            compressed = brotli.compress(response.content, quality=quality)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
+
+    @staticmethod
+    def brotli_stream(chunks, quality):
+        compressor = brotli.Compressor(quality=quality)
+        for chunk in chunks:
+            data = compressor.process(chunk)
+            if data:
+                yield data
+        yield compressor.finish()
@@ -0,0 +1,75 @@
+"""
+Conditional GET for list endpoints, without querying the list.
+
+ConditionalListMixin uses the page's list cache key (dayflow/listcache.py)
+as its ETag: the request path, role scope and the generations of the
+tables the page reads. A write to any of those tables starts a new
+generation and so changes the ETag; until then a matching If-None-Match
+is answered with an empty 304 from the cache alone, before any query,
+cache lookup of the page or serialization. Without a shared cache
+generations expire after LIST_CACHE_TTL, which bounds how long a worker
+that missed a write keeps validating the old ETag.
+
+Views that set ``last_modified_fields`` (updated_at lookups) also send
+Last-Modified, the newest of those timestamps over the filtered rows,
+and answer a not-newer If-Modified-Since with 304. That costs one
+aggregate query, skipped when If-None-Match already matched; the ETag
+stays the stronger validator, as a delete moves no timestamp.
+
+Pages read from a replica right after a write get no validators, so a
+client never holds one for rows the replica did not have yet.
+"""
+
+from django.db.models import Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from .listcache import CachedListMixin, generation_timeout
+
+
+class ConditionalListMixin(CachedListMixin):
+    # updated_at lookups whose newest value dates the list (Last-Modified)
+    last_modified_fields = ()
+
+    def get_last_modified_fields(self):
+        return self.last_modified_fields
+
+    def last_modified(self):
+        """Newest ``last_modified_fields`` timestamp of the filtered rows, or None"""
+        fields = self.get_last_modified_fields()
+        if not fields:
+            return None
+        newest = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+            **{f"newest_{index}": Max(field) for index, field in enumerate(fields)}
+        )
+        stamps = [stamp for stamp in newest.values() if stamp is not None]
+        return max(stamps) if stamps else None
+
+    def list(self, request, *args, **kwargs):
+        settled = self.settled()
+        etag = None
+        # Generations that expire at once would change the ETag on every request
+        if settled and generation_timeout() != 0:
+            etag = quote_etag(self.list_cache_key().rsplit(":", 1)[1])
+
+        not_modified = get_conditional_response(request._request, etag=etag) if etag else None
+        last_modified = None
+        if not_modified is None and settled:
+            last_modified = self.last_modified()
+            if last_modified is not None:
+                not_modified = get_conditional_response(
+                    request._request, etag=etag, last_modified=last_modified.timestamp(),
+                )
+
+        if not_modified is not None:
+            # 304, or 412 for a failed If-Match / If-Unmodified-Since
+            response = Response(status=not_modified.status_code)
+        else:
+            response = super().list(request, *args, **kwargs)
+
+        if etag:
+            response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        return response
@@ -0,0 +1,74 @@
+"""
+JSON renderer and parser backed by orjson when it is installed.
+
+Both are drop-in replacements for DRF's JSONRenderer/JSONParser
+(configured as the defaults in settings.REST_FRAMEWORK) and produce the
+same bytes / Python objects:
+
+  - orjson's compact UTF-8 output matches DRF with UNICODE_JSON and
+    COMPACT_JSON on (the defaults); U+2028/U+2029 are escaped as DRF does
+  - values orjson does not handle itself go through DRF's own encoder:
+    dates, times and datetimes ("Z" for UTC), raw Decimals, lazy strings,
+    querysets. Serializer DecimalFields are already strings.
+  - anything orjson refuses (integers over 64 bits, NaN on input, other
+    charsets, ?indent= requests) is handed to the DRF class, so errors
+    and edge cases are unchanged
+
+The one difference is floats with an exponent: orjson writes 1e16
+where the stdlib writes 1e+16. The API has no such values.
+
+Without orjson (pip install orjson) both classes are DRF's as-is.
+"""
+
+import io
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+def is_utf8(encoding):
+    return encoding.lower().replace("-", "").replace("_", "") == "utf8"
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            rendered = orjson.dumps(data, default=self.encoder_class().default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Valid JSON but not valid JavaScript; DRF escapes them too
+        return rendered.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        encoding = (parser_context or {}).get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or not is_utf8(encoding):
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            # Whatever the stdlib accepts or the error it reports
+            return super().parse(io.BytesIO(body), media_type, parser_context)
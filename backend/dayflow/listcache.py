@@ -0,0 +1,136 @@
+"""
+Versioned cache of serialized list pages.
+
+Every table a cached list reads has a generation in the cache
+(``dayflow:generation:<app_label.model>``), replaced on each write to
+it, and again when the writing transaction commits:
+
+  - post_save / post_delete of the models in dayflow/signals.py cover
+    single-row writes (check-in/out, leave decisions, profile and
+    salary edits)
+  - bump() is called on the bulk paths that skip signals (punch
+    ingestion, bulk leave decisions, payroll generation, CSV onboarding,
+    seed_org)
+
+CachedListMixin keys a page by view, full path (page, filters,
+?fields=), role scope (ADMIN and HR see the same lists, employees their
+own) and the generations of its ``cache_models``. A write therefore
+makes every page that read the table unreachable at once; nothing is
+deleted, the old entries just expire after LIST_CACHE_TTL.
+
+A generation is the time of the bump in nanoseconds, so a generation
+lost to eviction restarts at a value no cached page was keyed with.
+Pages read from a read replica within REPLICA_PIN_SECONDS of a bump are
+not stored: the replica may not have the write yet.
+
+With LocMemCache (the default) generations are per process: a write is
+only seen by the worker that made it. Unless LIST_CACHE_SHARED (a cache
+all workers share, e.g. Redis via CACHE_BACKEND), generations therefore
+expire after LIST_CACHE_TTL like the pages, so another worker serves a
+stale page, or answers a stale ETag with 304, for at most that long.
+With LIST_CACHE_TTL=0 and no shared cache there is neither page cache
+nor ETag.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+from .replica import read_alias
+
+
+def table_of(model):
+    return model._meta.label_lower
+
+
+def generation_key(model):
+    return f"dayflow:generation:{table_of(model)}"
+
+
+def generation_timeout():
+    """Lifetime of a generation: unlimited in a shared cache, else LIST_CACHE_TTL"""
+    return None if settings.LIST_CACHE_SHARED else settings.LIST_CACHE_TTL
+
+
+def generations(models):
+    """Current generation of each model's table, starting missing ones now"""
+    keys = [generation_key(model) for model in models]
+    found = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, generation_timeout())
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+def bump(*models, using=None):
+    """Start new generations of the models' tables, again on commit inside a transaction"""
+    keys = [generation_key(model) for model in models]
+
+    def start():
+        cache.set_many({key: time.time_ns() for key in keys}, generation_timeout())
+
+    # Now, so reads inside the transaction miss; and again on commit, as
+    # other requests may meanwhile have cached the old rows under the
+    # generation started now
+    start()
+    if transaction.get_connection(using).in_atomic_block:
+        transaction.on_commit(start, using=using)
+
+
+class CachedListMixin:
+    # Models whose tables the page is built from
+    cache_models = ()
+
+    def cache_scope(self):
+        user = self.request.user
+        return user.role if user.role in ["ADMIN", "HR"] else f"user:{user.pk}"
+
+    def cache_vary_on(self):
+        """Extra key parts for pages that depend on more than the request (e.g. today)"""
+        return ()
+
+    def list_cache_key(self):
+        """Cache key of the requested page; the generations are read once per request"""
+        if getattr(self, "_list_cache_key", None) is None:
+            self._list_stamps = generations(self.cache_models)
+            digest = hashlib.md5(
+                "|".join(
+                    str(part) for part in (
+                        self.request.get_full_path(), self.cache_scope(), *self.cache_vary_on(),
+                        *self._list_stamps,
+                    )
+                ).encode()
+            ).hexdigest()
+            self._list_cache_key = f"dayflow:list:{type(self).__qualname__}:{digest}"
+        return self._list_cache_key
+
+    def list(self, request, *args, **kwargs):
+        if not settings.LIST_CACHE_TTL:
+            return super().list(request, *args, **kwargs)
+
+        key = self.list_cache_key()
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200 and self.settled():
+            cache.set(key, response.data, settings.LIST_CACHE_TTL)
+        return response
+
+    def settled(self):
+        """
+        Whether the page may be cached or validated under its key: always,
+        unless it is read from a replica that may not have the last bump's
+        write yet
+        """
+        if read_alias() is None:
+            return True
+        self.list_cache_key()
+        cutoff = time.time_ns() - settings.REPLICA_PIN_SECONDS * 1_000_000_000
+        return all(stamp < cutoff for stamp in self._list_stamps)
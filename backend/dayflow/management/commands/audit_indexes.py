@@ -0,0 +1,136 @@
+"""
+Run EXPLAIN on the querysets behind every list endpoint and flag full
+table scans.
+
+    python manage.py audit_indexes            # report only
+    python manage.py audit_indexes --strict   # exit 1 on any scan (for CI)
+
+Each probe builds the view's real queryset (``get_queryset`` plus the
+paginator's ordering and page limit) for a representative request, so the
+plans match what production executes.
+"""
+
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import User
+from attendance.views import AttendanceHistoryView
+from employees.views import EmployeeListView
+from leave.views import LeaveListCreateView, OutOfOfficeView
+
+
+# (label, view class, role of requesting user, query params, allow_scan)
+# allow_scan marks plans where a scan is expected: bounded by the page LIMIT
+# or unavoidable for the filter.
+PROBES = [
+    ("attendance: own history", AttendanceHistoryView, "EMPLOYEE", {}, False),
+    ("attendance: own history, date range", AttendanceHistoryView, "EMPLOYEE",
+     {"start": "2025-01-01", "end": "2025-01-31"}, False),
+    ("attendance: company history", AttendanceHistoryView, "ADMIN", {}, False),
+    ("attendance: company day range", AttendanceHistoryView, "ADMIN",
+     {"start": "2025-01-01", "end": "2025-01-01"}, False),
+    ("attendance: one employee", AttendanceHistoryView, "ADMIN", {"employee_id": "1"}, False),
+    ("leave: own leaves", LeaveListCreateView, "EMPLOYEE", {}, False),
+    # Ordered by the primary key, so SQLite reports a rowid walk as "SCAN";
+    # it stops after one page thanks to the LIMIT.
+    ("leave: all leaves", LeaveListCreateView, "ADMIN", {}, True),
+    ("leave: who is out", OutOfOfficeView, "ADMIN", {"start": "2025-01-01", "end": "2025-01-07"}, False),
+    ("employees: directory", EmployeeListView, "ADMIN", {}, False),
+    ("employees: by role", EmployeeListView, "ADMIN", {"role": "HR"}, False),
+    # icontains compiles to LIKE '%...%', which no b-tree index can serve
+    ("employees: by department", EmployeeListView, "ADMIN", {"department": "eng"}, True),
+]
+
+SQLITE_SCAN = re.compile(r"\bSCAN (?:TABLE )?(\w+)(?! USING (?:COVERING )?INDEX)(?!\w)")
+POSTGRES_SCAN = re.compile(r"Seq Scan on (\w+)")
+SQLITE_SORT = re.compile(r"USE TEMP B-TREE FOR ORDER BY")
+POSTGRES_SORT = re.compile(r"^\s*(?:->\s*)?Sort\b", re.MULTILINE)
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN every list endpoint's queryset and flag full table scans"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--strict",
+            action="store_true",
+            help="Exit with status 1 if any non-allowed full table scan is found",
+        )
+        parser.add_argument(
+            "--verbose-plans",
+            action="store_true",
+            help="Print the full plan for every probe",
+        )
+
+    def handle(self, *args, **options):
+        vendor = connection.vendor
+        if vendor == "sqlite":
+            scan_pattern, sort_pattern = SQLITE_SCAN, SQLITE_SORT
+        elif vendor == "postgresql":
+            scan_pattern, sort_pattern = POSTGRES_SCAN, POSTGRES_SORT
+        else:
+            raise CommandError(f"Unsupported database backend: {vendor}")
+
+        factory = APIRequestFactory()
+        failures = 0
+
+        for label, view_class, role, params, allow_scan in PROBES:
+            queryset = self._build_queryset(factory, view_class, role, params)
+            plan = self._explain(queryset, vendor)
+            scans = sorted(set(scan_pattern.findall(plan)))
+
+            if not scans:
+                if sort_pattern.search(plan):
+                    self.stdout.write(
+                        self.style.WARNING(f"SORT    {label}: ordering is not served by an index")
+                    )
+                else:
+                    self.stdout.write(self.style.SUCCESS(f"OK      {label}"))
+            elif allow_scan:
+                self.stdout.write(
+                    self.style.WARNING(f"ALLOWED {label}: full scan of {', '.join(scans)}")
+                )
+            else:
+                failures += 1
+                self.stdout.write(
+                    self.style.ERROR(f"SCAN    {label}: full scan of {', '.join(scans)}")
+                )
+
+            if options["verbose_plans"] or (scans and not allow_scan):
+                for line in plan.splitlines():
+                    self.stdout.write(f"          {line}")
+
+        if failures and options["strict"]:
+            raise CommandError(f"{failures} list endpoint(s) perform full table scans")
+
+    def _build_queryset(self, factory, view_class, role, params):
+        # Unsaved user with a pk: enough for the role checks and user filters
+        user = User(pk=1, username="audit", role=role)
+        request = factory.get("/", params)
+        force_authenticate(request, user=user)
+
+        view = view_class()
+        view.setup(request)
+        view.request = view.initialize_request(request)
+        view.request.user = user
+        view.format_kwarg = None
+
+        queryset = view.get_queryset()
+        paginator = view.paginator
+        if paginator is not None:
+            queryset = queryset.order_by(*paginator.ordering)
+            queryset = queryset[: paginator.get_page_size(view.request) + 1]
+        return queryset
+
+    def _explain(self, queryset, vendor):
+        if vendor == "postgresql":
+            # Small CI databases make seq scans look cheaper than any index;
+            # discourage them so the plan reflects which indexes exist.
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+                return queryset.explain()
+        return queryset.explain()
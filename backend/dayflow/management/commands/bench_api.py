@@ -0,0 +1,189 @@
+"""
+Latency, query and memory benchmark of the read endpoints on seeded data.
+
+    python manage.py seed_org --scale medium
+    python manage.py bench_api --save-baseline      # record benchmarks/baseline.json
+    python manage.py bench_api                      # compare against it
+    python manage.py bench_api --endpoint attendance --iterations 100
+
+Each endpoint is requested through the full Django/DRF stack in-process
+(APIClient, real middleware, authentication forced as a seeded user):
+--warmup unmeasured requests, then --iterations timed ones for p50/p99,
+one under CaptureQueriesContext for the query count and one under
+tracemalloc for peak memory.
+
+The list page cache (dayflow/listcache.py) is off while measuring, so
+the numbers are those of a cache miss; --list-cache measures hits.
+
+With a baseline file, an endpoint regresses when p50 or p99 or peak
+memory grows by more than --tolerance, or it runs more queries; the
+command then exits with an error, so it can gate CI.
+"""
+
+import json
+import time
+import tracemalloc
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from accounts.models import User
+
+from .bench_checkins import percentile
+from .seed_org import ADMIN_USERNAME, PREFIX
+
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "baseline.json"
+
+
+def endpoints(today):
+    """(name, as_admin, url) of every benchmarked request"""
+    month_start = today.replace(day=1)
+    return [
+        ("auth.me", False, "/api/auth/me/"),
+        ("employees.list", True, "/api/employees/"),
+        ("employees.list.department", True, "/api/employees/?department=Engineering"),
+        ("employees.search", True, "/api/employees/search/?q=engineer"),
+        ("employees.skills", True, "/api/employees/skills/?all=python,sql"),
+        ("employees.skills.frequency", True, "/api/employees/skills/frequency/"),
+        ("employees.headcount", True, "/api/employees/headcount/"),
+        ("attendance.history", True, "/api/attendance/history/"),
+        ("attendance.history.own", False, "/api/attendance/history/?range=quarter"),
+        ("attendance.summary", True, f"/api/attendance/summary/?start={month_start}&end={today}"),
+        ("attendance.timesheet", True, f"/api/attendance/timesheet/?month={today:%Y-%m}"),
+        ("leave.list", True, "/api/leave/"),
+        ("leave.list.own", False, "/api/leave/"),
+        ("leave.balance.own", False, "/api/leave/balance/"),
+        ("leave.out", True, f"/api/leave/out/?start={today}&end={today}"),
+        ("payroll.salaries", True, "/api/payroll/"),
+        ("payroll.runs", True, "/api/payroll/runs/"),
+    ]
+
+
+class Command(BaseCommand):
+    help = "Benchmark the read endpoints on a seeded organisation (see seed_org)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=30, help="Timed requests per endpoint")
+        parser.add_argument("--warmup", type=int, default=3, help="Unmeasured requests per endpoint")
+        parser.add_argument("--endpoint", action="append", help="Only endpoints whose name contains this")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline JSON file")
+        parser.add_argument("--save-baseline", action="store_true", help="Write the results as the baseline")
+        parser.add_argument("--list-cache", action="store_true", help="Serve list pages from the list cache")
+        parser.add_argument(
+            "--tolerance", type=float, default=0.25,
+            help="Allowed relative growth of p50/p99/memory before it counts as a regression",
+        )
+
+    def handle(self, *args, **options):
+        from rest_framework.test import APIClient
+
+        if options["iterations"] < 1:
+            raise CommandError("--iterations must be positive")
+        admin = User.objects.filter(username=ADMIN_USERNAME).first()
+        employee = User.objects.filter(username=f"{PREFIX}1").first()
+        if admin is None or employee is None:
+            raise CommandError("No seeded organisation found; run manage.py seed_org first")
+
+        selected = [
+            endpoint for endpoint in endpoints(timezone.localdate())
+            if not options["endpoint"] or any(part in endpoint[0] for part in options["endpoint"])
+        ]
+        if not selected:
+            raise CommandError("No endpoint matches --endpoint")
+
+        clients = {}
+        for as_admin, user in ((True, admin), (False, employee)):
+            clients[as_admin] = APIClient()
+            clients[as_admin].force_authenticate(user)
+
+        baseline_path = Path(options["baseline"])
+        baseline = {}
+        if baseline_path.exists() and not options["save_baseline"]:
+            baseline = json.loads(baseline_path.read_text())["endpoints"]
+
+        self.stdout.write(
+            f"{'endpoint':<30}{'p50 ms':>9}{'p99 ms':>9}{'queries':>9}{'peak KiB':>10}  vs baseline"
+        )
+        results, regressions = {}, []
+        for name, as_admin, url in selected:
+            with override_settings(LIST_CACHE_TTL=settings.LIST_CACHE_TTL if options["list_cache"] else 0):
+                result = self.measure(clients[as_admin], url, options["iterations"], options["warmup"])
+            results[name] = result
+            changes = self.compare(result, baseline.get(name), options["tolerance"])
+            if any(regressed for _, regressed in changes):
+                regressions.append(name)
+            self.stdout.write(
+                f"{name:<30}{result['p50_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+                f"{result['queries']:>9}{result['peak_kib']:>10.0f}  "
+                + ", ".join(text for text, _ in changes)
+            )
+
+        if options["save_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps({
+                "employees": User.objects.filter(username__startswith=PREFIX).count(),
+                "database": connection.vendor,
+                "endpoints": results,
+            }, indent=2) + "\n")
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {baseline_path}"))
+        elif regressions:
+            raise CommandError(f"Regressed against {baseline_path}: {', '.join(regressions)}")
+
+    def measure(self, client, url, iterations, warmup):
+        for _ in range(warmup):
+            self.get(client, url)
+
+        latencies = []
+        for _ in range(iterations):
+            began = time.perf_counter()
+            self.get(client, url)
+            latencies.append(time.perf_counter() - began)
+
+        with CaptureQueriesContext(connection) as captured:
+            self.get(client, url)
+        # Read now: the next request_started clears the query log
+        queries = len(captured.captured_queries)
+
+        tracemalloc.start()
+        try:
+            self.get(client, url)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        return {
+            "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+            "queries": queries,
+            "peak_kib": round(peak / 1024, 1),
+        }
+
+    @staticmethod
+    def get(client, url):
+        response = client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f"GET {url} returned {response.status_code}")
+        if response.streaming:
+            b"".join(response.streaming_content)
+        return response
+
+    @staticmethod
+    def compare(result, base, tolerance):
+        """[(text, regressed)] per measurement that differs from the baseline"""
+        if base is None:
+            return [("new", False)]
+        changes = []
+        for key in ("p50_ms", "p99_ms", "peak_kib"):
+            if base[key]:
+                ratio = result[key] / base[key] - 1
+                changes.append((f"{key} {ratio:+.0%}", ratio > tolerance))
+        if result["queries"] != base["queries"]:
+            changes.append((
+                f"queries {base['queries']}->{result['queries']}", result["queries"] > base["queries"],
+            ))
+        return changes
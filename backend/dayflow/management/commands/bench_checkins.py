@@ -0,0 +1,156 @@
+"""
+Concurrent check-in throughput on SQLite, before and after connection tuning.
+
+    python manage.py bench_checkins
+    python manage.py bench_checkins --workers 8 --checkins 200 --profile tuned
+
+Every profile runs against a fresh temporary SQLite file (migrated in a
+subprocess) with --workers separate processes, like gunicorn workers,
+that each POST --checkins check-ins for their own employees through the
+real CheckInView, all starting at the same moment.
+
+  untuned  the previous setup: rollback journal, full fsync, deferred
+           transactions, a new connection per request
+  tuned    settings.SQLITE_PRAGMAS (WAL, busy_timeout, synchronous=NORMAL,
+           bigger cache), BEGIN IMMEDIATE and persistent connections
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+
+
+PROFILES = {
+    "untuned": {"SQLITE_TUNING": "False", "DB_CONN_MAX_AGE": "0"},
+    "tuned": {"SQLITE_TUNING": "True", "DB_CONN_MAX_AGE": "60"},
+}
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+class Command(BaseCommand):
+    help = "Measure concurrent check-in throughput on SQLite, untuned vs tuned"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=4, help="Concurrent worker processes")
+        parser.add_argument("--checkins", type=int, default=100, help="Check-ins per worker")
+        parser.add_argument(
+            "--profile",
+            choices=sorted(PROFILES),
+            action="append",
+            help="Profile(s) to run (default: all)",
+        )
+        parser.add_argument(
+            "--startup",
+            type=float,
+            default=5.0,
+            help="Seconds given to the workers to boot before the clock starts",
+        )
+        # Internal: run as one worker process of a benchmark
+        parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+        parser.add_argument("--start-at", type=float, help=argparse.SUPPRESS)
+
+    def handle(self, *args, **options):
+        if options["worker"] is not None:
+            return self.run_worker(options["worker"], options["checkins"], options["start_at"])
+
+        if options["workers"] < 1 or options["checkins"] < 1:
+            raise CommandError("--workers and --checkins must be positive")
+
+        self.stdout.write(
+            f"{'profile':<10}{'workers':>8}{'ok':>8}{'failed':>8}{'seconds':>10}"
+            f"{'per sec':>10}{'p50 ms':>9}{'p99 ms':>9}"
+        )
+        for name in options["profile"] or list(PROFILES):
+            result = self.run_profile(name, options["workers"], options["checkins"], options["startup"])
+            self.stdout.write(
+                f"{name:<10}{options['workers']:>8}{result['ok']:>8}{result['failed']:>8}"
+                f"{result['seconds']:>10.2f}{result['ok'] / result['seconds']:>10.1f}"
+                f"{result['p50'] * 1000:>9.1f}{result['p99'] * 1000:>9.1f}"
+            )
+
+    def run_profile(self, name, workers, checkins, startup):
+        manage = str(Path(settings.BASE_DIR) / "manage.py")
+        with tempfile.TemporaryDirectory() as directory:
+            env = {
+                **os.environ,
+                **PROFILES[name],
+                "DATABASE_URL": f"sqlite:///{directory}/bench.sqlite3",
+            }
+            subprocess.run(
+                [sys.executable, manage, "migrate", "--noinput"],
+                env=env, check=True, stdout=subprocess.DEVNULL,
+            )
+
+            start_at = time.time() + startup
+            processes = [
+                subprocess.Popen(
+                    [sys.executable, manage, "bench_checkins", "--worker", str(index),
+                     "--checkins", str(checkins), "--start-at", str(start_at)],
+                    env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True,
+                )
+                for index in range(workers)
+            ]
+            reports = []
+            for process in processes:
+                output, _ = process.communicate()
+                if process.returncode != 0:
+                    raise CommandError(f"A benchmark worker failed (exit {process.returncode})")
+                reports.append(json.loads(output.strip().splitlines()[-1]))
+
+        latencies = [latency for report in reports for latency in report["latencies"]]
+        return {
+            "ok": sum(report["ok"] for report in reports),
+            "failed": sum(report["failed"] for report in reports),
+            "seconds": max(report["end"] for report in reports) - min(report["start"] for report in reports),
+            "p50": percentile(latencies, 0.50),
+            "p99": percentile(latencies, 0.99),
+        }
+
+    def run_worker(self, index, checkins, start_at):
+        from rest_framework.test import APIClient
+
+        from accounts.models import User
+
+        password = make_password(None)
+        users = User.objects.bulk_create([
+            User(username=f"bench-{index}-{number}", password=password)
+            for number in range(checkins)
+        ])
+
+        client = APIClient()
+        time.sleep(max(start_at - time.time(), 0))
+
+        ok = failed = 0
+        latencies = []
+        start = time.time()
+        for user in users:
+            client.force_authenticate(user)
+            began = time.perf_counter()
+            try:
+                response = client.post("/api/attendance/check-in/")
+                succeeded = response.status_code == 201
+            except Exception:
+                # "database is locked" surfaces as an OperationalError
+                succeeded = False
+            latencies.append(time.perf_counter() - began)
+            ok += succeeded
+            failed += not succeeded
+
+        self.stdout.write(json.dumps({
+            "ok": ok, "failed": failed, "start": start, "end": time.time(), "latencies": latencies,
+        }))
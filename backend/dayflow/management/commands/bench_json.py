@@ -0,0 +1,119 @@
+"""
+JSON rendering/parsing throughput of DRF's classes vs dayflow.fastjson.
+
+    python manage.py bench_json
+    python manage.py bench_json --rows 20000 --repeat 10
+
+Builds large list payloads in memory (no database needed) with the real
+serializers: salary structures (ten computed Decimal fields, datetimes)
+and attendance rows (dates and times). Serializer output is computed
+once; only render() and parse() are timed. Every fast rendering is
+checked byte for byte against DRF's before timing.
+"""
+
+import io
+import time
+from datetime import date, datetime, time as clock, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import models
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from accounts.models import User
+from attendance.models import Attendance
+from attendance.serializers import AttendanceSerializer
+from dayflow import fastjson
+from payroll.models import SalaryStructure
+from payroll.serializers import SalaryStructureSerializer
+
+
+def salary_payload(rows):
+    stamp = datetime(2025, 4, 1, 9, 30, 15, 123456, tzinfo=dt_timezone.utc)
+    # As loaded from the database; the model defaults are floats
+    decimals = {
+        field.name: Decimal(str(field.default))
+        for field in SalaryStructure._meta.fields
+        if isinstance(field, models.DecimalField)
+    }
+    structures = [
+        SalaryStructure(
+            **{**decimals, "monthly_wage": Decimal(25000 + number % 200 * 500)},
+            pk=number,
+            employee=User(pk=number, username=f"user{number}", first_name="Asha", last_name="Rao"),
+            created_at=stamp,
+            updated_at=stamp,
+        )
+        for number in range(1, rows + 1)
+    ]
+    return SalaryStructureSerializer(structures, many=True).data
+
+
+def attendance_payload(rows):
+    stamp = datetime(2025, 4, 1, 18, 0, tzinfo=dt_timezone.utc)
+    records = [
+        Attendance(
+            pk=number, user_id=number % 500 + 1, date=date(2025, 1, 1) + timedelta(days=number % 365),
+            check_in=clock(9, number % 60), check_out=clock(18, number % 60, 30),
+            status="PRESENT", worked_minutes=540, overtime_minutes=60, updated_at=stamp,
+        )
+        for number in range(1, rows + 1)
+    ]
+    return AttendanceSerializer(records, many=True).data
+
+
+PAYLOADS = {
+    "salary structures": salary_payload,
+    "attendance": attendance_payload,
+}
+
+
+def best_of(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        began = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - began)
+    return min(timings)
+
+
+class Command(BaseCommand):
+    help = "Compare JSON render/parse throughput of DRF and the orjson-backed classes"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000, help="Rows per payload")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs; the best is reported")
+
+    def handle(self, *args, **options):
+        if options["rows"] < 1 or options["repeat"] < 1:
+            raise CommandError("--rows and --repeat must be positive")
+        if fastjson.orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed; the fast classes fall back to DRF's"))
+
+        renderers = {"drf": JSONRenderer(), "fast": fastjson.FastJSONRenderer()}
+        parsers = {"drf": JSONParser(), "fast": fastjson.FastJSONParser()}
+
+        self.stdout.write(
+            f"{'payload':<20}{'step':<8}{'bytes':>12}{'drf rows/s':>14}{'fast rows/s':>14}{'speedup':>9}"
+        )
+        for name, build in PAYLOADS.items():
+            data = build(options["rows"])
+            expected = renderers["drf"].render(data)
+            if renderers["fast"].render(data) != expected:
+                raise CommandError(f"Fast rendering of {name} differs from DRF's")
+
+            render = {
+                key: best_of(lambda renderer=renderer: renderer.render(data), options["repeat"])
+                for key, renderer in renderers.items()
+            }
+            parse = {
+                key: best_of(lambda parser=parser: parser.parse(io.BytesIO(expected)), options["repeat"])
+                for key, parser in parsers.items()
+            }
+            for step, timings in (("render", render), ("parse", parse)):
+                self.stdout.write(
+                    f"{name:<20}{step:<8}{len(expected):>12,}"
+                    f"{options['rows'] / timings['drf']:>14,.0f}{options['rows'] / timings['fast']:>14,.0f}"
+                    f"{timings['drf'] / timings['fast']:>8.1f}x"
+                )
@@ -0,0 +1,277 @@
+"""
+Per-endpoint request metrics.
+
+RequestMetricsMiddleware measures every request that resolves to a view:
+
+  - wall time, from the first middleware to the last byte of the body
+  - SQL queries and time spent in them, on every database alias
+  - time spent building serializer ``.data``
+  - response size in bytes
+
+and records them in the histograms below, labelled with the view class
+and HTTP method. GET /metrics serves them in the Prometheus text format
+(behind METRICS_TOKEN; open without one only with DEBUG). The timings of the request also
+go back to the client in a Server-Timing header, so they show up in the
+browser's network panel.
+
+Requests slower than SLOW_REQUEST_MS are logged on the
+"dayflow.performance" logger at WARNING, with the SQL of their slowest
+queries.
+
+Metrics are kept in memory per process: with several gunicorn workers
+every worker exposes its own, so scrape each worker (or run the metrics
+from one) rather than load-balancing the scrape.
+"""
+
+import heapq
+import logging
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger("dayflow.performance")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+# The RequestStats of the request being served on this thread / task
+current_stats = ContextVar("dayflow_request_stats", default=None)
+
+
+class Histogram:
+    """A Prometheus histogram with labels, safe to observe from threads"""
+
+    def __init__(self, name, documentation, buckets, labels=("view", "method")):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.labels = labels
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        with self.lock:
+            counts = self.series.get(label_values)
+            if counts is None:
+                # One count per bucket, then +Inf count and sum
+                counts = self.series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            counts[-2] += 1
+            counts[-1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self.lock:
+            series = sorted((key, list(counts)) for key, counts in self.series.items())
+        for label_values, counts in series:
+            labels = ",".join(f'{name}="{value}"' for name, value in zip(self.labels, label_values))
+            for bound, count in zip(self.buckets, counts):
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {counts[-2]}')
+            lines.append(f"{self.name}_count{{{labels}}} {counts[-2]}")
+            lines.append(f"{self.name}_sum{{{labels}}} {counts[-1]:.6f}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, documentation, labels=("view", "method", "status")):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *label_values):
+        with self.lock:
+            self.series[label_values] = self.series.get(label_values, 0) + 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self.lock:
+            series = sorted(self.series.items())
+        for label_values, value in series:
+            labels = ",".join(f'{name}="{value}"' for name, value in zip(self.labels, label_values))
+            lines.append(f"{self.name}{{{labels}}} {value}")
+        return lines
+
+
+REQUESTS = Counter("dayflow_requests_total", "Requests served, by view, method and status.")
+REQUEST_SECONDS = Histogram(
+    "dayflow_request_duration_seconds", "Wall time of the request.", LATENCY_BUCKETS,
+)
+DB_QUERIES = Histogram(
+    "dayflow_request_db_queries", "SQL queries run by the request.", QUERY_BUCKETS,
+)
+DB_SECONDS = Histogram(
+    "dayflow_request_db_duration_seconds", "Time the request spent in SQL queries.", LATENCY_BUCKETS,
+)
+SERIALIZER_SECONDS = Histogram(
+    "dayflow_request_serializer_duration_seconds",
+    "Time the request spent building serializer data.",
+    LATENCY_BUCKETS,
+)
+RESPONSE_BYTES = Histogram(
+    "dayflow_response_size_bytes", "Size of the response body.", SIZE_BUCKETS,
+)
+
+METRICS = (REQUESTS, REQUEST_SECONDS, DB_QUERIES, DB_SECONDS, SERIALIZER_SECONDS, RESPONSE_BYTES)
+
+
+def render_metrics():
+    return "\n".join(line for metric in METRICS for line in metric.render()) + "\n"
+
+
+class RequestStats:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.serializing = False
+        self.response_bytes = 0
+        # (seconds, sql) of the slowest queries, smallest first
+        self.slowest = []
+
+    def record_query(self, execute, sql, params, many, context):
+        began = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - began
+            self.queries += 1
+            self.db_seconds += elapsed
+            entry = (elapsed, sql)
+            if len(self.slowest) < settings.SLOW_REQUEST_QUERIES:
+                heapq.heappush(self.slowest, entry)
+            elif self.slowest and entry > self.slowest[0]:
+                heapq.heapreplace(self.slowest, entry)
+
+    @contextmanager
+    def measuring(self):
+        token = current_stats.set(self)
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(self.record_query))
+                yield
+        finally:
+            current_stats.reset(token)
+
+    def server_timing(self):
+        total = (time.perf_counter() - self.started) * 1000
+        return (
+            f'db;dur={self.db_seconds * 1000:.1f};desc="{self.queries} queries", '
+            f"serializer;dur={self.serializer_seconds * 1000:.1f}, "
+            f"total;dur={total:.1f}"
+        )
+
+
+def timed_data(data):
+    """Wrap a serializer ``data`` property to charge its time to the request"""
+
+    def getter(serializer):
+        stats = current_stats.get()
+        if stats is None or stats.serializing:
+            # .data of a serializer used inside another one is already counted
+            return data.fget(serializer)
+        stats.serializing = True
+        began = time.perf_counter()
+        try:
+            return data.fget(serializer)
+        finally:
+            stats.serializer_seconds += time.perf_counter() - began
+            stats.serializing = False
+
+    getter.timed = True
+    return property(getter)
+
+
+def install_serializer_timing():
+    """
+    Time BaseSerializer.data, which Serializer.data and ListSerializer.data
+    both go through.
+    """
+    from rest_framework.serializers import BaseSerializer
+
+    if not getattr(BaseSerializer.data.fget, "timed", False):
+        BaseSerializer.data = timed_data(BaseSerializer.data)
+
+
+def view_label(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return None
+    view = getattr(match.func, "view_class", match.func)
+    return view.__qualname__
+
+
+class RequestMetricsMiddleware:
+    """Goes first, so its wall time covers the other middleware too"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.REQUEST_METRICS:
+            return self.get_response(request)
+
+        stats = RequestStats()
+        with stats.measuring():
+            response = self.get_response(request)
+
+        view = view_label(request)
+        if view is None:
+            # 404s and other requests that never reached a view
+            return response
+
+        response["Server-Timing"] = stats.server_timing()
+        if response.streaming:
+            response.streaming_content = self.stream(request, response, stats, view, response.streaming_content)
+        else:
+            stats.response_bytes = len(response.content)
+            self.record(request, response, stats, view)
+        return response
+
+    def stream(self, request, response, stats, view, content):
+        # Streamed exports query while the body is sent
+        chunks = iter(content)
+        try:
+            while True:
+                with stats.measuring():
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    return
+                stats.response_bytes += len(chunk)
+                yield chunk
+        finally:
+            self.record(request, response, stats, view)
+
+    def record(self, request, response, stats, view):
+        seconds = time.perf_counter() - stats.started
+        method = request.method
+        REQUESTS.inc(view, method, str(response.status_code))
+        REQUEST_SECONDS.observe(seconds, view, method)
+        DB_QUERIES.observe(stats.queries, view, method)
+        DB_SECONDS.observe(stats.db_seconds, view, method)
+        SERIALIZER_SECONDS.observe(stats.serializer_seconds, view, method)
+        RESPONSE_BYTES.observe(stats.response_bytes, view, method)
+
+        if seconds * 1000 >= settings.SLOW_REQUEST_MS:
+            logger.warning(
+                "Slow request %s %s (%s) %.0f ms: %d queries in %.0f ms, serializer %.0f ms, %d bytes\n%s",
+                method, request.get_full_path(), view, seconds * 1000,
+                stats.queries, stats.db_seconds * 1000, stats.serializer_seconds * 1000,
+                stats.response_bytes,
+                "\n".join(
+                    f"  {elapsed * 1000:.1f} ms  {sql}"
+                    for elapsed, sql in sorted(stats.slowest, reverse=True)
+                ),
+            )
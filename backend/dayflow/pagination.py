@@ -0,0 +1,181 @@
+"""
+Keyset (cursor) pagination shared by the list endpoints.
+
+DRF's CursorPagination seeks on the first ordering column only and steps
+over rows tying on it with an OFFSET. KeysetPagination instead puts the
+values of every ordering column of the page's edge row in the cursor and
+continues strictly after (or, for ?previous, before) that row:
+
+    WHERE a >= :a AND (a > :a OR (a = :a AND b > :b) OR ...)
+
+Orderings end in a unique column, so there are no ties to skip and no
+OFFSET; with an index on the ordering columns (see the model Meta
+indexes) every page is one index range scan however deep it is.
+"""
+
+import json
+from base64 import b64decode, b64encode
+from urllib import parse
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import BigIntegerField, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, _reverse_ordering
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """Base cursor paginator; page size is overridable with ?page_size="""
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if self.cursor is not None:
+            values = self.position_values(queryset.model, self.cursor.position)
+            queryset = queryset.filter(self.after(ordering, values))
+
+        # One extra row tells whether there is a page beyond this one
+        results = list(queryset[:self.page_size + 1])
+        self.page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    @staticmethod
+    def after(ordering, position):
+        """Rows strictly after ``position`` in ``ordering``, led by a range on its first column"""
+        columns = [(order.lstrip("-"), "lt" if order.startswith("-") else "gt") for order in ordering]
+        following = Q()
+        for index, (column, op) in enumerate(columns):
+            step = Q(**{f"{column}__{op}": position[index]})
+            for (earlier, _), value in zip(columns[:index], position):
+                step &= Q(**{earlier: value})
+            following |= step
+        first, op = columns[0]
+        return Q(**{f"{first}__{op}e": position[0]}) & following
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self.position(self.page[-1]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self.position(self.page[0]) if self.page else self.cursor.position
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def position(self, instance):
+        """Values of the ordering columns of a row, as strings"""
+        values = []
+        for order in self.ordering:
+            field_name = order.lstrip("-")
+            value = instance[field_name] if isinstance(instance, dict) else getattr(instance, field_name)
+            values.append(str(value))
+        return values
+
+    def position_values(self, model, position):
+        """A cursor's strings as values of the ordering fields; 404 when one is not"""
+        values = []
+        for order, value in zip(self.ordering, position):
+            field = model._meta.get_field(order.lstrip("-"))
+            if field.is_relation:
+                field = field.target_field
+            try:
+                value = field.to_python(value)
+                field.run_validators(value)
+            except DjangoValidationError:
+                raise NotFound(self.invalid_cursor_message)
+            # SQLite reports no integer range to validate against
+            if isinstance(value, int) and abs(value) > BigIntegerField.MAX_BIGINT:
+                raise NotFound(self.invalid_cursor_message)
+            values.append(value)
+        return values
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            tokens = parse.parse_qs(b64decode(encoded.encode("ascii")).decode("ascii"), keep_blank_values=True)
+            reverse = bool(int(tokens.get("r", ["0"])[0]))
+            position = json.loads(tokens["p"][0])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if (
+            not isinstance(position, list)
+            or len(position) != len(self.ordering)
+            or not all(isinstance(value, str) for value in position)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+        return Cursor(offset=0, reverse=reverse, position=position)
+
+    def encode_cursor(self, cursor):
+        tokens = {"p": json.dumps(cursor.position)}
+        if cursor.reverse:
+            tokens["r"] = "1"
+        encoded = b64encode(parse.urlencode(tokens).encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+
+class AttendancePagination(KeysetPagination):
+    ordering = ("-date", "id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Views may size the default page to the requested date window
+        self.window_page_size = getattr(view, "window_page_size", None)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_page_size(self, request):
+        window_page_size = getattr(self, "window_page_size", None)
+        if window_page_size and self.page_size_query_param not in request.query_params:
+            return min(window_page_size, self.max_page_size)
+        return super().get_page_size(request)
+
+
+class LeavePagination(KeysetPagination):
+    ordering = ("-id",)
+
+
+class EmployeePagination(KeysetPagination):
+    ordering = ("first_name", "last_name", "id")
+
+
+class PayslipPagination(KeysetPagination):
+    ordering = ("-net_salary", "id")
+
+
+class TimesheetPagination(KeysetPagination):
+    ordering = ("user_id",)
+
+
+class OutOfOfficePagination(KeysetPagination):
+    # Matches the approved-leave interval index on (start_date, end_date)
+    ordering = ("start_date", "id")
+
+
+class SalaryStructurePagination(KeysetPagination):
+    ordering = ("id",)
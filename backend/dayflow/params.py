@@ -0,0 +1,34 @@
+"""
+Query parameter parsing for views.
+
+Each helper returns None when the parameter is absent or empty and
+raises a DRF ValidationError (400) naming the parameter when it is
+malformed, so bad input never reaches a queryset filter.
+"""
+
+from decimal import Decimal, InvalidOperation
+
+from rest_framework.exceptions import ValidationError
+
+
+def integer_param(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise ValidationError({name: "Expected an integer."})
+
+
+def decimal_param(request, name):
+    value = request.query_params.get(name)
+    if not value:
+        return None
+    try:
+        parsed = Decimal(value)
+    except InvalidOperation:
+        parsed = None
+    if parsed is None or not parsed.is_finite():
+        raise ValidationError({name: "Expected a number."})
+    return parsed
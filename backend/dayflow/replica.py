@@ -0,0 +1,156 @@
+"""
+Read-replica routing for list and report endpoints.
+
+With DATABASE_REPLICA_URL set, settings.DATABASE_READ_ALIAS names a
+second connection and ReplicaRouter sends reads there when all of these
+hold for the current request:
+
+  - the view opts in with ``read_replica = True`` (list/report views)
+  - the method is safe (GET/HEAD/OPTIONS); writes always use the primary
+  - no transaction is open on the primary
+  - the user has not written anything in the last REPLICA_PIN_SECONDS
+
+The last rule gives read-your-writes: every successful unsafe request
+pins its user to the primary for a short window, so a check-in is
+visible in their attendance history and a profile edit in /auth/me/
+even while the replica lags. Pins live in the cache, so they are shared
+between workers when the cache is (Redis).
+
+Everything else (management commands, signals, background work, views
+that did not opt in) reads from the primary as before.
+
+Two local SQLite files stand in for primary and replica:
+
+    export DATABASE_URL=sqlite:////tmp/primary.sqlite3
+    export DATABASE_REPLICA_URL=sqlite:////tmp/replica.sqlite3
+    python manage.py migrate && python manage.py migrate --database replica
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import SimpleLazyObject, empty
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# The HttpRequest being served on this thread / task, if any
+current_request = ContextVar("dayflow_current_request", default=None)
+
+
+def pin_cache_key(user_id):
+    return f"db-pin:{user_id}"
+
+
+def pin_to_primary(user_id):
+    cache.set(pin_cache_key(user_id), True, settings.REPLICA_PIN_SECONDS)
+
+
+def request_user_id(request):
+    """
+    The authenticated user's id, or None. DRF resolves the JWT user inside
+    the view and assigns it back to the HttpRequest; until then the
+    session middleware's lazy user is left unevaluated so routing never
+    costs a session lookup.
+    """
+    user = request.__dict__.get("user")
+    if user is None or (isinstance(user, SimpleLazyObject) and user._wrapped is empty):
+        return None
+    return user.pk if user.is_authenticated else None
+
+
+def is_pinned(request):
+    user_id = request_user_id(request)
+    if user_id is None:
+        return False
+    # One cache read per request and user
+    cached = getattr(request, "_replica_pin", None)
+    if cached is None or cached[0] != user_id:
+        cached = (user_id, bool(cache.get(pin_cache_key(user_id))))
+        request._replica_pin = cached
+    return cached[1]
+
+
+def read_alias():
+    """The alias reads of the current request may use, or None for the primary"""
+    alias = settings.DATABASE_READ_ALIAS
+    request = current_request.get()
+    if not alias or request is None or not getattr(request, "_read_replica", False):
+        return None
+    if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return None
+    return None if is_pinned(request) else alias
+
+
+@contextmanager
+def serving(request):
+    token = current_request.set(request)
+    try:
+        yield
+    finally:
+        current_request.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return read_alias() or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same data on both connections
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica carries the full schema (migrate --database replica
+        # for the local SQLite stand-in; real replicas copy it)
+        return True
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Makes the request visible to ReplicaRouter and pins users to the
+    primary after they write. Goes after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.DATABASE_READ_ALIAS:
+            return self.get_response(request)
+
+        with serving(request):
+            response = self.get_response(request)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            user_id = request_user_id(request)
+            if user_id is not None:
+                pin_to_primary(user_id)
+
+        if response.streaming:
+            # CSV exports query while the body is sent, after __call__ returns
+            response.streaming_content = self.stream(request, response.streaming_content)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, "view_class", None)
+        request._read_replica = (
+            request.method in SAFE_METHODS and getattr(view_class, "read_replica", False)
+        )
+
+    @staticmethod
+    def stream(request, content):
+        # Entered per chunk: the server may close the generator from
+        # another context
+        chunks = iter(content)
+        while True:
+            with serving(request):
+                chunk = next(chunks, None)
+            if chunk is None:
+                return
+            yield chunk
@@ -0,0 +1,51 @@
+"""
+Serializer helpers shared across apps.
+"""
+
+
+def parse_field_list(value):
+    """Split a comma-separated query param into a set of names"""
+    if not value:
+        return set()
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def requested_expansions(request):
+    """Names passed in ?expand=, for views that need to select_related them"""
+    if request is None:
+        return set()
+    return parse_field_list(request.query_params.get("expand"))
+
+
+class SparseFieldsMixin:
+    """
+    Sparse fieldsets for ModelSerializers.
+
+    ?fields=id,full_name     only serialize the listed top-level fields
+    ?expand=profile          swap a compact field for the richer serializer
+                             declared in Meta.expandable_fields
+
+    Meta.expandable_fields maps a field name to (serializer_class, kwargs).
+    Both can also be passed as ``fields=`` / ``expand=`` constructor kwargs,
+    which take precedence over the query string.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        expand = kwargs.pop("expand", None)
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get("request")
+        if fields is None and request is not None:
+            fields = parse_field_list(request.query_params.get("fields"))
+        if expand is None:
+            expand = requested_expansions(request)
+
+        expandable = getattr(self.Meta, "expandable_fields", {})
+        for name in set(expand) & set(expandable):
+            serializer_class, field_kwargs = expandable[name]
+            self.fields[name] = serializer_class(**field_kwargs)
+
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
@@ -7,6 +7,8 @@ from pathlib import Path
 from datetime import timedelta
 import os
 
+from .database import database_from_env
+
 # --------------------------------------------------
 # BASE DIR
 # --------------------------------------------------
@@ -42,6 +44,7 @@ INSTALLED_APPS = [
     'corsheaders',
 
     # Local apps
+    'dayflow',  # project-level management commands
     'accounts',
     'employees',
     'attendance',
@@ -53,6 +56,8 @@ INSTALLED_APPS = [
 # MIDDLEWARE (ORDER MATTERS)
 # --------------------------------------------------
 MIDDLEWARE = [
+    'dayflow.metrics.RequestMetricsMiddleware',
+    'dayflow.compression.CompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
 
     'django.middleware.security.SecurityMiddleware',
@@ -62,6 +67,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'dayflow.replica.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -95,15 +101,68 @@ TEMPLATES = [
 WSGI_APPLICATION = 'dayflow.wsgi.application'
 
 # --------------------------------------------------
-# DATABASE (SQLite for now)
+# DATABASE
 # --------------------------------------------------
+# DATABASE_URL, DB_CONN_MAX_AGE, DB_CONN_HEALTH_CHECKS and
+# DB_CONNECT_TIMEOUT; see dayflow/database.py. Defaults to backend/db.sqlite3.
 DATABASES = {
+    'default': database_from_env(BASE_DIR / 'db.sqlite3'),
+}
+
+# Applied to every new SQLite connection. WAL lets readers run alongside
+# the writer, busy_timeout makes concurrent writers wait for the lock
+# instead of failing, synchronous=NORMAL is durable under WAL at a
+# fraction of the fsyncs, cache_size is in KiB when negative.
+# IMMEDIATE transactions take the write lock at BEGIN so they wait on
+# busy_timeout rather than failing on a lock upgrade.
+SQLITE_TUNING = os.getenv("SQLITE_TUNING", "True") == "True"
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'busy_timeout': int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    'synchronous': 'NORMAL',
+    'cache_size': -int(os.getenv("SQLITE_CACHE_SIZE_KB", "20000")),
+    'temp_store': 'MEMORY',
+} if SQLITE_TUNING else {}
+SQLITE_TRANSACTION_MODE = "IMMEDIATE" if SQLITE_TUNING else ""
+
+# Optional read replica (DATABASE_REPLICA_URL) for list and report views;
+# see dayflow/replica.py. Tests run it against the default test database.
+REPLICA = database_from_env(variable="DATABASE_REPLICA_URL")
+if REPLICA:
+    DATABASES['replica'] = {**REPLICA, 'TEST': {'MIRROR': 'default'}}
+DATABASE_READ_ALIAS = 'replica' if REPLICA else None
+DATABASE_ROUTERS = ['dayflow.replica.ReplicaRouter']
+
+# Seconds a user reads from the primary after a write (read-your-writes)
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "15"))
+
+# --------------------------------------------------
+# CACHE
+# --------------------------------------------------
+# Local memory by default; point CACHE_BACKEND at
+# django.core.cache.backends.redis.RedisCache and CACHE_LOCATION at
+# redis://host:6379/0 to share the cache between workers.
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        'LOCATION': os.getenv("CACHE_LOCATION", "dayflow"),
     }
 }
 
+# Seconds a resolved request user / /auth/me/ payload may be served from cache
+USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", "300"))
+
+# Seconds a serialized list page may be served from cache; writes
+# invalidate it sooner (dayflow/listcache.py). 0 turns the cache off.
+LIST_CACHE_TTL = int(os.getenv("LIST_CACHE_TTL", "60"))
+# Whether all workers share the cache. Otherwise list generations (and so
+# ETags) also expire after LIST_CACHE_TTL, as a worker never sees another
+# worker's writes.
+LIST_CACHE_SHARED = CACHES['default']['BACKEND'] not in (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
 # --------------------------------------------------
 # PASSWORD VALIDATION
 # --------------------------------------------------
@@ -119,6 +178,8 @@ AUTH_PASSWORD_VALIDATORS = [
 # --------------------------------------------------
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
+# Calendar used for named date windows (?range=week etc.)
+COMPANY_TIME_ZONE = os.getenv("COMPANY_TIME_ZONE", TIME_ZONE)
 USE_I18N = True
 USE_TZ = True
 
@@ -142,13 +203,29 @@ AUTH_USER_MODEL = 'accounts.User'
 # --------------------------------------------------
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'accounts.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # orjson-backed when installed, byte-identical output; see dayflow/fastjson.py
+    'DEFAULT_RENDERER_CLASSES': (
+        'dayflow.fastjson.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'dayflow.fastjson.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    # Default page size for the keyset-paginated list endpoints
+    # (see dayflow/pagination.py); clients may override with ?page_size=
+    'PAGE_SIZE': int(os.getenv("API_PAGE_SIZE", "50")),
 }
 
+# PAGE_SIZE is set globally but pagination classes are assigned per view
+SILENCED_SYSTEM_CHECKS = ['rest_framework.W001']
+
 # --------------------------------------------------
 # SIMPLE JWT
 # --------------------------------------------------
@@ -158,6 +235,51 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# --------------------------------------------------
+# ATTENDANCE
+# --------------------------------------------------
+# Check-ins after this time of day (server time zone) count as late
+ATTENDANCE_LATE_AFTER = os.getenv("ATTENDANCE_LATE_AFTER", "09:30")
+
+# Full-day hours for employees without a SalaryStructure
+ATTENDANCE_DEFAULT_HOURS_PER_DAY = os.getenv("ATTENDANCE_DEFAULT_HOURS_PER_DAY", "8")
+
+# --------------------------------------------------
+# LEAVE
+# --------------------------------------------------
+# Days granted per leave type per calendar year
+LEAVE_ENTITLEMENTS = {
+    "CASUAL": int(os.getenv("LEAVE_CASUAL_DAYS", "12")),
+    "SICK": int(os.getenv("LEAVE_SICK_DAYS", "12")),
+    "PAID": int(os.getenv("LEAVE_PAID_DAYS", "18")),
+}
+
+# --------------------------------------------------
+# ONBOARDING
+# --------------------------------------------------
+# Processes used to hash passwords during bulk imports (0 = one per CPU)
+ONBOARDING_HASH_WORKERS = int(os.getenv("ONBOARDING_HASH_WORKERS", "0"))
+
+# --------------------------------------------------
+# PERFORMANCE METRICS
+# --------------------------------------------------
+# Per-view timings, Server-Timing headers and GET /metrics; see
+# dayflow/metrics.py. Requests slower than SLOW_REQUEST_MS are logged
+# with their SLOW_REQUEST_QUERIES slowest SQL statements.
+REQUEST_METRICS = os.getenv("REQUEST_METRICS", "True") == "True"
+SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", "500"))
+SLOW_REQUEST_QUERIES = int(os.getenv("SLOW_REQUEST_QUERIES", "5"))
+# Bearer token the Prometheus scraper must send (empty = /metrics only with DEBUG)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+# --------------------------------------------------
+# RESPONSE COMPRESSION
+# --------------------------------------------------
+# gzip, or brotli when installed, for JSON/CSV bodies of at least
+# COMPRESS_MIN_BYTES; see dayflow/compression.py
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
 # --------------------------------------------------
 # DEFAULT PRIMARY KEY
 # --------------------------------------------------
@@ -175,4 +297,11 @@ LOGGING = {
         "handlers": ["console"],
         "level": "ERROR",
     },
+    "loggers": {
+        "dayflow.performance": {
+            "handlers": ["console"],
+            "level": "WARNING",
+            "propagate": False,
+        },
+    },
 }
@@ -0,0 +1,42 @@
+from django.db.models.signals import post_delete, post_save
+
+from accounts.models import User
+from attendance.models import Attendance
+from employees.models import EmployeeProfile
+from leave.models import Leave
+from payroll.models import PayrollRun, Payslip, SalaryStructure
+
+from .listcache import bump, table_of
+
+
+# Tables behind the cached list pages (see dayflow/listcache.py)
+CACHED_MODELS = (User, EmployeeProfile, Attendance, Leave, SalaryStructure, PayrollRun, Payslip)
+
+# Tables a delete can change. Attendance and leaves are only deleted with
+# their user, payslips with their run (a user with payslips cannot be
+# deleted: Payslip.employee is PROTECT). A post_delete receiver on them
+# would make Django load and signal every cascaded row instead of issuing
+# one DELETE, so their parents bump them instead.
+DELETED_TABLES = {
+    User: (User, EmployeeProfile, Attendance, Leave, SalaryStructure),
+    EmployeeProfile: (EmployeeProfile,),
+    SalaryStructure: (SalaryStructure,),
+    PayrollRun: (PayrollRun, Payslip),
+}
+
+
+def bump_saved(sender, instance, update_fields=None, using=None, **kwargs):
+    # Logins save last_login only; no listed column changed
+    if update_fields is not None and set(update_fields) <= {"last_login"}:
+        return
+    bump(sender, using=using)
+
+
+def bump_deleted(sender, instance, using=None, **kwargs):
+    bump(*DELETED_TABLES[sender], using=using)
+
+
+for model in CACHED_MODELS:
+    post_save.connect(bump_saved, sender=model, dispatch_uid=f"dayflow.generation.save.{table_of(model)}")
+for model in DELETED_TABLES:
+    post_delete.connect(bump_deleted, sender=model, dispatch_uid=f"dayflow.generation.delete.{table_of(model)}")
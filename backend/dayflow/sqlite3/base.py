@@ -0,0 +1,20 @@
+"""
+SQLite backend that opens transactions with settings.SQLITE_TRANSACTION_MODE.
+
+A plain (deferred) BEGIN only takes the write lock at the first write. If
+another connection wrote in between, SQLite fails that upgrade with
+"database is locked" at once instead of waiting out busy_timeout, which
+is what happens to get_or_create/select_for_update blocks during
+check-in spikes. BEGIN IMMEDIATE takes the write lock up front so
+concurrent writers queue on busy_timeout. This is Django 5.1's
+OPTIONS["transaction_mode"] for the 4.2 line.
+"""
+
+from django.conf import settings
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def _start_transaction_under_autocommit(self):
+        mode = getattr(settings, "SQLITE_TRANSACTION_MODE", "")
+        self.cursor().execute(f"BEGIN {mode}".strip())
@@ -0,0 +1,56 @@
+"""
+Test helpers shared by the app test suites.
+"""
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountMixin:
+    """
+    Pin the number of SQL queries an endpoint runs.
+
+    Use on a TestCase that has a ``self.client`` authenticated as needed:
+
+        self.assertEndpointQueries("/api/payroll/", 1)
+        self.assertConstantQueries("/api/payroll/", lambda: make_rows(20))
+    """
+
+    def _count_get_queries(self, url):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content[:500])
+        return len(context.captured_queries), context
+
+    def assertEndpointQueries(self, url, expected):
+        """GET ``url`` and assert it runs exactly ``expected`` queries"""
+        count, context = self._count_get_queries(url)
+        self.assertEqual(
+            count,
+            expected,
+            "%s ran %d queries, expected %d:\n%s" % (
+                url,
+                count,
+                expected,
+                "\n".join(query["sql"] for query in context.captured_queries),
+            ),
+        )
+
+    def assertConstantQueries(self, url, add_rows):
+        """
+        GET ``url``, call ``add_rows()`` to grow the data set, GET again
+        and assert the query count did not change (no N+1).
+        """
+        before, _ = self._count_get_queries(url)
+        add_rows()
+        after, context = self._count_get_queries(url)
+        self.assertEqual(
+            before,
+            after,
+            "%s went from %d to %d queries as rows were added:\n%s" % (
+                url,
+                before,
+                after,
+                "\n".join(query["sql"] for query in context.captured_queries),
+            ),
+        )
@@ -21,8 +21,12 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
 )
 
+from .views import HealthView, MetricsView
+
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/health/', HealthView.as_view(), name='health'),
+    path('metrics', MetricsView.as_view(), name='metrics'),
 
     path('api/auth/', include('accounts.urls')),
     path('api/auth/login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
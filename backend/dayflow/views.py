@@ -0,0 +1,47 @@
+import hmac
+
+from django.conf import settings
+from django.db import DatabaseError, connection
+from django.http import HttpResponse
+from rest_framework import status
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .metrics import render_metrics
+
+
+class HealthView(APIView):
+    """Liveness/readiness probe for the load balancer: the database answers"""
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+        except DatabaseError:
+            return Response(
+                {"status": "unavailable", "database": connection.vendor},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
+        return Response({"status": "ok", "database": connection.vendor})
+
+
+class MetricsView(APIView):
+    """
+    Request metrics of this process in the Prometheus text format. The
+    scraper must send METRICS_TOKEN as a bearer token; without a token the
+    endpoint is only open with DEBUG on.
+    """
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        token = settings.METRICS_TOKEN
+        if not token:
+            if not settings.DEBUG:
+                return Response({"detail": "Metrics are disabled; set METRICS_TOKEN."}, status=status.HTTP_403_FORBIDDEN)
+        elif not hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}"):
+            return Response({"detail": "Invalid metrics token."}, status=status.HTTP_403_FORBIDDEN)
+        return HttpResponse(render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from employees.onboarding import import_employees, load_rows
+
+
+class Command(BaseCommand):
+    help = "Bulk-create employees (user, profile, salary) from a CSV or JSON file"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV with a header row, or a JSON list of employees")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate the file without writing anything",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], encoding="utf-8-sig") as handle:
+                rows = load_rows(handle.read(), options["path"])
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        result = import_employees(rows, dry_run=options["dry_run"])
+
+        for error in result["errors"]:
+            row = "file" if error["row"] is None else f"row {error['row'] + 1}"
+            for field, messages in error["errors"].items():
+                self.stderr.write(f"{row}: {field}: {' '.join(str(m) for m in messages)}")
+
+        if result["errors"]:
+            raise CommandError(f"{len(result['errors'])} row(s) failed validation; nothing was imported")
+
+        if options["dry_run"]:
+            self.stdout.write(self.style.SUCCESS(f"{len(rows)} row(s) are valid"))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Imported {result['created']} employee(s)"))
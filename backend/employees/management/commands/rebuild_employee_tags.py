@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from employees.models import EmployeeTag
+
+
+class Command(BaseCommand):
+    help = "Rebuild the normalized skill/certification tags from the profile text"
+
+    def handle(self, *args, **options):
+        written = EmployeeTag.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} employee tags"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from employees.models import ReportingLine
+
+
+class Command(BaseCommand):
+    help = "Rebuild the org-chart closure table from EmployeeProfile.manager"
+
+    def handle(self, *args, **options):
+        written = ReportingLine.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} reporting lines"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from employees.models import EmployeeSearchDocument
+
+
+class Command(BaseCommand):
+    help = "Rewrite every employee search document (and with it the search index)"
+
+    def handle(self, *args, **options):
+        written = EmployeeSearchDocument.refresh()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {written} search documents"))
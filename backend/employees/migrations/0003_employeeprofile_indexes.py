@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-18 17:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0002_remove_employeeprofile_address_employeeprofile_about_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employeeprofile',
+            index=models.Index(fields=['department'], name='profile_department_idx'),
+        ),
+    ]
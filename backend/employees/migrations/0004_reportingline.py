@@ -0,0 +1,46 @@
+# Generated by Django 4.2.11 on 2026-10-18 18:10
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from employees.models import closure_rows
+
+
+def backfill_reporting_lines(apps, schema_editor):
+    EmployeeProfile = apps.get_model('employees', 'EmployeeProfile')
+    ReportingLine = apps.get_model('employees', 'ReportingLine')
+
+    managers = dict(EmployeeProfile.objects.values_list('user_id', 'manager_id'))
+    ReportingLine.objects.bulk_create(
+        [
+            ReportingLine(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=depth)
+            for ancestor_id, descendant_id, depth in closure_rows(managers)
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('employees', '0003_employeeprofile_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReportingLine',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveSmallIntegerField()),
+                ('ancestor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='descendant_lines', to=settings.AUTH_USER_MODEL)),
+                ('descendant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_lines', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['ancestor', 'depth', 'descendant'], name='reporting_subtree_idx'), models.Index(fields=['descendant', 'depth', 'ancestor'], name='reporting_chain_idx')],
+                'unique_together': {('ancestor', 'descendant')},
+            },
+        ),
+        migrations.RunPython(backfill_reporting_lines, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 4.2.11 on 2026-10-18 18:13
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from employees import search
+
+
+def create_search_index(apps, schema_editor):
+    search.create_index(schema_editor)
+
+
+def drop_search_index(apps, schema_editor):
+    search.drop_index(schema_editor)
+
+
+def backfill_documents(apps, schema_editor):
+    User = apps.get_model('accounts', 'User')
+    EmployeeSearchDocument = apps.get_model('employees', 'EmployeeSearchDocument')
+
+    batch = []
+    rows = User.objects.values_list(
+        'id', 'first_name', 'last_name', 'username', 'email', 'employee_id',
+        'profile__department', 'profile__designation', 'profile__skills', 'profile__location',
+    )
+    for (user_id, first_name, last_name, username, email, employee_id,
+         department, designation, skills, location) in rows.iterator(chunk_size=2000):
+        batch.append(EmployeeSearchDocument(
+            user_id=user_id,
+            name=' '.join(filter(None, (first_name, last_name, username))),
+            email=email or '',
+            employee_id=employee_id or '',
+            department=department or '',
+            designation=designation or '',
+            skills=skills or '',
+            location=location or '',
+        ))
+    EmployeeSearchDocument.objects.bulk_create(batch, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_user_indexes'),
+        ('employees', '0004_reportingline'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeSearchDocument',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('name', models.CharField(blank=True, max_length=320)),
+                ('email', models.CharField(blank=True, max_length=254)),
+                ('employee_id', models.CharField(blank=True, max_length=20)),
+                ('department', models.CharField(blank=True, max_length=100)),
+                ('designation', models.CharField(blank=True, max_length=100)),
+                ('skills', models.TextField(blank=True)),
+                ('location', models.CharField(blank=True, max_length=100)),
+            ],
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
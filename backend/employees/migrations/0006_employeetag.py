@@ -0,0 +1,48 @@
+# Generated by Django 4.2.11 on 2026-10-18 18:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+from employees.models import split_tags
+
+
+def backfill_tags(apps, schema_editor):
+    EmployeeProfile = apps.get_model('employees', 'EmployeeProfile')
+    EmployeeTag = apps.get_model('employees', 'EmployeeTag')
+
+    rows = []
+    profiles = EmployeeProfile.objects.values_list('user_id', 'skills', 'certifications')
+    for user_id, skills, certifications in profiles.iterator(chunk_size=2000):
+        for kind, text in (('SKILL', skills), ('CERTIFICATION', certifications)):
+            rows.extend(
+                EmployeeTag(user_id=user_id, kind=kind, key=key, name=name)
+                for key, name in split_tags(text)
+            )
+    EmployeeTag.objects.bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('employees', '0005_employeesearchdocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('SKILL', 'Skill'), ('CERTIFICATION', 'Certification')], max_length=15)),
+                ('key', models.CharField(max_length=100)),
+                ('name', models.CharField(max_length=100)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tags', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'key', 'user'], name='employee_tag_lookup_idx')],
+                'unique_together': {('user', 'kind', 'key')},
+            },
+        ),
+        migrations.RunPython(backfill_tags, migrations.RunPython.noop),
+    ]
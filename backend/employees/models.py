@@ -1,7 +1,50 @@
-from django.db import models
+from django.db import models, transaction
 from accounts.models import User
 
 
+def split_tags(text):
+    """
+    Comma-separated skills/certifications as a list of (key, name) pairs:
+    key is the lower-cased, whitespace-collapsed form used for matching,
+    name the first spelling seen. Duplicates are dropped.
+    """
+    tags = {}
+    for part in (text or "").split(","):
+        name = " ".join(part.split())[:100]
+        if name:
+            tags.setdefault(name.lower(), name)
+    return list(tags.items())
+
+
+def closure_rows(managers, chains=None):
+    """
+    Yield (ancestor_id, descendant_id, depth) closure rows for a
+    {user_id: manager_id or None} map, including each user's depth-0 row.
+
+    ``chains`` seeds known chains ([user, manager, grand-manager, ...]) for
+    users outside the map; rows are only yielded for users not seeded.
+    Managers with neither are roots. A cycle is cut where it closes.
+    """
+    chains = dict(chains or {})
+    seeded = set(chains)
+
+    for user_id in managers:
+        path, seen, node = [], set(), user_id
+        while node is not None and node not in chains and node not in seen:
+            seen.add(node)
+            path.append(node)
+            node = managers.get(node)
+        tail = chains[node] if node in chains else []
+        for index in range(len(path) - 1, -1, -1):
+            chains[path[index]] = path[index:] + tail
+
+    for user_id, chain in chains.items():
+        if user_id in seeded:
+            continue
+        for depth, ancestor_id in enumerate(chain):
+            yield ancestor_id, user_id, depth
+
+
 class EmployeeProfile(models.Model):
     GENDER_CHOICES = (
         ('M', 'Male'),
@@ -52,6 +95,254 @@ class EmployeeProfile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["department"], name="profile_department_idx"),
+        ]
+
     def __str__(self):
         return self.user.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Lets save() tell whether the reporting line moved
+        instance._saved_manager_id = instance.__dict__.get("manager_id")
+        return instance
+
+    def save(self, *args, **kwargs):
+        moved = self._state.adding or self.manager_id != getattr(self, "_saved_manager_id", None)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if moved:
+                ReportingLine.move(self.user_id, self.manager_id)
+        self._saved_manager_id = self.manager_id
+
+
+class ReportingLine(models.Model):
+    """
+    Closure table of the org chart: one row for every (manager, report)
+    pair at any distance down the chain, plus a depth-0 row per person.
+    Subtrees, approval chains and headcounts are then single indexed
+    queries regardless of how deep the chart is.
+
+    Kept in step by EmployeeProfile.save() and the employees signals;
+    `manage.py rebuild_org_chart` rebuilds it from the profiles.
+    """
+    ancestor = models.ForeignKey(User, on_delete=models.CASCADE, related_name="descendant_lines")
+    descendant = models.ForeignKey(User, on_delete=models.CASCADE, related_name="ancestor_lines")
+    depth = models.PositiveSmallIntegerField()
+
+    class Meta:
+        unique_together = ("ancestor", "descendant")
+        indexes = [
+            # Subtree of a manager / headcounts
+            models.Index(fields=["ancestor", "depth", "descendant"], name="reporting_subtree_idx"),
+            # Approval chain of an employee, nearest manager first
+            models.Index(fields=["descendant", "depth", "ancestor"], name="reporting_chain_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} > {self.descendant_id} ({self.depth})"
+
+    @classmethod
+    def detach(cls, user_id):
+        """Cut the rows linking user_id's subtree to everyone above user_id"""
+        members = cls.objects.filter(ancestor_id=user_id).values("descendant_id")
+        cls.objects.filter(descendant_id__in=members).exclude(ancestor_id__in=members).delete()
+
+    @classmethod
+    def move(cls, user_id, manager_id):
+        """
+        Re-attach user_id (and everyone under them) below manager_id, or
+        make them a root when manager_id is None. Idempotent.
+        """
+        with transaction.atomic():
+            cls.objects.get_or_create(ancestor_id=user_id, descendant_id=user_id, defaults={"depth": 0})
+            subtree = list(cls.objects.filter(ancestor_id=user_id).values_list("descendant_id", "depth"))
+            if manager_id is not None and any(node == manager_id for node, _ in subtree):
+                raise ValueError("An employee cannot report to someone in their own reporting line.")
+
+            cls.detach(user_id)
+            if manager_id is None:
+                return
+
+            cls.objects.get_or_create(ancestor_id=manager_id, descendant_id=manager_id, defaults={"depth": 0})
+            above = list(cls.objects.filter(descendant_id=manager_id).values_list("ancestor_id", "depth"))
+            cls.objects.bulk_create(
+                [
+                    cls(ancestor_id=ancestor_id, descendant_id=node, depth=up + down + 1)
+                    for ancestor_id, up in above
+                    for node, down in subtree
+                ],
+                batch_size=1000,
+            )
+
+    @classmethod
+    def extend(cls, managers):
+        """
+        Add rows for newly created people ({user_id: manager_id or None})
+        in one read and one bulk insert; used by bulk imports, which skip
+        EmployeeProfile.save().
+        """
+        outside = {manager_id for manager_id in managers.values() if manager_id and manager_id not in managers}
+        chains = {}
+        for descendant_id, ancestor_id, _ in (
+            cls.objects.filter(descendant_id__in=outside)
+            .order_by("descendant_id", "depth")
+            .values_list("descendant_id", "ancestor_id", "depth")
+        ):
+            chains.setdefault(descendant_id, []).append(ancestor_id)
+
+        cls.objects.bulk_create(
+            [
+                cls(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=depth)
+                for ancestor_id, descendant_id, depth in closure_rows(managers, chains)
+            ],
+            batch_size=1000,
+            ignore_conflicts=True,
+        )
+
+    @classmethod
+    def rebuild(cls):
+        """Recompute every row from EmployeeProfile.manager; returns rows written"""
+        managers = dict(EmployeeProfile.objects.values_list("user_id", "manager_id"))
+        rows = [
+            cls(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=depth)
+            for ancestor_id, descendant_id, depth in closure_rows(managers)
+        ]
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(rows, batch_size=1000)
+        return len(rows)
+
+
+
+class EmployeeSearchDocument(models.Model):
+    """
+    Denormalized text of one employee for full-text search.
+
+    Written by refresh() from the User and EmployeeProfile signals; the
+    backend index (an FTS5 table on SQLite, a weighted tsvector column on
+    PostgreSQL) is kept in step by database triggers on this table, see
+    employees/search.py.
+    """
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name="search_document")
+    name = models.CharField(max_length=320, blank=True)
+    email = models.CharField(max_length=254, blank=True)
+    employee_id = models.CharField(max_length=20, blank=True)
+    department = models.CharField(max_length=100, blank=True)
+    designation = models.CharField(max_length=100, blank=True)
+    skills = models.TextField(blank=True)
+    location = models.CharField(max_length=100, blank=True)
+
+    # Source columns, in the order refresh() reads them
+    SOURCE_FIELDS = (
+        "id", "first_name", "last_name", "username", "email", "employee_id",
+        "profile__department", "profile__designation", "profile__skills", "profile__location",
+    )
+    TEXT_FIELDS = ("name", "email", "employee_id", "department", "designation", "skills", "location")
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def refresh(cls, user_ids=None):
+        """Rewrite the documents of user_ids (everyone when None); returns rows written"""
+        users = User.objects.all()
+        if user_ids is not None:
+            users = users.filter(pk__in=user_ids)
+
+        written = 0
+        batch = []
+        for (user_id, first_name, last_name, username, email, employee_id,
+             department, designation, skills, location) in (
+            users.order_by().values_list(*cls.SOURCE_FIELDS).iterator(chunk_size=2000)
+        ):
+            batch.append(cls(
+                user_id=user_id,
+                name=" ".join(filter(None, (first_name, last_name, username))),
+                email=email or "",
+                employee_id=employee_id or "",
+                department=department or "",
+                designation=designation or "",
+                skills=skills or "",
+                location=location or "",
+            ))
+            if len(batch) >= 1000:
+                written += cls._upsert(batch)
+                batch = []
+        if batch:
+            written += cls._upsert(batch)
+        return written
+
+    @classmethod
+    def _upsert(cls, documents):
+        cls.objects.bulk_create(
+            documents,
+            update_conflicts=True,
+            unique_fields=["user"],
+            update_fields=list(cls.TEXT_FIELDS),
+        )
+        return len(documents)
+
+
+class EmployeeTag(models.Model):
+    """
+    One skill or certification of an employee, normalized from the
+    comma-separated EmployeeProfile.skills / .certifications text so
+    staffing queries ("knows Kubernetes and Go") and frequency counts run
+    in SQL on an index. Synced from the profile text by the employees
+    signals; `manage.py rebuild_employee_tags` rebuilds everything.
+    """
+    KIND_CHOICES = (
+        ("SKILL", "Skill"),
+        ("CERTIFICATION", "Certification"),
+    )
+    # Profile text column each kind is parsed from
+    SOURCE_FIELDS = {"SKILL": "skills", "CERTIFICATION": "certifications"}
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="tags")
+    kind = models.CharField(max_length=15, choices=KIND_CHOICES)
+    key = models.CharField(max_length=100)
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        unique_together = ("user", "kind", "key")
+        indexes = [
+            # Who has tag X / frequency per tag
+            models.Index(fields=["kind", "key", "user"], name="employee_tag_lookup_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} | {self.kind}: {self.name}"
+
+    @classmethod
+    def rows_for(cls, user_id, profile_values):
+        """Unsaved tags for one user from {"skills": text, "certifications": text}"""
+        return [
+            cls(user_id=user_id, kind=kind, key=key, name=name)
+            for kind, field in cls.SOURCE_FIELDS.items()
+            for key, name in split_tags(profile_values.get(field))
+        ]
+
+    @classmethod
+    def sync(cls, profile):
+        """Replace one profile's tags with what its text fields say now"""
+        with transaction.atomic():
+            cls.objects.filter(user_id=profile.user_id).delete()
+            cls.objects.bulk_create(cls.rows_for(profile.user_id, {
+                field: getattr(profile, field) for field in cls.SOURCE_FIELDS.values()
+            }))
+
+    @classmethod
+    def rebuild(cls):
+        """Recompute every tag from the profiles; returns rows written"""
+        fields = list(cls.SOURCE_FIELDS.values())
+        rows = []
+        for user_id, *texts in EmployeeProfile.objects.values_list("user_id", *fields).iterator(chunk_size=2000):
+            rows.extend(cls.rows_for(user_id, dict(zip(fields, texts))))
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(rows, batch_size=1000)
+        return len(rows)
@@ -0,0 +1,253 @@
+"""
+Bulk employee onboarding.
+
+Takes a list of row dicts (parsed from CSV or JSON), validates the whole
+batch up front and creates the User, EmployeeProfile and SalaryStructure
+rows with bulk_create in one transaction. Uniqueness of username, email
+and employee_id is checked with one query per column against the
+database plus an in-memory pass over the batch itself; passwords are
+hashed across a process pool before the transaction opens.
+
+Used by POST /api/employees/import/ and `manage.py import_employees`.
+"""
+
+import csv
+import io
+import json
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from accounts.models import User
+from dayflow.listcache import bump
+from payroll.models import SalaryStructure
+
+from .models import EmployeeProfile, EmployeeSearchDocument, ReportingLine
+
+
+MAX_IMPORT_ROWS = 5000
+
+# Below this many passwords a pool costs more to start than it saves
+PARALLEL_HASH_THRESHOLD = 16
+
+UNIQUE_COLUMNS = ("username", "email", "employee_id")
+
+
+class OnboardingRowSerializer(serializers.Serializer):
+    """
+    One employee in an import file. Plain Serializer on purpose: the
+    uniqueness checks are done once for the whole batch, not per row.
+    """
+    # User
+    username = serializers.CharField(max_length=150)
+    email = serializers.EmailField()
+    password = serializers.CharField(required=False, allow_blank=True, write_only=True)
+    first_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    last_name = serializers.CharField(max_length=150, required=False, allow_blank=True)
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES, default="EMPLOYEE")
+    employee_id = serializers.CharField(max_length=20, required=False, allow_blank=True)
+    phone = serializers.CharField(max_length=20, required=False, allow_blank=True)
+
+    # EmployeeProfile
+    department = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    designation = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    joining_date = serializers.DateField(required=False, allow_null=True)
+    location = serializers.CharField(max_length=100, required=False, allow_blank=True)
+    manager_employee_id = serializers.CharField(max_length=20, required=False, allow_blank=True)
+
+    # SalaryStructure (only created when monthly_wage is given)
+    monthly_wage = serializers.DecimalField(max_digits=12, decimal_places=2, required=False, allow_null=True)
+
+
+PROFILE_FIELDS = ("department", "designation", "joining_date", "location")
+USER_FIELDS = ("username", "email", "first_name", "last_name", "role", "employee_id", "phone")
+
+
+def parse_csv(text):
+    """Rows of a CSV file with a header line; empty cells are dropped"""
+    return [
+        {key.strip(): value.strip() for key, value in row.items() if key and value and value.strip()}
+        for row in csv.DictReader(io.StringIO(text))
+    ]
+
+
+def load_rows(text, filename=""):
+    """Rows from an uploaded file: JSON (a list or {"employees": [...]}) or CSV"""
+    if filename.lower().endswith(".json") or text.lstrip().startswith(("[", "{")):
+        data = json.loads(text)
+        if isinstance(data, dict):
+            data = data.get("employees")
+        if not isinstance(data, list):
+            raise ValueError("Expected a list of employees.")
+        return data
+    return parse_csv(text)
+
+
+def _init_hash_worker():
+    # Spawned (non-forked) workers start without configured settings
+    import django
+    django.setup()
+
+
+def hash_passwords(passwords):
+    """make_password() for every entry, in parallel for large batches"""
+    if len(passwords) < PARALLEL_HASH_THRESHOLD:
+        return [make_password(password) for password in passwords]
+
+    workers = settings.ONBOARDING_HASH_WORKERS or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_hash_worker) as pool:
+        return list(pool.map(make_password, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+
+
+def validate_rows(rows):
+    """
+    Validate a whole batch. Returns (cleaned rows, errors) where errors is
+    a list of {"row": index, "errors": {...}}; cleaned rows are only
+    meaningful when errors is empty.
+    """
+    cleaned = []
+    errors = {}
+
+    for index, row in enumerate(rows):
+        serializer = OnboardingRowSerializer(data=row)
+        if serializer.is_valid():
+            data = dict(serializer.validated_data)
+            data["email"] = User.objects.normalize_email(data["email"])
+            # Blank employee codes are stored as NULL so they never collide
+            data["employee_id"] = data.get("employee_id") or None
+            cleaned.append(data)
+        else:
+            cleaned.append(None)
+            errors[index] = dict(serializer.errors)
+
+    def add_error(index, column, message):
+        errors.setdefault(index, {}).setdefault(column, []).append(message)
+
+    # Set-based uniqueness: a Counter over the file, then one query per column
+    for column in UNIQUE_COLUMNS:
+        values = [data.get(column) if data else None for data in cleaned]
+        present = {value for value in values if value}
+        repeated = {value for value, count in Counter(filter(None, values)).items() if count > 1}
+        taken = set(
+            User.objects.filter(**{f"{column}__in": present}).values_list(column, flat=True)
+        ) if present else set()
+
+        for index, value in enumerate(values):
+            if value in repeated:
+                add_error(index, column, "Appears more than once in this file.")
+            elif value in taken:
+                add_error(index, column, f"A user with this {column} already exists.")
+
+    # Managers may be existing users or other rows of the same file
+    manager_codes = {data["manager_employee_id"] for data in cleaned if data and data.get("manager_employee_id")}
+    file_codes = {data["employee_id"] for data in cleaned if data and data["employee_id"]}
+    known = set(
+        User.objects.filter(employee_id__in=manager_codes - file_codes).values_list("employee_id", flat=True)
+    ) if manager_codes - file_codes else set()
+    for index, data in enumerate(cleaned):
+        code = data and data.get("manager_employee_id")
+        if code and code not in file_codes and code not in known:
+            add_error(index, "manager_employee_id", "No employee with this employee_id.")
+
+    # The same rules as EmployeeProfileSerializer.validate_manager; existing
+    # users cannot report to new ones, so cycles can only run within the file
+    reports_to = {
+        data["employee_id"]: data.get("manager_employee_id")
+        for data in cleaned
+        if data and data["employee_id"] and data.get("manager_employee_id") in file_codes
+    }
+    for index, data in enumerate(cleaned):
+        code = data and data["employee_id"]
+        if not code or code not in reports_to:
+            continue
+        if reports_to[code] == code:
+            add_error(index, "manager_employee_id", "An employee cannot be their own manager.")
+            continue
+        seen, manager = {code}, reports_to[code]
+        while manager in reports_to and manager not in seen:
+            seen.add(manager)
+            manager = reports_to[manager]
+        if manager == code:
+            add_error(index, "manager_employee_id", "An employee cannot report to someone in their own reporting line.")
+
+    return cleaned, [{"row": index, "errors": errors[index]} for index in sorted(errors)]
+
+
+def import_employees(rows, dry_run=False):
+    """
+    Validate and create a batch of employees, all or nothing.
+
+    Returns {"created": n, "errors": [...]}; nothing is written when there
+    are errors or ``dry_run`` is set.
+    """
+    if len(rows) > MAX_IMPORT_ROWS:
+        return {
+            "created": 0,
+            "errors": [{"row": None, "errors": {"detail": [f"At most {MAX_IMPORT_ROWS} rows per import."]}}],
+        }
+
+    cleaned, errors = validate_rows(rows)
+    if errors or dry_run:
+        return {"created": 0, "errors": errors}
+
+    # Hash outside the transaction; it is the slow part
+    passwords = hash_passwords([data.get("password") or None for data in cleaned])
+
+    try:
+        with transaction.atomic():
+            users = _create_rows(cleaned, passwords)
+    except IntegrityError:
+        # Another import or registration took a username/email/code meanwhile
+        return {"created": 0, "errors": validate_rows(rows)[1] or [
+            {"row": None, "errors": {"detail": ["Conflicting data was written concurrently; retry."]}}
+        ]}
+
+    return {"created": len(users), "errors": []}
+
+
+def _create_rows(cleaned, passwords):
+    """bulk_create the users, then their profiles and salaries; returns the users"""
+    users = User.objects.bulk_create(
+        [
+            User(password=password, **{field: data[field] for field in USER_FIELDS if field in data})
+            for data, password in zip(cleaned, passwords)
+        ],
+        batch_size=500,
+    )
+
+    manager_codes = {data["manager_employee_id"] for data in cleaned if data.get("manager_employee_id")}
+    managers = dict(
+        User.objects.filter(employee_id__in=manager_codes).values_list("employee_id", "id")
+    ) if manager_codes else {}
+
+    profiles = EmployeeProfile.objects.bulk_create(
+        [
+            EmployeeProfile(
+                user_id=user.pk,
+                manager_id=managers.get(data.get("manager_employee_id")),
+                **{field: data[field] for field in PROFILE_FIELDS if data.get(field) is not None},
+            )
+            for data, user in zip(cleaned, users)
+        ],
+        batch_size=500,
+    )
+    # bulk_create skips the save() hooks and signals behind the org chart, search and list cache
+    ReportingLine.extend({profile.user_id: profile.manager_id for profile in profiles})
+    EmployeeSearchDocument.refresh([user.pk for user in users])
+    bump(User, EmployeeProfile, SalaryStructure)
+
+    SalaryStructure.objects.bulk_create(
+        [
+            SalaryStructure(employee_id=user.pk, monthly_wage=data["monthly_wage"])
+            for data, user in zip(cleaned, users)
+            if data.get("monthly_wage") is not None
+        ],
+        batch_size=500,
+    )
+
+    return users
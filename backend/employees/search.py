@@ -0,0 +1,135 @@
+"""
+Full-text employee search.
+
+EmployeeSearchDocument holds the searchable text of each employee. The
+ranked index on top of it is backend specific and maintained entirely by
+database triggers on that table, so every write path (signals, bulk
+imports, upserts) keeps it current:
+
+  SQLite      an FTS5 table keyed by user id, ranked with weighted bm25()
+  PostgreSQL  a weighted tsvector column with a GIN index, ranked with
+              ts_rank()
+
+Other backends fall back to unranked icontains matching.
+"""
+
+import re
+from functools import reduce
+from operator import or_
+
+from django.db import connections, router
+from django.db.models import Q
+
+from .models import EmployeeSearchDocument
+
+
+TABLE = EmployeeSearchDocument._meta.db_table
+FTS_TABLE = "employees_search_fts"
+COLUMNS = EmployeeSearchDocument.TEXT_FIELDS
+
+# bm25() weight per column of the FTS table, in COLUMNS order
+SQLITE_WEIGHTS = (10.0, 4.0, 8.0, 3.0, 5.0, 2.0, 2.0)
+
+SQLITE_CREATE = [
+    f"CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5("
+    f"{', '.join(COLUMNS)}, tokenize = 'unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER {FTS_TABLE}_insert AFTER INSERT ON {TABLE} BEGIN "
+    f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(COLUMNS)}) "
+    f"VALUES (new.user_id, {', '.join('new.' + c for c in COLUMNS)}); END",
+    f"CREATE TRIGGER {FTS_TABLE}_update AFTER UPDATE ON {TABLE} BEGIN "
+    f"DELETE FROM {FTS_TABLE} WHERE rowid = old.user_id; "
+    f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(COLUMNS)}) "
+    f"VALUES (new.user_id, {', '.join('new.' + c for c in COLUMNS)}); END",
+    f"CREATE TRIGGER {FTS_TABLE}_delete AFTER DELETE ON {TABLE} BEGIN "
+    f"DELETE FROM {FTS_TABLE} WHERE rowid = old.user_id; END",
+]
+
+SQLITE_DROP = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_insert",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_update",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_delete",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+POSTGRES_CREATE = [
+    f"ALTER TABLE {TABLE} ADD COLUMN search_vector tsvector",
+    f"""
+    CREATE FUNCTION {TABLE}_vector() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.name, '') || ' ' || coalesce(NEW.employee_id, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(NEW.designation, '') || ' ' || coalesce(NEW.email, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(NEW.department, '')), 'C') ||
+            setweight(to_tsvector('simple', coalesce(NEW.skills, '') || ' ' || coalesce(NEW.location, '')), 'D');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    f"CREATE TRIGGER {TABLE}_vector BEFORE INSERT OR UPDATE ON {TABLE} "
+    f"FOR EACH ROW EXECUTE FUNCTION {TABLE}_vector()",
+    f"CREATE INDEX {TABLE}_vector_idx ON {TABLE} USING GIN (search_vector)",
+]
+
+POSTGRES_DROP = [
+    f"DROP TRIGGER IF EXISTS {TABLE}_vector ON {TABLE}",
+    f"DROP FUNCTION IF EXISTS {TABLE}_vector()",
+    f"ALTER TABLE {TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+STATEMENTS = {
+    "sqlite": (SQLITE_CREATE, SQLITE_DROP),
+    "postgresql": (POSTGRES_CREATE, POSTGRES_DROP),
+}
+
+
+def create_index(schema_editor):
+    for sql in STATEMENTS.get(schema_editor.connection.vendor, ([], []))[0]:
+        schema_editor.execute(sql)
+
+
+def drop_index(schema_editor):
+    for sql in STATEMENTS.get(schema_editor.connection.vendor, ([], []))[1]:
+        schema_editor.execute(sql)
+
+
+def search_terms(query):
+    """Word tokens of a user query; punctuation and operators are dropped"""
+    return re.findall(r"\w+", query.lower())[:10]
+
+
+def search_user_ids(query, limit, offset=0):
+    """
+    Ids of employees matching every term of ``query`` (as prefixes), best
+    match first. Returns at most ``limit`` ids starting at ``offset``.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    # Raw SQL bypasses the router; ask it which connection reads may use
+    connection = connections[router.db_for_read(EmployeeSearchDocument)]
+    vendor = connection.vendor
+    if vendor == "sqlite":
+        weights = ", ".join(str(weight) for weight in SQLITE_WEIGHTS)
+        sql = (
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s "
+            f"ORDER BY bm25({FTS_TABLE}, {weights}), rowid LIMIT %s OFFSET %s"
+        )
+        params = [" ".join(f'"{term}"*' for term in terms), limit, offset]
+    elif vendor == "postgresql":
+        sql = (
+            f"SELECT user_id FROM {TABLE}, to_tsquery('simple', %s) query "
+            f"WHERE search_vector @@ query "
+            f"ORDER BY ts_rank(search_vector, query) DESC, user_id LIMIT %s OFFSET %s"
+        )
+        params = [" & ".join(f"{term}:*" for term in terms), limit, offset]
+    else:
+        condition = Q()
+        for term in terms:
+            condition &= reduce(or_, (Q(**{f"{column}__icontains": term}) for column in COLUMNS))
+        documents = EmployeeSearchDocument.objects.filter(condition).order_by("pk")
+        return list(documents.values_list("pk", flat=True)[offset:offset + limit])
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
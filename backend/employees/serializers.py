@@ -1,6 +1,13 @@
 from rest_framework import serializers
-from .models import EmployeeProfile
+from .models import EmployeeProfile, ReportingLine
 from accounts.models import User
+from dayflow.serializers import SparseFieldsMixin
+
+
+def manager_name(profile):
+    if profile.manager:
+        return f"{profile.manager.first_name} {profile.manager.last_name}".strip() or profile.manager.username
+    return None
 
 
 class UserBasicSerializer(serializers.ModelSerializer):
@@ -21,31 +28,55 @@ class EmployeeProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ["user", "created_at", "updated_at"]
     
     def get_skills_list(self, obj):
-        if obj.skills:
-            return [s.strip() for s in obj.skills.split(',') if s.strip()]
-        return []
+        # The normalized EmployeeTag rows, in profile order; lists prefetch user tags
+        tags = sorted(obj.user.tags.all(), key=lambda tag: tag.pk)
+        return [tag.name for tag in tags if tag.kind == "SKILL"]
     
     def get_manager_name(self, obj):
-        if obj.manager:
-            return f"{obj.manager.first_name} {obj.manager.last_name}".strip() or obj.manager.username
-        return None
+        return manager_name(obj)
 
+    def validate_manager(self, value):
+        user_id = self.instance.user_id if self.instance is not None else None
+        if value is not None and user_id is not None and ReportingLine.objects.filter(
+            ancestor_id=user_id, descendant=value
+        ).exists():
+            raise serializers.ValidationError("An employee cannot report to someone in their own reporting line.")
+        if value is not None and value.pk == user_id:
+            raise serializers.ValidationError("An employee cannot be their own manager.")
+        return value
 
-class EmployeeListSerializer(serializers.ModelSerializer):
-    """Serializer for employee list view"""
-    profile = EmployeeProfileSerializer(read_only=True)
+
+class EmployeeProfileSummarySerializer(serializers.ModelSerializer):
+    """Compact profile for directory listings (no private or bank details)"""
+    manager_name = serializers.SerializerMethodField()
+
+    class Meta:
+        model = EmployeeProfile
+        fields = ['id', 'department', 'designation', 'location', 'joining_date', 'manager', 'manager_name']
+        read_only_fields = fields
+
+    def get_manager_name(self, obj):
+        return manager_name(obj)
+
+
+class EmployeeListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Serializer for employee list view (?fields=, ?expand=profile)"""
+    profile = EmployeeProfileSummarySerializer(read_only=True)
     full_name = serializers.SerializerMethodField()
     
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'first_name', 'last_name', 'role', 'employee_id', 'profile', 'full_name']
+        expandable_fields = {
+            'profile': (EmployeeProfileSerializer, {'read_only': True}),
+        }
     
     def get_full_name(self, obj):
         return f"{obj.first_name} {obj.last_name}".strip() or obj.username
 
 
-class EmployeeDetailSerializer(serializers.ModelSerializer):
-    """Detailed serializer for single employee view"""
+class EmployeeDetailSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """Detailed serializer for single employee view (?fields=)"""
     profile = EmployeeProfileSerializer(read_only=True)
     full_name = serializers.SerializerMethodField()
     
@@ -56,3 +87,36 @@ class EmployeeDetailSerializer(serializers.ModelSerializer):
     def get_full_name(self, obj):
         return f"{obj.first_name} {obj.last_name}".strip() or obj.username
 
+
+
+class OrgChartNodeSerializer(serializers.ModelSerializer):
+    """A person in a subtree or approval chain, with their distance from the anchor"""
+    full_name = serializers.SerializerMethodField()
+    department = serializers.CharField(source='profile.department', default=None, read_only=True)
+    designation = serializers.CharField(source='profile.designation', default=None, read_only=True)
+    manager = serializers.IntegerField(source='profile.manager_id', default=None, read_only=True)
+    depth = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'employee_id', 'full_name', 'department', 'designation', 'manager', 'depth']
+
+    def get_full_name(self, obj):
+        return f"{obj.first_name} {obj.last_name}".strip() or obj.username
+
+
+class ManagerHeadcountSerializer(serializers.Serializer):
+    manager = serializers.IntegerField(source='ancestor_id')
+    username = serializers.CharField(source='ancestor__username')
+    full_name = serializers.SerializerMethodField()
+    direct_reports = serializers.IntegerField()
+    total_reports = serializers.IntegerField()
+
+    def get_full_name(self, row):
+        return f"{row['ancestor__first_name']} {row['ancestor__last_name']}".strip() or row['ancestor__username']
+
+
+class TagFrequencySerializer(serializers.Serializer):
+    key = serializers.CharField()
+    name = serializers.CharField()
+    employees = serializers.IntegerField()
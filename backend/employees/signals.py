@@ -0,0 +1,47 @@
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from accounts.models import User
+
+from .models import EmployeeProfile, EmployeeSearchDocument, EmployeeTag, ReportingLine
+
+
+# Columns copied into EmployeeSearchDocument
+SEARCHED_USER_FIELDS = {"first_name", "last_name", "username", "email", "employee_id"}
+SEARCHED_PROFILE_FIELDS = {"department", "designation", "skills", "location"}
+
+
+@receiver(pre_delete, sender=User)
+def detach_direct_reports(sender, instance, **kwargs):
+    # manager is SET_NULL with a plain UPDATE, which skips EmployeeProfile.save()
+    for user_id in EmployeeProfile.objects.filter(manager=instance).values_list("user_id", flat=True):
+        ReportingLine.move(user_id, None)
+
+
+@receiver(post_delete, sender=EmployeeProfile)
+def detach_deleted_profile(sender, instance, **kwargs):
+    # The user keeps their own reports but no longer has a manager. detach()
+    # only deletes, so it is also safe while the user itself is being deleted.
+    ReportingLine.detach(instance.user_id)
+
+
+@receiver(post_save, sender=User)
+def refresh_user_search_document(sender, instance, update_fields=None, **kwargs):
+    # Logins save last_login only; nothing searchable changed
+    if update_fields is not None and not SEARCHED_USER_FIELDS & set(update_fields):
+        return
+    EmployeeSearchDocument.refresh([instance.pk])
+
+
+@receiver(post_save, sender=EmployeeProfile)
+def refresh_profile_search_document(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCHED_PROFILE_FIELDS & set(update_fields):
+        return
+    EmployeeSearchDocument.refresh([instance.user_id])
+
+
+@receiver(post_save, sender=EmployeeProfile)
+def sync_profile_tags(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(EmployeeTag.SOURCE_FIELDS.values()) & set(update_fields):
+        return
+    EmployeeTag.sync(instance)
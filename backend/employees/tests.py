@@ -1,3 +1,296 @@
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from accounts.models import User
+from dayflow.testing import QueryCountMixin
+from payroll.models import SalaryStructure
+from .models import EmployeeProfile, EmployeeTag, ReportingLine
+
+
+class EmployeeListQueryTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="ADMIN")
+        self.manager = User.objects.create_user("boss", "boss@example.com", "pw", first_name="Big", last_name="Boss")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.add_employees(3)
+
+    def add_employees(self, count):
+        start = User.objects.count()
+        for i in range(start, start + count):
+            user = User.objects.create_user(f"emp{i}", f"emp{i}@example.com", "pw", first_name=f"E{i}")
+            EmployeeProfile.objects.create(user=user, department="Engineering", manager=self.manager)
+
+    def test_list_query_count_is_pinned(self):
+        self.assertEndpointQueries("/api/employees/", 1)
+
+    def test_list_query_count_does_not_grow_with_rows(self):
+        self.assertConstantQueries("/api/employees/", lambda: self.add_employees(10))
+
+    def test_list_includes_manager_name(self):
+        response = self.client.get("/api/employees/")
+        names = {row["profile"]["manager_name"] for row in response.data["results"] if row["profile"]}
+        self.assertEqual(names, {"Big Boss"})
+
+    def test_sparse_fields(self):
+        rows = self.client.get("/api/employees/?fields=id,full_name").data["results"]
+        self.assertEqual({tuple(sorted(row)) for row in rows}, {("full_name", "id")})
+
+        # Unknown names are ignored
+        rows = self.client.get("/api/employees/?fields=id,salary").data["results"]
+        self.assertEqual({tuple(row) for row in rows}, {("id",)})
+
+    def test_expand_profile(self):
+        rows = self.client.get("/api/employees/?expand=nothing").data["results"]
+        compact = next(row["profile"] for row in rows if row["profile"])
+        self.assertNotIn("about", compact)
+
+        rows = self.client.get("/api/employees/?fields=id,profile&expand=profile").data["results"]
+        profile = next(row["profile"] for row in rows if row["profile"])
+        self.assertEqual(set(rows[0]), {"id", "profile"})
+        self.assertIn("about", profile)
+        self.assertEqual(profile["skills_list"], [])
+        self.assertConstantQueries("/api/employees/?expand=profile", lambda: self.add_employees(5))
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class EmployeeImportTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="ADMIN", employee_id="A1")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def post(self, rows, query=""):
+        return self.client.post(f"/api/employees/import/{query}", {"employees": rows}, format="json")
+
+    def test_import_creates_user_profile_and_salary(self):
+        rows = [
+            {"username": f"new{i}", "email": f"new{i}@example.com", "password": "s3cret-pass",
+             "employee_id": f"N{i}", "department": "Ops", "manager_employee_id": "A1",
+             "monthly_wage": "40000"}
+            for i in range(20)
+        ]
+        response = self.post(rows)
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["created"], 20)
+
+        user = User.objects.get(username="new7")
+        self.assertTrue(user.check_password("s3cret-pass"))
+        self.assertEqual(user.profile.manager, self.admin)
+        self.assertEqual(SalaryStructure.objects.filter(employee__username__startswith="new").count(), 20)
+
+    def test_duplicates_reject_whole_file(self):
+        rows = [
+            {"username": "dup", "email": "one@example.com"},
+            {"username": "dup", "email": "two@example.com"},
+            {"username": "three", "email": "admin@example.com", "manager_employee_id": "ZZ"},
+        ]
+        response = self.post(rows)
+        self.assertEqual(response.status_code, 400)
+        errors = {error["row"]: set(error["errors"]) for error in response.data["errors"]}
+        self.assertEqual(errors, {0: {"username"}, 1: {"username"}, 2: {"email", "manager_employee_id"}})
+        self.assertFalse(User.objects.filter(username__in=["dup", "three"]).exists())
+
+    def test_self_managers_and_cycles_reject_whole_file(self):
+        managers = {"B1": "B2", "B2": "B1", "B3": "B3", "B4": "B1", "B5": "A1"}
+        rows = [
+            {"username": code.lower(), "email": f"{code.lower()}@example.com",
+             "employee_id": code, "manager_employee_id": manager}
+            for code, manager in managers.items()
+        ]
+        response = self.post(rows)
+        self.assertEqual(response.status_code, 400)
+        errors = {error["row"]: error["errors"] for error in response.data["errors"]}
+        self.assertEqual(set(errors), {0, 1, 2})
+        self.assertEqual(errors[2]["manager_employee_id"], ["An employee cannot be their own manager."])
+        self.assertIn("reporting line", errors[0]["manager_employee_id"][0])
+        self.assertFalse(User.objects.filter(employee_id__startswith="B").exists())
+
+    def test_csv_upload_and_dry_run(self):
+        upload = SimpleUploadedFile(
+            "staff.csv",
+            b"username,email,department,monthly_wage\ncsv1,csv1@example.com,Sales,\n",
+            content_type="text/csv",
+        )
+        response = self.client.post("/api/employees/import/?dry_run=1", {"file": upload})
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertFalse(User.objects.filter(username="csv1").exists())
+
+        upload.seek(0)
+        response = self.client.post("/api/employees/import/", {"file": upload})
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(EmployeeProfile.objects.get(user__username="csv1").department, "Sales")
+        self.assertFalse(SalaryStructure.objects.filter(employee__username="csv1").exists())
+
+
+class OrgChartTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="ADMIN")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+        # ceo <- director <- lead <- dev, plus a second director
+        self.people = {}
+        for name, manager in [("ceo", None), ("director", "ceo"), ("lead", "director"),
+                              ("dev", "lead"), ("director2", "ceo")]:
+            user = User.objects.create_user(name, f"{name}@example.com", "pw", first_name=name)
+            EmployeeProfile.objects.create(user=user, manager=self.people.get(manager))
+            self.people[name] = user
+
+    def ids(self, url):
+        response = self.client.get(url)
+        rows = response.data["results"] if isinstance(response.data, dict) else response.data
+        return [row["username"] for row in rows]
+
+    def test_subtree_and_chain(self):
+        ceo, dev = self.people["ceo"], self.people["dev"]
+        self.assertEqual(self.ids(f"/api/employees/{ceo.pk}/reports/"), ["dev", "director", "director2", "lead"])
+        self.assertEqual(self.ids(f"/api/employees/{ceo.pk}/reports/?depth=1"), ["director", "director2"])
+        self.assertEqual(self.ids(f"/api/employees/{dev.pk}/chain/"), ["lead", "director", "ceo"])
+        self.assertEqual(
+            [row["depth"] for row in self.client.get(f"/api/employees/{dev.pk}/chain/").data], [1, 2, 3]
+        )
+
+    def test_queries_do_not_grow_with_depth(self):
+        self.assertEndpointQueries(f"/api/employees/{self.people['dev'].pk}/chain/", 1)
+        self.assertEndpointQueries("/api/employees/headcount/", 1)
+
+    def test_moving_a_manager_moves_their_subtree(self):
+        lead = self.people["lead"].profile
+        lead.manager = self.people["director2"]
+        lead.save()
+
+        self.assertEqual(self.ids(f"/api/employees/{self.people['dev'].pk}/chain/"), ["lead", "director2", "ceo"])
+        self.assertEqual(self.ids(f"/api/employees/{self.people['director'].pk}/reports/"), [])
+
+        rows = set(ReportingLine.objects.values_list("ancestor_id", "descendant_id", "depth"))
+        ReportingLine.rebuild()
+        self.assertEqual(rows, set(ReportingLine.objects.values_list("ancestor_id", "descendant_id", "depth")))
+
+    def test_cycles_are_rejected(self):
+        director, dev = self.people["director"], self.people["dev"]
+        response = self.client.put(f"/api/employees/user/{director.pk}/profile/", {"manager": dev.pk}, format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("manager", response.data)
+
+    def test_headcount(self):
+        rows = {row["username"]: (row["direct_reports"], row["total_reports"])
+                for row in self.client.get("/api/employees/headcount/").data}
+        self.assertEqual(rows, {"ceo": (2, 4), "director": (1, 2), "lead": (1, 1)})
+
+        response = self.client.get(f"/api/employees/headcount/?manager_id={self.people['director'].pk}")
+        self.assertEqual([row["username"] for row in response.data], ["director"])
+        self.assertEqual(self.client.get("/api/employees/headcount/?manager_id=x").status_code, 400)
+
+    def test_deleting_a_manager_detaches_reports(self):
+        self.people["director"].delete()
+        self.assertEqual(self.ids(f"/api/employees/{self.people['dev'].pk}/chain/"), ["lead"])
+
+
+class EmployeeSearchTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="ADMIN")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+        people = [
+            ("asha", "Asha", "Rao", "Engineering", "Backend Engineer", "python, django", "Pune"),
+            ("ravi", "Ravi", "Python", "Sales", "Account Manager", "negotiation", "Mumbai"),
+            ("meera", "Meera", "Iyer", "Engineering", "Data Engineer", "python, spark", "Pune"),
+        ]
+        for username, first, last, department, designation, skills, location in people:
+            user = User.objects.create_user(username, f"{username}@example.com", "pw",
+                                            first_name=first, last_name=last)
+            EmployeeProfile.objects.create(user=user, department=department, designation=designation,
+                                           skills=skills, location=location)
+
+    def search(self, query):
+        return [row["username"] for row in self.client.get(f"/api/employees/search/?q={query}").data["results"]]
+
+    def test_all_terms_must_match_as_prefixes(self):
+        self.assertEqual(set(self.search("engin pune")), {"asha", "meera"})
+        self.assertEqual(self.search("spark"), ["meera"])
+        self.assertEqual(self.search("nobody"), [])
+
+    def test_name_matches_rank_above_skills(self):
+        self.assertEqual(self.search("python")[0], "ravi")
+
+    def test_index_follows_profile_edits(self):
+        profile = User.objects.get(username="ravi").profile
+        profile.location = "Nagpur"
+        profile.save()
+        self.assertEqual(self.search("nagpur"), ["ravi"])
+        self.assertEqual(self.search("mumbai"), [])
+
+    def test_pages_and_query_count(self):
+        first = self.client.get("/api/employees/search/?q=engineer&page_size=1").data
+        self.assertEqual(len(first["results"]), 1)
+        second = self.client.get(first["next"]).data
+        self.assertEqual(len(second["results"]), 1)
+        self.assertNotEqual(first["results"][0]["id"], second["results"][0]["id"])
+        self.assertIsNone(second["next"])
+        self.assertEndpointQueries("/api/employees/search/?q=engineer", 2)
+        # + the users' skill tags, prefetched for skills_list
+        self.assertEndpointQueries("/api/employees/search/?q=engineer&expand=profile", 3)
+
+    def test_empty_query_is_rejected(self):
+        self.assertEqual(self.client.get("/api/employees/search/?q=%20").status_code, 400)
+
+
+class EmployeeTagTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="ADMIN")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+        for username, skills, certifications in [
+            ("asha", "Go, Kubernetes, python", "CKA"),
+            ("ravi", "go ,  Rust", ""),
+            ("meera", "Python, kubernetes, Go, go", "CKA, AWS SA"),
+        ]:
+            user = User.objects.create_user(username, f"{username}@example.com", "pw")
+            EmployeeProfile.objects.create(user=user, skills=skills, certifications=certifications)
+
+    def usernames(self, query):
+        response = self.client.get(f"/api/employees/skills/{query}")
+        self.assertEqual(response.status_code, 200, response.data)
+        return sorted(row["username"] for row in response.data["results"])
+
+    def test_and_or_filters(self):
+        self.assertEqual(self.usernames("?all=kubernetes,GO"), ["asha", "meera"])
+        self.assertEqual(self.usernames("?any=rust,python"), ["asha", "meera", "ravi"])
+        self.assertEqual(self.usernames("?all=go&any=rust"), ["ravi"])
+        self.assertEqual(self.usernames("?kind=certification&all=aws sa"), ["meera"])
+
+    def test_frequency_counts(self):
+        rows = self.client.get("/api/employees/skills/frequency/").data
+        self.assertEqual([(row["key"], row["employees"]) for row in rows][:2], [("go", 3), ("kubernetes", 2)])
+        self.assertEndpointQueries("/api/employees/skills/frequency/", 1)
+
+        self.assertEqual(len(self.client.get("/api/employees/skills/frequency/?limit=1").data), 1)
+        for limit in ("0", "-5", "many"):
+            response = self.client.get(f"/api/employees/skills/frequency/?limit={limit}")
+            self.assertEqual(response.status_code, 400, limit)
+
+    def test_tags_follow_profile_edits(self):
+        profile = User.objects.get(username="ravi").profile
+        profile.skills = "Kubernetes"
+        profile.save()
+        self.assertEqual(self.usernames("?all=kubernetes"), ["asha", "meera", "ravi"])
+        self.assertEqual(self.usernames("?any=rust"), [])
+
+    def test_skills_list_is_deduplicated(self):
+        profile = User.objects.get(username="meera").profile
+        response = self.client.get(f"/api/employees/profile/{profile.pk}/")
+        self.assertEqual(response.data["skills_list"], ["Python", "kubernetes", "Go"])
+
+    def test_skills_list_reads_the_tag_rows(self):
+        meera = User.objects.get(username="meera")
+        EmployeeTag.objects.filter(user=meera, key="kubernetes").delete()
+
+        response = self.client.get(f"/api/employees/profile/{meera.profile.pk}/")
+        self.assertEqual(response.data["skills_list"], ["Python", "Go"])
+        rows = self.client.get("/api/employees/?expand=profile").data["results"]
+        skills = {row["username"]: row["profile"]["skills_list"] for row in rows if row["profile"]}
+        self.assertEqual(skills, {"asha": ["Go", "Kubernetes", "python"], "ravi": ["go", "Rust"], "meera": ["Python", "Go"]})
@@ -3,12 +3,26 @@ from .views import (
     EmployeeListView,
     EmployeeDetailView,
     EmployeeProfileDetailView,
-    EmployeeProfileByUserView
+    EmployeeProfileByUserView,
+    EmployeeImportView,
+    EmployeeSearchView,
+    EmployeeSkillSearchView,
+    TagFrequencyView,
+    OrgChartReportsView,
+    OrgChartChainView,
+    OrgChartHeadcountView,
 )
 
 urlpatterns = [
     path('', EmployeeListView.as_view()),
+    path('import/', EmployeeImportView.as_view()),
+    path('search/', EmployeeSearchView.as_view()),
+    path('skills/', EmployeeSkillSearchView.as_view()),
+    path('skills/frequency/', TagFrequencyView.as_view()),
+    path('headcount/', OrgChartHeadcountView.as_view()),
     path('<int:pk>/', EmployeeDetailView.as_view()),
+    path('<int:user_id>/reports/', OrgChartReportsView.as_view()),
+    path('<int:user_id>/chain/', OrgChartChainView.as_view()),
     path('profile/<int:pk>/', EmployeeProfileDetailView.as_view()),
     path('user/<int:user_id>/profile/', EmployeeProfileByUserView.as_view()),
 ]
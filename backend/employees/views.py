@@ -2,17 +2,36 @@ from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from .models import EmployeeProfile
-from .serializers import EmployeeProfileSerializer, EmployeeListSerializer, EmployeeDetailSerializer
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from django.db.models import Count, F, Min, Q
+from .models import EmployeeProfile, EmployeeTag, ReportingLine, split_tags
+from .onboarding import import_employees, load_rows
+from .search import search_terms, search_user_ids
+from .serializers import (
+    EmployeeProfileSerializer,
+    EmployeeListSerializer,
+    EmployeeDetailSerializer,
+    OrgChartNodeSerializer,
+    ManagerHeadcountSerializer,
+    TagFrequencySerializer,
+)
 from accounts.permissions import IsAdmin, IsAdminOrSelf
 from accounts.models import User
+from dayflow.conditional import ConditionalListMixin
+from dayflow.pagination import EmployeePagination
+from dayflow.params import integer_param
+from dayflow.serializers import requested_expansions
 
 
-class EmployeeListView(generics.ListAPIView):
-    """List all employees (Admin/HR only)"""
-    queryset = User.objects.all().select_related('profile')
+class EmployeeListView(ConditionalListMixin, generics.ListAPIView):
+    """List all employees (Admin/HR only); conditional GET via ETag"""
+    queryset = User.objects.all().select_related('profile', 'profile__manager')
     serializer_class = EmployeeListSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
+    read_replica = True
+    pagination_class = EmployeePagination
+    cache_models = (User, EmployeeProfile)
     
     def get_queryset(self):
         queryset = super().get_queryset()
@@ -25,12 +44,149 @@ class EmployeeListView(generics.ListAPIView):
         if department:
             queryset = queryset.filter(profile__department__icontains=department)
         
-        return queryset.order_by('first_name', 'last_name')
+        # The compact listing never reads the long free-text profile columns
+        if 'profile' in requested_expansions(self.request):
+            queryset = queryset.prefetch_related('tags')
+        else:
+            queryset = queryset.defer(
+                'profile__mailing_address', 'profile__permanent_address',
+                'profile__about', 'profile__skills', 'profile__certifications', 'profile__interests',
+            )
+        
+        return queryset.order_by('first_name', 'last_name', 'id')
+
+
+def tag_kind(request):
+    """?kind=skill|certification (default skill) as an EmployeeTag kind"""
+    kind = request.query_params.get('kind', 'skill').upper()
+    if kind not in EmployeeTag.SOURCE_FIELDS:
+        raise ValidationError({"kind": "Expected 'skill' or 'certification'."})
+    return kind
+
+
+class EmployeeSkillSearchView(EmployeeListView):
+    """
+    Employees by skill or certification (Admin/HR only).
+
+    ?all=go,kubernetes    must have every listed tag
+    ?any=go,rust          must have at least one listed tag
+    ?kind=certification   match certifications instead of skills
+    The directory's role/department filters and ?fields=/?expand= apply.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        tags = EmployeeTag.objects.filter(kind=tag_kind(self.request))
+        required = [key for key, _ in split_tags(self.request.query_params.get('all'))]
+        optional = [key for key, _ in split_tags(self.request.query_params.get('any'))]
+
+        if not required and not optional:
+            raise ValidationError({"detail": "Pass ?all= and/or ?any= with comma-separated tags."})
+
+        if required:
+            # Users holding every required tag: one GROUP BY ... HAVING subquery
+            holders = (
+                tags.filter(key__in=required)
+                .values('user_id')
+                .annotate(matched=Count('id'))
+                .filter(matched=len(required))
+                .values('user_id')
+            )
+            queryset = queryset.filter(pk__in=holders)
+        if optional:
+            queryset = queryset.filter(pk__in=tags.filter(key__in=optional).values('user_id'))
+
+        return queryset
+
+
+class TagFrequencyView(generics.ListAPIView):
+    """
+    How many employees hold each skill (or ?kind=certification), most
+    common first (Admin/HR only). Optional ?department= and ?limit= (default 50).
+    """
+    serializer_class = TagFrequencySerializer
+    permission_classes = [IsAuthenticated, IsAdmin]
+    read_replica = True
+    pagination_class = None
+
+    def get_queryset(self):
+        queryset = EmployeeTag.objects.filter(kind=tag_kind(self.request))
+
+        department = self.request.query_params.get('department')
+        if department:
+            queryset = queryset.filter(user__profile__department=department)
+
+        try:
+            limit = min(int(self.request.query_params.get('limit', 50)), 500)
+        except ValueError:
+            raise ValidationError({"limit": "Expected a number."})
+        if limit < 1:
+            raise ValidationError({"limit": "Expected a positive number."})
+
+        return (
+            queryset.values('key')
+            .annotate(employees=Count('user_id'), name=Min('name'))
+            .order_by('-employees', 'key')[:limit]
+        )
+
+
+class EmployeeSearchView(APIView):
+    """
+    Ranked full-text search over names, email, employee ID, department,
+    designation, skills and location (Admin/HR only).
+
+    ?q=       words to match; every word must match, as a prefix
+    ?page=    1-based page number, ?page_size= up to 500
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+    read_replica = True
+
+    def get(self, request):
+        query = request.query_params.get('q', '')
+        if not search_terms(query):
+            raise ValidationError({"q": "Enter at least one word to search for."})
+
+        paginator = EmployeePagination()
+        page_size = paginator.get_page_size(request)
+        try:
+            page = max(int(request.query_params.get('page', 1)), 1)
+        except ValueError:
+            raise ValidationError({"page": "Expected a page number."})
+
+        # One extra id tells whether there is a next page
+        ids = search_user_ids(query, limit=page_size + 1, offset=(page - 1) * page_size)
+        has_next = len(ids) > page_size
+        ids = ids[:page_size]
+
+        users = User.objects.filter(pk__in=ids).select_related('profile', 'profile__manager')
+        # ?expand=profile reads them all; deferring would load each one per row
+        if 'profile' in requested_expansions(request):
+            users = users.prefetch_related('tags')
+        else:
+            users = users.defer(
+                'profile__mailing_address', 'profile__permanent_address',
+                'profile__about', 'profile__certifications', 'profile__interests',
+            )
+        position = {user_id: rank for rank, user_id in enumerate(ids)}
+        ranked = sorted(users, key=lambda user: position[user.pk])
+
+        url = request.build_absolute_uri()
+        previous = None
+        if page > 2:
+            previous = replace_query_param(url, 'page', page - 1)
+        elif page == 2:
+            previous = remove_query_param(url, 'page')
+
+        return Response({
+            "next": replace_query_param(url, 'page', page + 1) if has_next else None,
+            "previous": previous,
+            "results": EmployeeListSerializer(ranked, many=True, context={'request': request}).data,
+        })
 
 
 class EmployeeDetailView(generics.RetrieveAPIView):
     """Get single employee details (Admin/HR or self)"""
-    queryset = User.objects.all().select_related('profile')
+    queryset = User.objects.all().select_related('profile', 'profile__manager').prefetch_related('tags')
     serializer_class = EmployeeDetailSerializer
     permission_classes = [IsAuthenticated]
     
@@ -46,7 +202,7 @@ class EmployeeDetailView(generics.RetrieveAPIView):
 
 class EmployeeProfileDetailView(generics.RetrieveUpdateAPIView):
     """Get/Update employee profile"""
-    queryset = EmployeeProfile.objects.all()
+    queryset = EmployeeProfile.objects.select_related('user', 'manager')
     serializer_class = EmployeeProfileSerializer
     permission_classes = [IsAuthenticated, IsAdminOrSelf]
 
@@ -65,7 +221,7 @@ class EmployeeProfileByUserView(APIView):
             )
         
         try:
-            profile = EmployeeProfile.objects.get(user_id=user_id)
+            profile = EmployeeProfile.objects.select_related('user', 'manager').get(user_id=user_id)
             serializer = EmployeeProfileSerializer(profile)
             return Response(serializer.data)
         except EmployeeProfile.DoesNotExist:
@@ -117,3 +273,134 @@ class EmployeeProfileByUserView(APIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+
+
+class EmployeeImportView(APIView):
+    """
+    Bulk onboarding (Admin/HR only).
+
+    Body: a CSV or JSON file upload in "file", or JSON {"employees": [...]}.
+    Add ?dry_run=1 to validate without writing. The import is all or
+    nothing: any row error returns 400 with per-row errors.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def post(self, request):
+        upload = request.FILES.get('file')
+        try:
+            if upload is not None:
+                rows = load_rows(upload.read().decode('utf-8-sig'), upload.name)
+            else:
+                rows = request.data
+                if hasattr(rows, 'get'):
+                    rows = rows.get('employees')
+                if not isinstance(rows, list):
+                    raise ValueError("Expected a non-empty 'employees' list or a 'file' upload.")
+        except (ValueError, UnicodeDecodeError) as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not rows:
+            return Response(
+                {"detail": "The import contains no rows."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        dry_run = request.query_params.get('dry_run') in ('1', 'true')
+        result = import_employees(rows, dry_run=dry_run)
+
+        if result['errors']:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
+        if dry_run:
+            return Response({"valid": len(rows), **result})
+        return Response(result, status=status.HTTP_201_CREATED)
+
+
+# Everything OrgChartNodeSerializer reads
+ORG_CHART_COLUMNS = (
+    'id', 'username', 'employee_id', 'first_name', 'last_name',
+    'profile__department', 'profile__designation', 'profile__manager_id',
+)
+
+
+def check_org_chart_access(request, user_id):
+    user = request.user
+    if user.role not in ['ADMIN', 'HR'] and user_id != user.id:
+        raise PermissionDenied("You can only view your own reporting line")
+
+
+class OrgChartReportsView(generics.ListAPIView):
+    """
+    Everyone under an employee (Admin/HR, or the employee themselves).
+    Optional ?depth=N limits how many levels down to go (1 = direct reports).
+    """
+    serializer_class = OrgChartNodeSerializer
+    permission_classes = [IsAuthenticated]
+    read_replica = True
+    pagination_class = EmployeePagination
+
+    def get_queryset(self):
+        user_id = self.kwargs['user_id']
+        check_org_chart_access(self.request, user_id)
+
+        lines = Q(ancestor_lines__ancestor_id=user_id, ancestor_lines__depth__gte=1)
+        depth = self.request.query_params.get('depth')
+        if depth:
+            try:
+                lines &= Q(ancestor_lines__depth__lte=int(depth))
+            except ValueError:
+                raise ValidationError({"depth": "Expected a number of levels."})
+
+        return (
+            User.objects.filter(lines)
+            .annotate(depth=F('ancestor_lines__depth'))
+            .select_related('profile')
+            .only(*ORG_CHART_COLUMNS)
+            .order_by('first_name', 'last_name', 'id')
+        )
+
+
+class OrgChartChainView(generics.ListAPIView):
+    """Approval chain of an employee, nearest manager first (Admin/HR or self)"""
+    serializer_class = OrgChartNodeSerializer
+    permission_classes = [IsAuthenticated]
+    read_replica = True
+    pagination_class = None
+
+    def get_queryset(self):
+        user_id = self.kwargs['user_id']
+        check_org_chart_access(self.request, user_id)
+
+        return (
+            User.objects.filter(descendant_lines__descendant_id=user_id, descendant_lines__depth__gte=1)
+            .annotate(depth=F('descendant_lines__depth'))
+            .select_related('profile')
+            .only(*ORG_CHART_COLUMNS)
+            .order_by('depth')
+        )
+
+
+class OrgChartHeadcountView(generics.ListAPIView):
+    """
+    Direct and total reports per manager, largest teams first (Admin/HR only).
+    Optional ?manager_id= to ask about one manager.
+    """
+    serializer_class = ManagerHeadcountSerializer
+    permission_classes = [IsAuthenticated, IsAdmin]
+    read_replica = True
+    pagination_class = None
+
+    def get_queryset(self):
+        queryset = ReportingLine.objects.filter(depth__gte=1)
+
+        manager_id = integer_param(self.request, 'manager_id')
+        if manager_id is not None:
+            queryset = queryset.filter(ancestor_id=manager_id)
+
+        return (
+            queryset.values('ancestor_id', 'ancestor__username', 'ancestor__first_name', 'ancestor__last_name')
+            .annotate(
+                total_reports=Count('id'),
+                direct_reports=Count('id', filter=Q(depth=1)),
+            )
+            .order_by('-total_reports', 'ancestor_id')
+        )
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from leave.models import LeaveBalance
+
+
+class Command(BaseCommand):
+    help = "Rebuild the leave balance ledger from Leave history"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--year", type=int, help="Only rebuild this calendar year")
+
+    def handle(self, *args, **options):
+        written = LeaveBalance.reconcile(year=options["year"])
+        scope = f" for {options['year']}" if options["year"] else ""
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {written} balance rows{scope}"))
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.11 on 2026-10-18 17:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave', '0002_alter_leave_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leave',
+            index=models.Index(fields=['user', 'status', '-id'], name='leave_user_status_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leave',
+            index=models.Index(fields=['user', '-id'], name='leave_user_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leave',
+            index=models.Index(condition=models.Q(('status', 'PENDING')), fields=['-id'], name='leave_pending_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.11 on 2026-10-18 18:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave', '0004_leavebalance'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leave',
+            index=models.Index(fields=['user', 'start_date', 'end_date'], name='leave_user_interval_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leave',
+            index=models.Index(condition=models.Q(('status', 'APPROVED')), fields=['start_date', 'end_date'], name='leave_approved_interval_idx'),
+        ),
+    ]
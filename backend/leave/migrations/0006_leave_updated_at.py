@@ -0,0 +1,20 @@
+# Generated by Django 4.2.11 on 2026-10-18 19:12
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave', '0005_leave_interval_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='leave',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
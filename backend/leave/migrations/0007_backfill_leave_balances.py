@@ -0,0 +1,20 @@
+from django.db import migrations
+
+from leave.models import rebuild_balances
+
+
+def backfill_balances(apps, schema_editor):
+    # Leaves pending or approved before the ledger existed; without their
+    # days, deciding them would drive pending_days below zero
+    rebuild_balances(apps.get_model("leave", "Leave"), apps.get_model("leave", "LeaveBalance"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave', '0006_leave_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_balances, migrations.RunPython.noop),
+    ]
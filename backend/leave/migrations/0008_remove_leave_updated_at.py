@@ -0,0 +1,15 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leave', '0007_backfill_leave_balances'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='leave',
+            name='updated_at',
+        ),
+    ]
@@ -1,5 +1,66 @@
-from django.db import models
+from datetime import date
+
+from django.db import models, transaction
+from django.db.models import F, Q
 from django.conf import settings
+from django.utils import timezone
+
+
+def days_by_year(start_date, end_date):
+    """Inclusive day count of start_date..end_date, split per calendar year"""
+    result = {}
+    for year in range(start_date.year, end_date.year + 1):
+        start = max(start_date, date(year, 1, 1))
+        end = min(end_date, date(year, 12, 31))
+        result[year] = (end - start).days + 1
+    return result
+
+
+def rebuild_balances(leave_model, balance_model, year=None):
+    """
+    Body of LeaveBalance.reconcile(), taking the models so the ledger
+    migration can run it on their historical versions
+    """
+    totals = {}
+    leaves = leave_model.objects.filter(status__in=["PENDING", "APPROVED"])
+    if year is not None:
+        leaves = leaves.filter(start_date__lte=date(year, 12, 31), end_date__gte=date(year, 1, 1))
+
+    for leave in leaves.only("user_id", "leave_type", "start_date", "end_date", "status").iterator(chunk_size=2000):
+        column = "used_days" if leave.status == "APPROVED" else "pending_days"
+        for leave_year, days in days_by_year(leave.start_date, leave.end_date).items():
+            if year is not None and leave_year != year:
+                continue
+            key = (leave.user_id, leave.leave_type, leave_year)
+            entry = totals.setdefault(key, {"used_days": 0, "pending_days": 0})
+            entry[column] += days
+
+    with transaction.atomic():
+        existing = balance_model.objects.all()
+        if year is not None:
+            existing = existing.filter(year=year)
+        # Keep any entitlement HR adjusted by hand
+        entitlements = {
+            (row.user_id, row.leave_type, row.year): row.entitled_days
+            for row in existing.only("user_id", "leave_type", "year", "entitled_days")
+        }
+        keys = set(entitlements) | set(totals)
+        rows = [
+            balance_model(
+                user_id=user_id,
+                leave_type=leave_type,
+                year=leave_year,
+                entitled_days=entitlements.get(
+                    (user_id, leave_type, leave_year), settings.LEAVE_ENTITLEMENTS.get(leave_type, 0)
+                ),
+                **totals.get((user_id, leave_type, leave_year), {"used_days": 0, "pending_days": 0}),
+            )
+            for user_id, leave_type, leave_year in keys
+        ]
+        existing.delete()
+        balance_model.objects.bulk_create(rows, batch_size=1000)
+
+    return len(rows)
 
 
 class Leave(models.Model):
@@ -29,5 +90,278 @@ class Leave(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Employee's own list: filter by user (and status), newest first
+            models.Index(fields=["user", "status", "-id"], name="leave_user_status_id_idx"),
+            models.Index(fields=["user", "-id"], name="leave_user_id_idx"),
+            # HR approval queue only ever looks at pending rows
+            models.Index(
+                fields=["-id"],
+                name="leave_pending_idx",
+                condition=Q(status="PENDING"),
+            ),
+            # Interval lookups: a user's leaves overlapping a date range
+            models.Index(fields=["user", "start_date", "end_date"], name="leave_user_interval_idx"),
+            # "Who is out" lookups only consider approved leaves
+            models.Index(
+                fields=["start_date", "end_date"],
+                name="leave_approved_interval_idx",
+                condition=Q(status="APPROVED"),
+            ),
+        ]
+
     def __str__(self):
         return f"{self.user.username} | {self.leave_type} | {self.status}"
+
+    @classmethod
+    def overlapping(cls, start_date, end_date):
+        """Leaves whose [start_date, end_date] intersects the given range"""
+        return cls.objects.filter(start_date__lte=end_date, end_date__gte=start_date)
+
+    def find_conflict(self):
+        """
+        Describe why this leave clashes with the user's other pending or
+        approved leaves or with days they already attended, or None.
+        """
+        from attendance.models import Attendance
+
+        clash = (
+            Leave.overlapping(self.start_date, self.end_date)
+            .filter(user_id=self.user_id, status__in=["PENDING", "APPROVED"])
+            .exclude(pk=self.pk)
+            .order_by("start_date")
+            .first()
+        )
+        if clash:
+            return (
+                f"Overlaps your {clash.get_status_display().lower()} leave "
+                f"from {clash.start_date} to {clash.end_date}."
+            )
+
+        attended = (
+            Attendance.objects.filter(
+                user_id=self.user_id,
+                date__gte=self.start_date,
+                date__lte=self.end_date,
+            )
+            .exclude(status="ABSENT")
+            .values_list("date", flat=True)
+            .first()
+        )
+        if attended:
+            return f"Attendance is already recorded on {attended}."
+        return None
+
+    @classmethod
+    def find_conflicts(cls, leaves):
+        """
+        find_conflict() for a batch of leaves in two queries.
+        Returns {leave id: reason} for the leaves that clash.
+        """
+        from attendance.models import Attendance
+
+        leaves = list(leaves)
+        if not leaves:
+            return {}
+
+        user_ids = {leave.user_id for leave in leaves}
+        start_date = min(leave.start_date for leave in leaves)
+        end_date = max(leave.end_date for leave in leaves)
+
+        others = {}
+        for other in (
+            cls.overlapping(start_date, end_date)
+            .filter(user_id__in=user_ids, status__in=["PENDING", "APPROVED"])
+            .only("user_id", "start_date", "end_date", "status")
+            .order_by("start_date")
+        ):
+            others.setdefault(other.user_id, []).append(other)
+
+        attended = {}
+        for user_id, day in (
+            Attendance.objects.filter(user_id__in=user_ids, date__gte=start_date, date__lte=end_date)
+            .exclude(status="ABSENT")
+            .order_by("date")
+            .values_list("user_id", "date")
+        ):
+            attended.setdefault(user_id, []).append(day)
+
+        conflicts = {}
+        for leave in leaves:
+            clash = next(
+                (
+                    other for other in others.get(leave.user_id, [])
+                    if other.pk != leave.pk
+                    and other.start_date <= leave.end_date
+                    and other.end_date >= leave.start_date
+                ),
+                None,
+            )
+            if clash:
+                conflicts[leave.pk] = (
+                    f"Overlaps a {clash.get_status_display().lower()} leave "
+                    f"from {clash.start_date} to {clash.end_date}."
+                )
+                continue
+
+            day = next(
+                (day for day in attended.get(leave.user_id, []) if leave.start_date <= day <= leave.end_date),
+                None,
+            )
+            if day:
+                conflicts[leave.pk] = f"Attendance is already recorded on {day}."
+        return conflicts
+
+    @property
+    def days(self):
+        return (self.end_date - self.start_date).days + 1
+
+    def days_by_year(self):
+        """Inclusive day count of the leave, split per calendar year"""
+        return days_by_year(self.start_date, self.end_date)
+
+
+class LeaveBalance(models.Model):
+    """
+    Per-user, per-type, per-year leave ledger.
+
+    Kept in step with Leave by apply_transition() whenever a leave is
+    applied for, approved or rejected, so balance reads and apply-time
+    checks are a single-row lookup. `manage.py reconcile_leave_balances`
+    rebuilds it from Leave history.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="leave_balances",
+    )
+    leave_type = models.CharField(max_length=20, choices=Leave.LEAVE_TYPE_CHOICES)
+    year = models.PositiveIntegerField()
+    entitled_days = models.PositiveIntegerField(default=0)
+    used_days = models.PositiveIntegerField(default=0)
+    pending_days = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Ledger column that holds a leave's days in each status
+    STATUS_COLUMNS = {"PENDING": "pending_days", "APPROVED": "used_days", "REJECTED": None}
+
+    class Meta:
+        unique_together = ("user", "leave_type", "year")
+
+    @property
+    def available_days(self):
+        return self.entitled_days - self.used_days - self.pending_days
+
+    @staticmethod
+    def default_entitlement(leave_type):
+        return settings.LEAVE_ENTITLEMENTS.get(leave_type, 0)
+
+    @classmethod
+    def for_update(cls, user_id, leave_type, year):
+        """Fetch (creating if needed) and lock one ledger row"""
+        cls.objects.get_or_create(
+            user_id=user_id,
+            leave_type=leave_type,
+            year=year,
+            defaults={"entitled_days": cls.default_entitlement(leave_type)},
+        )
+        return cls.objects.select_for_update().get(
+            user_id=user_id, leave_type=leave_type, year=year
+        )
+
+    @classmethod
+    def apply_transition(cls, leave, old_status, new_status):
+        """
+        Move a leave's days between the pending and used columns.
+        Call inside the transaction that changes the leave's status;
+        old_status is None for a newly applied leave.
+        """
+        old, new = cls.STATUS_COLUMNS.get(old_status), cls.STATUS_COLUMNS.get(new_status)
+        if old == new:
+            return
+
+        with transaction.atomic():
+            for year, days in leave.days_by_year().items():
+                row = cls.for_update(leave.user_id, leave.leave_type, year)
+                changes = {}
+                if old:
+                    changes[old] = F(old) - days
+                if new:
+                    changes[new] = F(new) + days
+                cls.objects.filter(pk=row.pk).update(**changes)
+
+    @classmethod
+    def apply_bulk_transition(cls, leaves, old_status, new_status):
+        """
+        apply_transition() for many leaves sharing the same status change:
+        one insert for missing ledger rows, one locked read and one
+        bulk_update, however many leaves are passed.
+
+        A leave whose days the ledger does not hold in the old column
+        (e.g. rows that predate the ledger and were never reconciled) is
+        left out rather than driving the column below zero; returns the
+        ids of those leaves.
+        """
+        old, new = cls.STATUS_COLUMNS.get(old_status), cls.STATUS_COLUMNS.get(new_status)
+        if old == new:
+            return []
+
+        shares = {leave.pk: leave.days_by_year() for leave in leaves}
+        keys = {
+            (leave.user_id, leave.leave_type, year)
+            for leave in leaves for year in shares[leave.pk]
+        }
+        if not keys:
+            return []
+
+        with transaction.atomic():
+            cls.objects.bulk_create(
+                [
+                    cls(
+                        user_id=user_id,
+                        leave_type=leave_type,
+                        year=year,
+                        entitled_days=cls.default_entitlement(leave_type),
+                    )
+                    for user_id, leave_type, year in keys
+                ],
+                ignore_conflicts=True,
+            )
+            rows = {
+                (row.user_id, row.leave_type, row.year): row
+                for row in cls.objects.select_for_update().filter(
+                    user_id__in={key[0] for key in keys},
+                    year__in={key[2] for key in keys},
+                )
+                if (row.user_id, row.leave_type, row.year) in keys
+            }
+
+            now = timezone.now()
+            refused, changed = [], {}
+            for leave in leaves:
+                share = [
+                    (rows[(leave.user_id, leave.leave_type, year)], days)
+                    for year, days in shares[leave.pk].items()
+                ]
+                if old and any(getattr(row, old) < days for row, days in share):
+                    refused.append(leave.pk)
+                    continue
+                for row, days in share:
+                    if old:
+                        setattr(row, old, getattr(row, old) - days)
+                    if new:
+                        setattr(row, new, getattr(row, new) + days)
+                    row.updated_at = now
+                    changed[row.pk] = row
+
+            cls.objects.bulk_update(changed.values(), [c for c in (old, new) if c] + ["updated_at"])
+        return refused
+
+    @classmethod
+    def reconcile(cls, year=None):
+        """Rebuild used/pending days from Leave history; returns rows written"""
+        return rebuild_balances(Leave, cls, year)
+
+    def __str__(self):
+        return f"{self.user_id} | {self.leave_type} {self.year}: {self.available_days} left"
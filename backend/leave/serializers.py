@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import Leave
+from .models import Leave, LeaveBalance
 
 
 class LeaveSerializer(serializers.ModelSerializer):
@@ -7,3 +7,31 @@ class LeaveSerializer(serializers.ModelSerializer):
         model = Leave
         fields = "__all__"
         read_only_fields = ["user", "status", "created_at"]
+
+    def validate(self, attrs):
+        start_date = attrs.get("start_date", getattr(self.instance, "start_date", None))
+        end_date = attrs.get("end_date", getattr(self.instance, "end_date", None))
+        if start_date and end_date and end_date < start_date:
+            raise serializers.ValidationError({"end_date": "End date cannot be before start date."})
+        return attrs
+
+
+class LeaveBalanceSerializer(serializers.ModelSerializer):
+    available_days = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = LeaveBalance
+        fields = ["leave_type", "year", "entitled_days", "used_days", "pending_days", "available_days"]
+
+
+class OutOfOfficeSerializer(serializers.ModelSerializer):
+    employee_name = serializers.SerializerMethodField()
+    employee_id = serializers.CharField(source="user.employee_id", read_only=True)
+    department = serializers.CharField(source="user.profile.department", read_only=True, default="")
+
+    class Meta:
+        model = Leave
+        fields = ["id", "user", "employee_name", "employee_id", "department", "leave_type", "start_date", "end_date"]
+
+    def get_employee_name(self, obj):
+        return f"{obj.user.first_name} {obj.user.last_name}".strip() or obj.user.username
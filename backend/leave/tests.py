@@ -1,3 +1,206 @@
+from datetime import date
+from importlib import import_module
+
+from django.apps import apps
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from attendance.models import Attendance
+from .models import Leave, LeaveBalance
+
+
+class LeaveBalanceLedgerTests(TestCase):
+    def setUp(self):
+        self.employee = User.objects.create_user("emp", "emp@example.com", "pw")
+        self.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="ADMIN")
+        self.client = APIClient()
+
+    def apply(self, start, end, leave_type="CASUAL"):
+        self.client.force_authenticate(self.employee)
+        return self.client.post("/api/leave/", {
+            "leave_type": leave_type, "start_date": start, "end_date": end, "reason": "Trip",
+        }, format="json")
+
+    def balance(self, year, leave_type="CASUAL"):
+        return LeaveBalance.objects.get(user=self.employee, leave_type=leave_type, year=year)
+
+    def test_apply_approve_and_reject_move_days(self):
+        self.assertEqual(self.apply("2025-03-03", "2025-03-05").status_code, 201)
+        self.assertEqual(self.balance(2025).pending_days, 3)
+
+        leave = Leave.objects.get()
+        self.client.force_authenticate(self.admin)
+        self.client.patch(f"/api/leave/{leave.pk}/approve/", {"status": "APPROVED"}, format="json")
+        self.assertEqual((self.balance(2025).pending_days, self.balance(2025).used_days), (0, 3))
+
+        self.client.patch(f"/api/leave/{leave.pk}/approve/", {"status": "REJECTED"}, format="json")
+        self.assertEqual((self.balance(2025).pending_days, self.balance(2025).used_days), (0, 0))
+
+    def test_apply_beyond_balance_is_rejected(self):
+        response = self.apply("2025-01-01", "2025-01-31")
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Leave.objects.exists())
+
+    def test_leave_spanning_new_year_is_split(self):
+        self.apply("2025-12-30", "2026-01-02")
+        self.assertEqual(self.balance(2025).pending_days, 2)
+        self.assertEqual(self.balance(2026).pending_days, 2)
+
+    def test_reconcile_rebuilds_from_history(self):
+        self.apply("2025-03-03", "2025-03-04")
+        LeaveBalance.objects.update(pending_days=0)
+        LeaveBalance.reconcile(year=2025)
+        self.assertEqual(self.balance(2025).pending_days, 2)
+
+    def test_balances_by_user_id(self):
+        self.apply("2025-03-03", "2025-03-04")
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(f"/api/leave/balance/?year=2025&user_id={self.employee.pk}")
+        self.assertEqual(response.status_code, 200)
+        casual = next(row for row in response.data if row["leave_type"] == "CASUAL")
+        self.assertEqual(casual["pending_days"], 2)
+
+        self.assertEqual(self.client.get("/api/leave/balance/?user_id=abc").status_code, 400)
+
+    def test_year_must_be_a_calendar_year(self):
+        self.client.force_authenticate(self.employee)
+        for year in ("0", "-3", "10000", "next"):
+            self.assertEqual(self.client.get(f"/api/leave/balance/?year={year}").status_code, 400, year)
+        self.assertFalse(LeaveBalance.objects.exists())
+
+    def test_migration_backfills_leaves_from_before_the_ledger(self):
+        # Rows from before the ledger existed: no balance for their days
+        pending = Leave.objects.create(user=self.employee, leave_type="CASUAL", start_date=date(2025, 3, 3),
+                                       end_date=date(2025, 3, 5), reason="Trip")
+        Leave.objects.create(user=self.employee, leave_type="SICK", start_date=date(2025, 12, 31),
+                             end_date=date(2026, 1, 1), reason="Flu", status="APPROVED")
+        import_module("leave.migrations.0007_backfill_leave_balances").backfill_balances(apps, None)
+        self.assertEqual((self.balance(2025).pending_days, self.balance(2025).used_days), (3, 0))
+        self.assertEqual(self.balance(2026, "SICK").used_days, 1)
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.patch(f"/api/leave/{pending.pk}/approve/", {"status": "APPROVED"}, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((self.balance(2025).pending_days, self.balance(2025).used_days), (0, 3))
+
+
+class LeaveOverlapTests(TestCase):
+    def setUp(self):
+        self.employee = User.objects.create_user("emp", "emp@example.com", "pw")
+        self.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="ADMIN")
+        self.client = APIClient()
+        self.client.force_authenticate(self.employee)
+
+    def apply(self, start, end):
+        return self.client.post("/api/leave/", {
+            "leave_type": "SICK", "start_date": start, "end_date": end, "reason": "Flu",
+        }, format="json")
+
+    def test_overlapping_application_is_rejected(self):
+        self.assertEqual(self.apply("2025-03-03", "2025-03-05").status_code, 201)
+        self.assertEqual(self.apply("2025-03-05", "2025-03-06").status_code, 400)
+        self.assertEqual(self.apply("2025-03-06", "2025-03-07").status_code, 201)
+
+    def test_rejected_leave_does_not_block(self):
+        self.apply("2025-03-03", "2025-03-05")
+        Leave.objects.update(status="REJECTED")
+        self.assertEqual(self.apply("2025-03-04", "2025-03-04").status_code, 201)
+
+    def test_who_is_out(self):
+        self.apply("2025-03-03", "2025-03-05")
+        Leave.objects.update(status="APPROVED")
+        self.client.force_authenticate(self.admin)
+        out = self.client.get("/api/leave/out/?start=2025-03-05&end=2025-03-10").data["results"]
+        self.assertEqual([row["user"] for row in out], [self.employee.pk])
+        self.assertEqual(self.client.get("/api/leave/out/?start=2025-03-06").data["results"], [])
+
+
+class LeaveBulkDecisionTests(TestCase):
+    def setUp(self):
+        self.employees = [
+            User.objects.create_user(f"emp{i}", f"emp{i}@example.com", "pw") for i in range(3)
+        ]
+        self.hr = User.objects.create_user("hr", "hr@example.com", "pw", role="HR")
+        self.client = APIClient()
+        for employee in self.employees:
+            self.client.force_authenticate(employee)
+            self.client.post("/api/leave/", {
+                "leave_type": "CASUAL", "start_date": "2025-04-07", "end_date": "2025-04-08",
+                "reason": "Trip",
+            }, format="json")
+        self.leaves = list(Leave.objects.order_by("id").values_list("id", flat=True))
+        self.client.force_authenticate(self.hr)
+
+    def decide(self, ids, new_status):
+        return self.client.post("/api/leave/bulk-decision/", {"ids": ids, "status": new_status}, format="json")
+
+    def test_bulk_approve_reports_per_id_outcomes(self):
+        first, second, third = self.leaves
+        Leave.objects.filter(pk=third).update(status="REJECTED")
+
+        response = self.decide([first, second, third, 9999], "APPROVED")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual(
+            [row["outcome"] for row in response.data["results"]],
+            ["updated", "updated", "not_pending", "not_found"],
+        )
+
+        balance = LeaveBalance.objects.get(user=self.employees[0], leave_type="CASUAL", year=2025)
+        self.assertEqual((balance.pending_days, balance.used_days), (0, 2))
+        self.assertEqual(Leave.objects.filter(status="APPROVED").count(), 2)
+
+    def test_bulk_reject_frees_pending_days(self):
+        self.assertEqual(self.decide(self.leaves, "REJECTED").data["updated"], 3)
+        self.assertFalse(LeaveBalance.objects.exclude(pending_days=0).exists())
+
+    def test_leave_missing_from_the_ledger_is_reported_not_failed(self):
+        # As for a leave applied before the ledger existed
+        LeaveBalance.objects.filter(user=self.employees[1]).update(pending_days=0)
+        response = self.decide(self.leaves, "APPROVED")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], 2)
+        self.assertEqual([row["outcome"] for row in response.data["results"]], ["updated", "error", "updated"])
+        self.assertEqual(Leave.objects.get(pk=self.leaves[1]).status, "PENDING")
+        balance = LeaveBalance.objects.get(user=self.employees[1], leave_type="CASUAL", year=2025)
+        self.assertEqual((balance.pending_days, balance.used_days), (0, 0))
+
+        # Once reconciled it can be decided
+        LeaveBalance.reconcile(year=2025)
+        self.assertEqual(self.decide([self.leaves[1]], "REJECTED").data["updated"], 1)
+
+    def test_conflicting_leave_is_skipped(self):
+        Attendance.objects.create(user=self.employees[1], date=date(2025, 4, 8), status="PRESENT")
+        results = self.decide(self.leaves, "APPROVED").data["results"]
+        self.assertEqual([row["outcome"] for row in results], ["updated", "conflict", "updated"])
+        self.assertEqual(Leave.objects.get(pk=self.leaves[1]).status, "PENDING")
+
+    def test_employees_cannot_bulk_decide(self):
+        self.client.force_authenticate(self.employees[0])
+        self.assertEqual(self.decide(self.leaves, "APPROVED").status_code, 403)
+
+
+class OutOfOfficeTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="ADMIN")
+        self.employee = User.objects.create_user("emp", "emp@example.com", "pw")
+        self.client = APIClient()
+        self.client.force_authenticate(self.employee)
+        self.client.post("/api/leave/", {
+            "leave_type": "CASUAL", "start_date": "2025-03-03", "end_date": "2025-03-05", "reason": "Trip",
+        }, format="json")
+        self.client.force_authenticate(self.admin)
+        self.client.patch(f"/api/leave/{Leave.objects.get().pk}/approve/", {"status": "APPROVED"}, format="json")
+
+    def out(self, query):
+        return self.client.get(f"/api/leave/out/{query}")
+
+    def test_leaves_overlapping_the_window(self):
+        self.assertEqual(len(self.out("?start=2025-03-05").data["results"]), 1)
+        self.assertEqual(len(self.out("?start=2025-03-01&end=2025-03-03").data["results"]), 1)
+        self.assertEqual(len(self.out("?start=2025-03-06&end=2025-03-31").data["results"]), 0)
 
-# Create your tests here.
+    def test_malformed_dates_are_rejected(self):
+        for query in ("?start=2026-02-30", "?start=March", "?start=2025-03-05&end=2025-03-01"):
+            self.assertEqual(self.out(query).status_code, 400, query)
@@ -1,7 +1,11 @@
 from django.urls import path
-from .views import LeaveListCreateView, LeaveApproveRejectView
+from .views import LeaveListCreateView, LeaveApproveRejectView, LeaveBulkDecisionView, LeaveBalanceView, OutOfOfficeView, LeaveExportView
 
 urlpatterns = [
     path("", LeaveListCreateView.as_view()),
+    path("balance/", LeaveBalanceView.as_view()),
+    path("out/", OutOfOfficeView.as_view()),
+    path("bulk-decision/", LeaveBulkDecisionView.as_view()),
+    path("export/", LeaveExportView.as_view()),
     path("<int:pk>/approve/", LeaveApproveRejectView.as_view()),
 ]
@@ -1,13 +1,30 @@
-from rest_framework.generics import ListCreateAPIView, UpdateAPIView
+from datetime import MAXYEAR, MINYEAR
+
+from rest_framework.generics import ListAPIView, ListCreateAPIView, UpdateAPIView
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+
+from django.db import transaction
+from django.utils.timezone import localdate
+
+from accounts.permissions import IsAdmin
+from dayflow.conditional import ConditionalListMixin
+from dayflow.export import EXPORT_CHUNK_SIZE, CSVExportView, parse_date_range
+from dayflow.listcache import bump
+from dayflow.pagination import LeavePagination, OutOfOfficePagination
+from dayflow.params import integer_param
 
-from .models import Leave
-from .serializers import LeaveSerializer
+from .models import Leave, LeaveBalance
+from .serializers import LeaveSerializer, LeaveBalanceSerializer, OutOfOfficeSerializer
 
 
-class LeaveListCreateView(ListCreateAPIView):
+MAX_DECISIONS_PER_REQUEST = 1000
+
+
+class LeaveListCreateView(ConditionalListMixin, ListCreateAPIView):
     """
     EMPLOYEE:
       - GET → list own leaves
@@ -15,9 +32,14 @@ class LeaveListCreateView(ListCreateAPIView):
 
     ADMIN / HR:
       - GET → list all leaves
+
+    GET answers 304 while no leave has changed (ETag).
     """
     serializer_class = LeaveSerializer
     permission_classes = [IsAuthenticated]
+    read_replica = True
+    pagination_class = LeavePagination
+    cache_models = (Leave,)
 
     def get_queryset(self):
         user = self.request.user
@@ -28,7 +50,25 @@ class LeaveListCreateView(ListCreateAPIView):
         return Leave.objects.filter(user=user).order_by("-id")
 
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user, status="PENDING")
+        user = self.request.user
+        requested = Leave(user=user, **serializer.validated_data)
+
+        with transaction.atomic():
+            conflict = requested.find_conflict()
+            if conflict:
+                raise ValidationError({"detail": conflict})
+
+            # One locked ledger row per calendar year the leave touches
+            for year, days in requested.days_by_year().items():
+                balance = LeaveBalance.for_update(user.pk, requested.leave_type, year)
+                if days > balance.available_days:
+                    raise ValidationError({
+                        "detail": f"Insufficient {requested.get_leave_type_display().lower()} balance "
+                                  f"for {year}: {balance.available_days} day(s) available, {days} requested."
+                    })
+
+            leave = serializer.save(user=user, status="PENDING")
+            LeaveBalance.apply_transition(leave, None, "PENDING")
 
 
 class LeaveApproveRejectView(UpdateAPIView):
@@ -49,7 +89,6 @@ class LeaveApproveRejectView(UpdateAPIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        leave = self.get_object()
         new_status = request.data.get("status")
 
         if new_status not in ["APPROVED", "REJECTED"]:
@@ -58,7 +97,238 @@ class LeaveApproveRejectView(UpdateAPIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        leave.status = new_status
-        leave.save()
+        with transaction.atomic():
+            leave = Leave.objects.select_for_update().get(pk=self.get_object().pk)
+            old_status = leave.status
+
+            if new_status == "APPROVED":
+                conflict = leave.find_conflict()
+                if conflict:
+                    return Response(
+                        {"detail": conflict},
+                        status=status.HTTP_400_BAD_REQUEST,
+                    )
+
+            leave.status = new_status
+            leave.save(update_fields=["status"])
+            LeaveBalance.apply_transition(leave, old_status, new_status)
 
         return Response(LeaveSerializer(leave).data)
+
+
+class LeaveBulkDecisionView(APIView):
+    """
+    ADMIN / HR:
+      - POST → approve or reject many pending leaves at once
+
+    Body: {"ids": [1, 2, ...], "status": "APPROVED" | "REJECTED"}
+
+    Runs in one transaction: the leaves are locked in one read, moved with
+    a single UPDATE ... WHERE status = 'PENDING' and the balance ledger is
+    adjusted in bulk. Every id gets an outcome: "updated", "not_found",
+    "not_pending", (approvals only) "conflict", or "error" when the balance
+    ledger does not hold the leave's pending days.
+    """
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+    def post(self, request):
+        new_status = request.data.get("status")
+        ids = request.data.get("ids")
+
+        if new_status not in ["APPROVED", "REJECTED"]:
+            return Response(
+                {"detail": "Invalid status value."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if not isinstance(ids, list) or not ids or not all(
+            isinstance(pk, int) and not isinstance(pk, bool) for pk in ids
+        ):
+            return Response(
+                {"detail": "Expected a non-empty 'ids' list of leave ids."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if len(ids) > MAX_DECISIONS_PER_REQUEST:
+            return Response(
+                {"detail": f"At most {MAX_DECISIONS_PER_REQUEST} leaves per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        ids = list(dict.fromkeys(ids))
+
+        with transaction.atomic():
+            leaves = {
+                leave.pk: leave
+                for leave in Leave.objects.select_for_update()
+                .filter(pk__in=ids)
+                .only("user_id", "leave_type", "start_date", "end_date", "status")
+            }
+            pending = [leave for leave in leaves.values() if leave.status == "PENDING"]
+
+            conflicts = Leave.find_conflicts(pending) if new_status == "APPROVED" else {}
+            accepted = [leave for leave in pending if leave.pk not in conflicts]
+
+            # Leaves whose pending days the ledger does not hold stay pending
+            unbalanced = set(LeaveBalance.apply_bulk_transition(accepted, "PENDING", new_status))
+            accepted = [leave for leave in accepted if leave.pk not in unbalanced]
+            if accepted:
+                Leave.objects.filter(
+                    pk__in=[leave.pk for leave in accepted], status="PENDING"
+                ).update(status=new_status)
+                # update() sends no post_save
+                bump(Leave)
+
+        results = []
+        for pk in ids:
+            leave = leaves.get(pk)
+            if leave is None:
+                results.append({"id": pk, "outcome": "not_found"})
+            elif leave.status != "PENDING":
+                results.append({"id": pk, "outcome": "not_pending", "status": leave.status})
+            elif pk in conflicts:
+                results.append({"id": pk, "outcome": "conflict", "detail": conflicts[pk]})
+            elif pk in unbalanced:
+                results.append({
+                    "id": pk,
+                    "outcome": "error",
+                    "detail": "The leave balance does not hold this leave's pending days; "
+                              "run manage.py reconcile_leave_balances.",
+                })
+            else:
+                results.append({"id": pk, "outcome": "updated", "status": new_status})
+
+        return Response({
+            "status": new_status,
+            "updated": len(accepted),
+            "results": results,
+        })
+
+
+class LeaveBalanceView(ListAPIView):
+    """
+    EMPLOYEE:
+      - GET → own balances for ?year= (default current year)
+
+    ADMIN / HR:
+      - GET ?user_id= → that employee's balances
+    """
+    serializer_class = LeaveBalanceSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+
+    def get_queryset(self):
+        user = self.request.user
+        user_id = user.pk
+        if user.role in ["ADMIN", "HR"]:
+            user_id = integer_param(self.request, "user_id") or user_id
+
+        year = self.request.query_params.get("year") or localdate().year
+        try:
+            year = int(year)
+        except ValueError:
+            raise ValidationError({"year": "Expected a year."})
+        # Ledger rows are only materialized for real calendar years
+        if not MINYEAR <= year <= MAXYEAR:
+            raise ValidationError({"year": "Expected a year."})
+
+        balances = LeaveBalance.objects.filter(user_id=user_id, year=year).order_by("leave_type")
+        rows = list(balances)
+
+        # First read of a year: materialize the ledger rows once
+        present = {row.leave_type for row in rows}
+        missing = [
+            LeaveBalance(
+                user_id=user_id,
+                leave_type=leave_type,
+                year=year,
+                entitled_days=LeaveBalance.default_entitlement(leave_type),
+            )
+            for leave_type, _ in Leave.LEAVE_TYPE_CHOICES
+            if leave_type not in present
+        ]
+        if missing:
+            LeaveBalance.objects.bulk_create(missing, ignore_conflicts=True)
+            rows = list(balances.all())
+
+        return rows
+
+
+class OutOfOfficeView(ListAPIView):
+    """
+    Approved leaves overlapping ?start=&end= (default today).
+
+    ADMIN / HR → everyone, optional ?department=
+    EMPLOYEE   → their direct reports only
+    """
+    serializer_class = OutOfOfficeSerializer
+    permission_classes = [IsAuthenticated]
+    read_replica = True
+    pagination_class = OutOfOfficePagination
+
+    def get_queryset(self):
+        user = self.request.user
+        today = localdate()
+        start_date, end_date = parse_date_range(self.request)
+        start_date = start_date or today
+        end_date = end_date or start_date
+
+        if end_date < start_date:
+            raise ValidationError({"end": "End date cannot be before start date."})
+
+        queryset = (
+            Leave.overlapping(start_date, end_date)
+            .filter(status="APPROVED")
+            .select_related("user", "user__profile")
+        )
+
+        if user.role in ["ADMIN", "HR"]:
+            department = self.request.query_params.get("department")
+            if department:
+                queryset = queryset.filter(user__profile__department=department)
+        else:
+            queryset = queryset.filter(user__profile__manager=user)
+
+        return queryset
+
+
+class LeaveExportView(CSVExportView):
+    """
+    ADMIN / HR:
+      - GET → leaves overlapping ?start=&end= as CSV
+
+    Optional ?department= (exact match) and ?status=.
+    """
+    filename = "leaves.csv"
+    header = (
+        "id", "employee_id", "first_name", "last_name", "department", "leave_type",
+        "start_date", "end_date", "days", "status", "reason", "created_at",
+    )
+
+    def get_rows(self, request):
+        start_date, end_date = parse_date_range(request)
+        queryset = Leave.objects.all()
+
+        if start_date:
+            queryset = queryset.filter(end_date__gte=start_date)
+        if end_date:
+            queryset = queryset.filter(start_date__lte=end_date)
+
+        department = request.query_params.get("department")
+        if department:
+            queryset = queryset.filter(user__profile__department=department)
+
+        leave_status = request.query_params.get("status")
+        if leave_status:
+            queryset = queryset.filter(status=leave_status)
+
+        rows = queryset.order_by("start_date", "id").values_list(
+            "id", "user__employee_id", "user__first_name", "user__last_name",
+            "user__profile__department", "leave_type", "start_date", "end_date",
+            "status", "reason", "created_at",
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+        return (
+            (*row[:8], (row[7] - row[6]).days + 1, *row[8:])
+            for row in rows
+        )
@@ -0,0 +1,59 @@
+# Generated by Django 4.2.11 on 2026-10-18 17:51
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('payroll', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayrollRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField()),
+                ('month', models.PositiveSmallIntegerField()),
+                ('headcount', models.PositiveIntegerField(default=0)),
+                ('total_earnings', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('total_deductions', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('total_net_salary', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='payroll_runs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-year', '-month'],
+                'unique_together': {('year', 'month')},
+            },
+        ),
+        migrations.CreateModel(
+            name='Payslip',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('monthly_wage', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('basic_salary', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('hra', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('standard_allowance', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('performance_bonus', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('leave_travel_allowance', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('food_allowance', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('total_earnings', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('pf_employee', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('pf_employer', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('professional_tax', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('total_deductions', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('net_salary', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='payslips', to=settings.AUTH_USER_MODEL)),
+                ('run', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payslips', to='payroll.payrollrun')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['run', 'net_salary'], name='payslip_run_net_idx')],
+                'unique_together': {('run', 'employee')},
+            },
+        ),
+    ]
@@ -1,7 +1,62 @@
-from django.db import models
+from decimal import Decimal
+
+from django.db import models, transaction
 from accounts.models import User
 
 
+# Inputs of the salary formula, in the order calculate_components() takes them
+COMPONENT_INPUTS = (
+    "monthly_wage",
+    "basic_percentage",
+    "hra_percentage",
+    "standard_allowance",
+    "performance_bonus_percentage",
+    "leave_travel_allowance_percentage",
+    "food_allowance",
+    "pf_employee_percentage",
+    "pf_employer_percentage",
+    "professional_tax",
+)
+
+CENT = Decimal("0.01")
+
+
+def calculate_components(
+    monthly_wage,
+    basic_percentage,
+    hra_percentage,
+    standard_allowance,
+    performance_bonus_percentage,
+    leave_travel_allowance_percentage,
+    food_allowance,
+    pf_employee_percentage,
+    pf_employer_percentage,
+    professional_tax,
+):
+    """Compute every derived salary component in one pass (basic once)"""
+    basic_salary = (monthly_wage * basic_percentage) / 100
+    hra = (basic_salary * hra_percentage) / 100
+    performance_bonus = (basic_salary * performance_bonus_percentage) / 100
+    leave_travel_allowance = (basic_salary * leave_travel_allowance_percentage) / 100
+    total_earnings = (basic_salary + hra + standard_allowance +
+                      performance_bonus + leave_travel_allowance + food_allowance)
+    pf_employee = (basic_salary * pf_employee_percentage) / 100
+    pf_employer = (basic_salary * pf_employer_percentage) / 100
+    total_deductions = pf_employee + professional_tax
+    return {
+        "yearly_wage": monthly_wage * 12,
+        "basic_salary": basic_salary,
+        "hra": hra,
+        "performance_bonus": performance_bonus,
+        "leave_travel_allowance": leave_travel_allowance,
+        "total_earnings": total_earnings,
+        "pf_employee": pf_employee,
+        "pf_employer": pf_employer,
+        "total_deductions": total_deductions,
+        "net_salary": total_earnings - total_deductions,
+    }
+
+
 class SalaryStructure(models.Model):
     """Salary structure for an employee"""
     employee = models.OneToOneField(User, on_delete=models.CASCADE, related_name="salary")
@@ -27,47 +82,173 @@ class SalaryStructure(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    def _components(self):
+        # Computed once per distinct set of inputs instead of once per property
+        key = tuple(getattr(self, name) for name in COMPONENT_INPUTS)
+        cached = getattr(self, "_components_cache", None)
+        if cached is None or cached[0] != key:
+            cached = (key, calculate_components(*key))
+            self._components_cache = cached
+        return cached[1]
+
     @property
     def yearly_wage(self):
-        return self.monthly_wage * 12
+        return self._components()["yearly_wage"]
     
     @property
     def basic_salary(self):
-        return (self.monthly_wage * self.basic_percentage) / 100
+        return self._components()["basic_salary"]
     
     @property
     def hra(self):
-        return (self.basic_salary * self.hra_percentage) / 100
+        return self._components()["hra"]
     
     @property
     def performance_bonus(self):
-        return (self.basic_salary * self.performance_bonus_percentage) / 100
+        return self._components()["performance_bonus"]
     
     @property
     def leave_travel_allowance(self):
-        return (self.basic_salary * self.leave_travel_allowance_percentage) / 100
+        return self._components()["leave_travel_allowance"]
     
     @property
     def total_earnings(self):
-        return (self.basic_salary + self.hra + self.standard_allowance + 
-                self.performance_bonus + self.leave_travel_allowance + self.food_allowance)
+        return self._components()["total_earnings"]
     
     @property
     def pf_employee(self):
-        return (self.basic_salary * self.pf_employee_percentage) / 100
+        return self._components()["pf_employee"]
     
     @property
     def pf_employer(self):
-        return (self.basic_salary * self.pf_employer_percentage) / 100
+        return self._components()["pf_employer"]
     
     @property
     def total_deductions(self):
-        return self.pf_employee + self.professional_tax
+        return self._components()["total_deductions"]
     
     @property
     def net_salary(self):
-        return self.total_earnings - self.total_deductions
+        return self._components()["net_salary"]
     
     def __str__(self):
         return f"Salary: {self.employee.username} - ₹{self.monthly_wage}/month"
 
+
+
+class PayrollRun(models.Model):
+    """A monthly payroll run; its payslips are frozen once generated"""
+    year = models.PositiveIntegerField()
+    month = models.PositiveSmallIntegerField()
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name="payroll_runs")
+
+    # Totals stored at generation time so listing runs never re-aggregates
+    headcount = models.PositiveIntegerField(default=0)
+    total_earnings = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    total_deductions = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    total_net_salary = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ("year", "month")
+        ordering = ["-year", "-month"]
+
+    @classmethod
+    def generate(cls, year, month, created_by=None):
+        """
+        Snapshot every salary structure into payslips for one period.
+
+        Reads the inputs with a single values() query, computes all
+        components per row in one pass and writes the payslips with one
+        bulk_create, all in a single transaction.
+        """
+        rows = SalaryStructure.objects.values_list("employee_id", *COMPONENT_INPUTS)
+
+        with transaction.atomic():
+            run = cls.objects.create(year=year, month=month, created_by=created_by)
+
+            payslips = []
+            for employee_id, *inputs in rows.iterator(chunk_size=2000):
+                values = dict(zip(COMPONENT_INPUTS, inputs))
+                components = calculate_components(*inputs)
+                payslips.append(Payslip(
+                    run=run,
+                    employee_id=employee_id,
+                    monthly_wage=values["monthly_wage"],
+                    standard_allowance=values["standard_allowance"],
+                    food_allowance=values["food_allowance"],
+                    professional_tax=values["professional_tax"],
+                    **{
+                        name: components[name].quantize(CENT)
+                        for name in Payslip.COMPONENT_FIELDS
+                    },
+                ))
+
+            Payslip.objects.bulk_create(payslips, batch_size=1000)
+
+            run.headcount = len(payslips)
+            run.total_earnings = sum((p.total_earnings for p in payslips), Decimal("0"))
+            run.total_deductions = sum((p.total_deductions for p in payslips), Decimal("0"))
+            run.total_net_salary = sum((p.net_salary for p in payslips), Decimal("0"))
+            run.save(update_fields=[
+                "headcount", "total_earnings", "total_deductions", "total_net_salary",
+            ])
+
+        return run
+
+    def __str__(self):
+        return f"Payroll {self.year}-{self.month:02d}"
+
+
+class Payslip(models.Model):
+    """Immutable per-employee result of a payroll run"""
+    # Components copied from calculate_components(), rounded to paise
+    COMPONENT_FIELDS = (
+        "basic_salary",
+        "hra",
+        "performance_bonus",
+        "leave_travel_allowance",
+        "total_earnings",
+        "pf_employee",
+        "pf_employer",
+        "total_deductions",
+        "net_salary",
+    )
+
+    run = models.ForeignKey(PayrollRun, on_delete=models.CASCADE, related_name="payslips")
+    # Issued payslips are payroll records: deleting an employee who has
+    # any raises ProtectedError. Deactivate them (is_active=False) instead;
+    # inactive users cannot log in and drop out of headcounts.
+    employee = models.ForeignKey(User, on_delete=models.PROTECT, related_name="payslips")
+
+    monthly_wage = models.DecimalField(max_digits=12, decimal_places=2)
+    basic_salary = models.DecimalField(max_digits=12, decimal_places=2)
+    hra = models.DecimalField(max_digits=12, decimal_places=2)
+    standard_allowance = models.DecimalField(max_digits=10, decimal_places=2)
+    performance_bonus = models.DecimalField(max_digits=12, decimal_places=2)
+    leave_travel_allowance = models.DecimalField(max_digits=12, decimal_places=2)
+    food_allowance = models.DecimalField(max_digits=10, decimal_places=2)
+    total_earnings = models.DecimalField(max_digits=12, decimal_places=2)
+
+    pf_employee = models.DecimalField(max_digits=12, decimal_places=2)
+    pf_employer = models.DecimalField(max_digits=12, decimal_places=2)
+    professional_tax = models.DecimalField(max_digits=10, decimal_places=2)
+    total_deductions = models.DecimalField(max_digits=12, decimal_places=2)
+
+    net_salary = models.DecimalField(max_digits=12, decimal_places=2)
+
+    class Meta:
+        unique_together = ("run", "employee")
+        indexes = [
+            # "net salary > X" within a run
+            models.Index(fields=["run", "net_salary"], name="payslip_run_net_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Payslips are immutable once generated.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"Payslip {self.run} - {self.employee_id}"
@@ -1,8 +1,10 @@
 from rest_framework import serializers
-from .models import SalaryStructure
+from .models import SalaryStructure, PayrollRun, Payslip
+from accounts.serializers import UserSerializer
+from dayflow.serializers import SparseFieldsMixin
 
 
-class SalaryStructureSerializer(serializers.ModelSerializer):
+class SalaryStructureSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     # Computed fields
     yearly_wage = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
     basic_salary = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
@@ -37,6 +39,44 @@ class SalaryStructureSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['employee', 'created_at', 'updated_at']
+        expandable_fields = {
+            'employee': (UserSerializer, {'read_only': True}),
+        }
     
     def get_employee_name(self, obj):
         return f"{obj.employee.first_name} {obj.employee.last_name}".strip() or obj.employee.username
+
+
+
+class PayrollRunSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PayrollRun
+        fields = [
+            'id', 'year', 'month', 'created_by',
+            'headcount', 'total_earnings', 'total_deductions', 'total_net_salary',
+            'created_at'
+        ]
+        read_only_fields = [
+            'created_by', 'headcount', 'total_earnings', 'total_deductions',
+            'total_net_salary', 'created_at'
+        ]
+
+    def validate_month(self, value):
+        if not 1 <= value <= 12:
+            raise serializers.ValidationError("Month must be between 1 and 12.")
+        return value
+
+
+class PayslipSerializer(serializers.ModelSerializer):
+    """Reads stored values only; nothing is recomputed per row"""
+    class Meta:
+        model = Payslip
+        fields = [
+            'id', 'run', 'employee',
+            'monthly_wage', 'basic_salary', 'hra', 'standard_allowance',
+            'performance_bonus', 'leave_travel_allowance', 'food_allowance',
+            'total_earnings',
+            'pf_employee', 'pf_employer', 'professional_tax', 'total_deductions',
+            'net_salary'
+        ]
+        read_only_fields = fields
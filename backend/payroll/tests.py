@@ -1,3 +1,116 @@
-from django.test import TestCase
+from decimal import Decimal
 
-# Create your tests here.
+from django.db.models import ProtectedError
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from dayflow.testing import QueryCountMixin
+from .models import COMPONENT_INPUTS, CENT, PayrollRun, Payslip, SalaryStructure, calculate_components
+
+
+class SalaryStructureListQueryTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="ADMIN")
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.add_salaries(3)
+
+    def add_salaries(self, count):
+        start = User.objects.count()
+        for i in range(start, start + count):
+            user = User.objects.create_user(f"emp{i}", f"emp{i}@example.com", "pw")
+            SalaryStructure.objects.create(employee=user, monthly_wage=50000)
+
+    def test_list_query_count_is_pinned(self):
+        self.assertEndpointQueries("/api/payroll/", 1)
+
+    def test_list_query_count_does_not_grow_with_rows(self):
+        self.assertConstantQueries("/api/payroll/", lambda: self.add_salaries(10))
+
+
+class CalculateComponentsTests(SimpleTestCase):
+    def test_default_structure(self):
+        defaults = {
+            name: Decimal(str(SalaryStructure._meta.get_field(name).default)) for name in COMPONENT_INPUTS
+        }
+        defaults["monthly_wage"] = Decimal("50000")
+        components = calculate_components(*(defaults[name] for name in COMPONENT_INPUTS))
+        self.assertEqual(
+            {name: value.quantize(CENT) for name, value in components.items()},
+            {
+                "yearly_wage": Decimal("600000.00"),
+                "basic_salary": Decimal("25000.00"),
+                "hra": Decimal("10000.00"),
+                "performance_bonus": Decimal("2082.50"),
+                "leave_travel_allowance": Decimal("2082.50"),
+                "total_earnings": Decimal("39165.00"),
+                "pf_employee": Decimal("3000.00"),
+                "pf_employer": Decimal("3000.00"),
+                "total_deductions": Decimal("3200.00"),
+                "net_salary": Decimal("35965.00"),
+            },
+        )
+
+    def test_matches_the_salary_structure_properties(self):
+        structure = SalaryStructure(
+            monthly_wage=Decimal("43210.55"), basic_percentage=Decimal("45"),
+            hra_percentage=Decimal("50"), standard_allowance=Decimal("1500"),
+            performance_bonus_percentage=Decimal("8.33"), leave_travel_allowance_percentage=Decimal("8.33"),
+            food_allowance=Decimal("1200"), pf_employee_percentage=Decimal("12"),
+            pf_employer_percentage=Decimal("12"), professional_tax=Decimal("200"),
+        )
+        components = calculate_components(*(getattr(structure, name) for name in COMPONENT_INPUTS))
+        self.assertEqual(structure.net_salary, components["net_salary"])
+        self.assertEqual(structure.total_earnings - structure.total_deductions, structure.net_salary)
+
+
+class PayrollRunTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="ADMIN")
+        self.employees = []
+        for i, wage in enumerate((30000, 50000, 80000)):
+            user = User.objects.create_user(f"emp{i}", f"emp{i}@example.com", "pw")
+            SalaryStructure.objects.create(employee=user, monthly_wage=wage)
+            self.employees.append(user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.run = PayrollRun.generate(2025, 4, created_by=self.admin)
+
+    def payslips(self, query=""):
+        return self.client.get(f"/api/payroll/runs/{self.run.pk}/payslips/{query}")
+
+    def test_generate_snapshots_every_structure(self):
+        payslips = list(self.run.payslips.order_by("monthly_wage"))
+        self.assertEqual([p.employee_id for p in payslips], [user.pk for user in self.employees])
+        self.assertEqual(payslips[1].net_salary, Decimal("35965.00"))
+        self.assertEqual(self.run.headcount, 3)
+        self.assertEqual(self.run.total_net_salary, sum(p.net_salary for p in payslips))
+
+        # Later raises do not touch the issued payslips
+        SalaryStructure.objects.filter(employee=self.employees[1]).update(monthly_wage=99000)
+        self.assertEqual(Payslip.objects.get(pk=payslips[1].pk).net_salary, Decimal("35965.00"))
+
+    def test_payslips_are_immutable(self):
+        payslip = self.run.payslips.first()
+        payslip.net_salary = Decimal("1")
+        with self.assertRaises(ValueError):
+            payslip.save()
+
+    def test_employees_with_payslips_cannot_be_deleted(self):
+        with self.assertRaises(ProtectedError):
+            self.employees[0].delete()
+
+    def test_list_filters(self):
+        nets = [row["net_salary"] for row in self.payslips().data["results"]]
+        self.assertEqual(nets, sorted(nets, key=Decimal, reverse=True))
+
+        rows = self.payslips("?min_net=30000&max_net=40000").data["results"]
+        self.assertEqual([row["net_salary"] for row in rows], ["35965.00"])
+        rows = self.payslips(f"?employee_id={self.employees[2].pk}").data["results"]
+        self.assertEqual([row["employee"] for row in rows], [self.employees[2].pk])
+
+    def test_malformed_filters_are_rejected(self):
+        for query in ("?min_net=abc", "?max_net=NaN", "?employee_id=x"):
+            response = self.payslips(query)
+            self.assertEqual(response.status_code, 400, query)
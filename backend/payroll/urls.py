@@ -1,8 +1,22 @@
 from django.urls import path
-from .views import SalaryStructureListView, SalaryStructureDetailView, EmployeeSalaryView
+from .views import (
+    SalaryStructureListView,
+    SalaryStructureDetailView,
+    EmployeeSalaryView,
+    PayrollRunListCreateView,
+    PayrollRunDetailView,
+    PayslipListView,
+    SalaryStructureExportView,
+    PayslipExportView,
+)
 
 urlpatterns = [
     path('', SalaryStructureListView.as_view()),
     path('<int:pk>/', SalaryStructureDetailView.as_view()),
+    path('export/', SalaryStructureExportView.as_view()),
     path('employee/<int:employee_id>/', EmployeeSalaryView.as_view()),
+    path('runs/', PayrollRunListCreateView.as_view()),
+    path('runs/export/', PayslipExportView.as_view()),
+    path('runs/<int:pk>/', PayrollRunDetailView.as_view()),
+    path('runs/<int:run_id>/payslips/', PayslipListView.as_view()),
 ]
@@ -2,16 +2,26 @@ from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from .models import SalaryStructure
-from .serializers import SalaryStructureSerializer
+from django.db.models import F
+from .models import COMPONENT_INPUTS, CENT, SalaryStructure, PayrollRun, Payslip, calculate_components
+from .serializers import SalaryStructureSerializer, PayrollRunSerializer, PayslipSerializer
+from accounts.models import User
 from accounts.permissions import IsAdmin
+from dayflow.conditional import ConditionalListMixin
+from dayflow.export import EXPORT_CHUNK_SIZE, CSVExportView, parse_date_range
+from dayflow.listcache import CachedListMixin, bump
+from dayflow.pagination import PayslipPagination, SalaryStructurePagination
+from dayflow.params import decimal_param, integer_param
 
 
-class SalaryStructureListView(generics.ListCreateAPIView):
-    """List all salary structures (Admin only) or create new"""
-    queryset = SalaryStructure.objects.all()
+class SalaryStructureListView(ConditionalListMixin, generics.ListCreateAPIView):
+    """List all salary structures (Admin only) or create new; conditional GET via ETag"""
+    queryset = SalaryStructure.objects.select_related('employee')
     serializer_class = SalaryStructureSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
+    read_replica = True
+    pagination_class = SalaryStructurePagination
+    cache_models = (SalaryStructure, User)
     
     def perform_create(self, serializer):
         serializer.save()
@@ -19,7 +29,7 @@ class SalaryStructureListView(generics.ListCreateAPIView):
 
 class SalaryStructureDetailView(generics.RetrieveUpdateDestroyAPIView):
     """Get, update or delete a salary structure (Admin only)"""
-    queryset = SalaryStructure.objects.all()
+    queryset = SalaryStructure.objects.select_related('employee')
     serializer_class = SalaryStructureSerializer
     permission_classes = [IsAuthenticated, IsAdmin]
 
@@ -30,8 +40,8 @@ class EmployeeSalaryView(APIView):
     
     def get(self, request, employee_id):
         try:
-            salary = SalaryStructure.objects.get(employee_id=employee_id)
-            serializer = SalaryStructureSerializer(salary)
+            salary = SalaryStructure.objects.select_related('employee').get(employee_id=employee_id)
+            serializer = SalaryStructureSerializer(salary, context={'request': request})
             return Response(serializer.data)
         except SalaryStructure.DoesNotExist:
             return Response(
@@ -64,3 +74,112 @@ class EmployeeSalaryView(APIView):
                 status=status.HTTP_404_NOT_FOUND
             )
 
+
+class PayrollRunListCreateView(CachedListMixin, generics.ListCreateAPIView):
+    """List payroll runs or generate the run for a period (Admin only)"""
+    queryset = PayrollRun.objects.all()
+    serializer_class = PayrollRunSerializer
+    permission_classes = [IsAuthenticated, IsAdmin]
+    read_replica = True
+    cache_models = (PayrollRun,)
+
+    def perform_create(self, serializer):
+        serializer.instance = PayrollRun.generate(
+            year=serializer.validated_data['year'],
+            month=serializer.validated_data['month'],
+            created_by=self.request.user,
+        )
+        # The payslips are bulk_created, without post_save
+        bump(Payslip)
+
+
+class PayrollRunDetailView(generics.RetrieveAPIView):
+    """Get a payroll run with its stored totals (Admin only)"""
+    queryset = PayrollRun.objects.all()
+    serializer_class = PayrollRunSerializer
+    permission_classes = [IsAuthenticated, IsAdmin]
+
+
+class PayslipListView(CachedListMixin, generics.ListAPIView):
+    """
+    Payslips of a run, highest net salary first (Admin only).
+    Optional filters: min_net, max_net, employee_id
+    """
+    serializer_class = PayslipSerializer
+    permission_classes = [IsAuthenticated, IsAdmin]
+    read_replica = True
+    pagination_class = PayslipPagination
+    cache_models = (Payslip,)
+
+    def get_queryset(self):
+        queryset = Payslip.objects.filter(run_id=self.kwargs['run_id'])
+
+        min_net = decimal_param(self.request, 'min_net')
+        max_net = decimal_param(self.request, 'max_net')
+        employee_id = integer_param(self.request, 'employee_id')
+
+        if min_net is not None:
+            queryset = queryset.filter(net_salary__gte=min_net)
+        if max_net is not None:
+            queryset = queryset.filter(net_salary__lte=max_net)
+        if employee_id is not None:
+            queryset = queryset.filter(employee_id=employee_id)
+
+        return queryset
+
+
+class SalaryStructureExportView(CSVExportView):
+    """Current salary structures with derived components as CSV; optional ?department= (Admin only)"""
+    filename = "salary_structures.csv"
+    header = (
+        "employee_id", "first_name", "last_name", "department", *COMPONENT_INPUTS,
+        *Payslip.COMPONENT_FIELDS,
+    )
+
+    def get_rows(self, request):
+        queryset = SalaryStructure.objects.all()
+
+        department = request.query_params.get("department")
+        if department:
+            queryset = queryset.filter(employee__profile__department=department)
+
+        rows = queryset.order_by("employee_id").values_list(
+            "employee__employee_id", "employee__first_name", "employee__last_name",
+            "employee__profile__department", *COMPONENT_INPUTS,
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+        for row in rows:
+            components = calculate_components(*row[4:])
+            yield (*row, *(components[name].quantize(CENT) for name in Payslip.COMPONENT_FIELDS))
+
+
+class PayslipExportView(CSVExportView):
+    """
+    Payslips of every run whose period falls within ?start=&end= as CSV
+    (Admin only); optional ?department=.
+    """
+    filename = "payslips.csv"
+    header = (
+        "year", "month", "employee_id", "first_name", "last_name", "department",
+        "monthly_wage", *Payslip.COMPONENT_FIELDS,
+        "standard_allowance", "food_allowance", "professional_tax",
+    )
+
+    def get_rows(self, request):
+        start_date, end_date = parse_date_range(request)
+        queryset = Payslip.objects.annotate(period=F("run__year") * 100 + F("run__month"))
+
+        if start_date:
+            queryset = queryset.filter(period__gte=start_date.year * 100 + start_date.month)
+        if end_date:
+            queryset = queryset.filter(period__lte=end_date.year * 100 + end_date.month)
+
+        department = request.query_params.get("department")
+        if department:
+            queryset = queryset.filter(employee__profile__department=department)
+
+        return queryset.order_by("run__year", "run__month", "employee_id").values_list(
+            "run__year", "run__month", "employee__employee_id", "employee__first_name",
+            "employee__last_name", "employee__profile__department", "monthly_wage",
+            *Payslip.COMPONENT_FIELDS, "standard_allowance", "food_allowance", "professional_tax",
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
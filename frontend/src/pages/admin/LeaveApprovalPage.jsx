@@ -6,7 +6,7 @@ export default function LeaveApprovalPage() {
 
   useEffect(() => {
     api.get("/leave/")
-      .then(res => setLeaves(res.data));
+      .then(res => setLeaves(res.data.results ?? res.data));
   }, []);
 
   const updateStatus = (id, action) => {
@@ -6,7 +6,7 @@ export default function AttendancePage() {
 
   useEffect(() => {
     api.get("/attendance/history/?range=week")
-      .then(res => setRecords(res.data));
+      .then(res => setRecords(res.data.results ?? res.data));
   }, []);
 
   return (
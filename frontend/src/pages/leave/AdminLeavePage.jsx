@@ -6,7 +6,7 @@ export default function AdminLeavePage() {
 
   const loadLeaves = async () => {
     const res = await api.get("/leave/");
-    setLeaves(res.data);
+    setLeaves(res.data.results ?? res.data);
   };
 
   useEffect(() => {
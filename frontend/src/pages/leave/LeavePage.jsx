@@ -12,7 +12,7 @@ export default function LeavePage() {
 
   const loadLeaves = async () => {
     const res = await api.get("/leave/");
-    setLeaves(res.data);
+    setLeaves(res.data.results ?? res.data);
   };
 
   useEffect(() => {
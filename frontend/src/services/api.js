@@ -31,6 +31,9 @@ const handleResponse = async (response) => {
   return data;
 };
 
+// List endpoints are cursor-paginated: { next, previous, results }
+const unwrapPage = (data) => data?.results ?? data;
+
 // Auth - SimpleJWT
 export async function loginUser(username, password) {
   const response = await fetch(`${API_BASE_URL}/auth/login/`, {
@@ -123,7 +126,7 @@ export async function fetchLeaves() {
     const response = await fetch(`${API_BASE_URL}/leave/`, { 
       headers: getHeaders() 
     });
-    return handleResponse(response);
+    return unwrapPage(await handleResponse(response));
   } catch (error) {
     console.error("fetchLeaves error:", error);
     return [];
@@ -166,7 +169,7 @@ export async function fetchAttendance() {
     const response = await fetch(`${API_BASE_URL}/attendance/`, { 
       headers: getHeaders() 
     });
-    return handleResponse(response);
+    return unwrapPage(await handleResponse(response));
   } catch (error) {
     console.error("fetchAttendance error:", error);
     return [];
@@ -195,7 +198,7 @@ export async function fetchEmployees() {
     const response = await fetch(`${API_BASE_URL}/employees/`, { 
       headers: getHeaders() 
     });
-    return handleResponse(response);
+    return unwrapPage(await handleResponse(response));
   } catch (error) {
     console.error("fetchEmployees error:", error);
     return [];